@@ -1,19 +1,138 @@
+import queue
 import subprocess
+import threading
+import time
+import uuid
 from dotenv import load_dotenv
+from config import get_config
+from instrumentation import get_logger
 
-class AgentCore:
-    def __init__(self, workspace_path="/Users/lopanapol/git-repo/sentium-pico"):
-        load_dotenv() # Load environment variables from .env file
+API_SCRIPT = "system/perception/api.fish"
+DEFAULT_COMMAND_TIMEOUT = 10.0 # Seconds a single api_process call may take before the session is restarted
+
+logger = get_logger("agent_core")
+
+
+def fish_quote(text):
+    # Single-quoted fish string: only backslash and single quote need escaping
+    return "'" + text.replace("\\", "\\\\").replace("'", "\\'") + "'"
+
+
+class FishSession:
+    # Long-lived `fish` co-process that sources api.fish once and then runs many
+    # commands over stdin. Every command is followed by a sentinel line on stdout
+    # (carrying the exit status) and on stderr, so responses can be framed without
+    # closing the pipes.
+
+    def __init__(self, workspace_path, script=API_SCRIPT):
         self.workspace_path = workspace_path
+        self.script = script
+        self.process = None
+        self.startup_output = ("", "")
+        self._lock = threading.Lock()
+
+    def _reader(self, stream, lines):
+        for line in iter(stream.readline, ''):
+            lines.put(line)
+        lines.put(None) # EOF: the co-process exited
 
-    def run_fish_command(self, command):
-        full_command = f'fish -c "{command}"'
-        process = subprocess.Popen(full_command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, shell=True, cwd=self.workspace_path)
-        stdout, stderr = process.communicate()
-        return stdout.decode('utf-8').strip(), stderr.decode('utf-8').strip()
+    def start(self):
+        self.process = subprocess.Popen(
+            ["fish"], stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+            cwd=self.workspace_path, text=True, bufsize=1
+        )
+        self.stdout_lines = queue.Queue()
+        self.stderr_lines = queue.Queue()
+        for stream, lines in ((self.process.stdout, self.stdout_lines), (self.process.stderr, self.stderr_lines)):
+            threading.Thread(target=self._reader, args=(stream, lines), daemon=True).start()
 
-    def process_command(self, command):
-        stdout, stderr = self.run_fish_command(f'source system/perception/api.fish && api_process "{command}"')
+        # Source the API once; whatever it prints is kept apart from command responses
+        stdout, stderr, _ = self._send(f"source {fish_quote(self.script)}", DEFAULT_COMMAND_TIMEOUT)
+        self.startup_output = (stdout, stderr)
+        if stderr:
+            logger.warning("Sourcing %s reported: %s", self.script, stderr)
+
+    def close(self):
+        if self.process is None:
+            return
+        try:
+            self.process.stdin.close()
+            self.process.wait(timeout=1)
+        except (OSError, subprocess.TimeoutExpired):
+            self.process.kill()
+            self.process.wait()
+        self.process = None
+
+    def _kill(self):
+        if self.process is not None:
+            self.process.kill()
+            self.process.wait()
+            self.process = None
+
+    def _collect(self, lines, sentinel, deadline):
+        # Read lines up to the sentinel; the sentinel may follow output that lacked a final newline
+        collected = []
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise subprocess.TimeoutExpired("fish", 0)
+            try:
+                line = lines.get(timeout=remaining)
+            except queue.Empty:
+                raise subprocess.TimeoutExpired("fish", 0)
+            if line is None:
+                raise BrokenPipeError("fish session exited")
+            if sentinel in line:
+                head, _, tail = line.partition(sentinel)
+                collected.append(head)
+                return ''.join(collected), tail.strip()
+            collected.append(line)
+
+    def _send(self, command, timeout):
+        sentinel = f"__SENTIUM_END_{uuid.uuid4().hex}__"
+        self.process.stdin.write(
+            f"begin; {command}; end\n"
+            f"echo {sentinel}$status\n"
+            f"echo {sentinel} >&2\n"
+        )
+        self.process.stdin.flush()
+
+        deadline = time.monotonic() + timeout
+        stdout, exit_status = self._collect(self.stdout_lines, sentinel, deadline)
+        stderr, _ = self._collect(self.stderr_lines, sentinel, deadline)
+        return stdout.strip(), stderr.strip(), int(exit_status or 0)
+
+    def run(self, command, timeout=DEFAULT_COMMAND_TIMEOUT):
+        """Run one fish command in the session; returns (stdout, stderr, exit_status)"""
+        with self._lock:
+            try:
+                if self.process is None or self.process.poll() is not None:
+                    self.start()
+                return self._send(command, timeout)
+            except subprocess.TimeoutExpired:
+                # The session is mid-command; it is replaced by a fresh one on the next call
+                self._kill()
+                return "", f"Command timed out after {timeout}s", -1
+            except (BrokenPipeError, OSError) as e:
+                self._kill()
+                return "", f"fish session failed: {e}", -1
+
+
+class AgentCore:
+    def __init__(self, workspace_path=None):
+        load_dotenv() # Load environment variables from .env file
+        self.workspace_path = str(workspace_path or get_config().workspace)
+        self.session = FishSession(self.workspace_path)
+
+    def process_command(self, command, timeout=DEFAULT_COMMAND_TIMEOUT):
+        stdout, stderr, _ = self.session.run(f"api_process {fish_quote(command)}", timeout)
         if stderr:
             return f"Error: {stderr}"
         return stdout
+
+    def process_commands(self, commands, timeout=DEFAULT_COMMAND_TIMEOUT):
+        """Run many api_process commands through the same session; timeout applies per command"""
+        return [self.process_command(command, timeout) for command in commands]
+
+    def close(self):
+        self.session.close()
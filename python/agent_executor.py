@@ -0,0 +1,154 @@
+"""
+Sentium Pico Async Agent Executor v2.0.0
+Runs many perception api_process commands concurrently without blocking the caller
+"""
+
+import asyncio
+import os
+import signal
+import threading
+import time
+from collections import deque
+
+from agent_core import API_SCRIPT, DEFAULT_COMMAND_TIMEOUT, fish_quote
+
+MAX_CONCURRENCY = 4 # fish processes allowed to run at the same time
+LATENCY_HISTORY = 1000 # Per-command latencies kept for latency_summary()
+
+
+class AsyncAgentExecutor:
+    """Bounded-concurrency executor for `api_process` commands.
+
+    Commands run as `fish -c` subprocesses on a private asyncio loop in a daemon
+    thread, so submit() returns a concurrent.futures.Future immediately and the
+    analysis loop never waits on a slow perception command. Each result is a dict
+    with the command's output, exit status, outcome and latency.
+    """
+
+    def __init__(self, workspace_path, max_concurrency=MAX_CONCURRENCY, timeout=DEFAULT_COMMAND_TIMEOUT, script=API_SCRIPT):
+        self.workspace_path = workspace_path
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.script = script
+        self.latencies = deque(maxlen=LATENCY_HISTORY)
+        self._loop = None
+        self._semaphore = None
+        self._start_lock = threading.Lock()
+
+    def _ensure_loop(self):
+        with self._start_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, daemon=True).start()
+                self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._loop
+
+    async def _stream(self, stream, chunks, command, on_output):
+        # Forward each stdout line as soon as fish writes it
+        async for line in stream:
+            text = line.decode('utf-8', errors='replace')
+            chunks.append(text)
+            if on_output:
+                on_output(command, text.rstrip('\n'))
+
+    async def _run(self, command, timeout, on_output):
+        async with self._semaphore:
+            started = time.monotonic()
+            process = await asyncio.create_subprocess_exec(
+                'fish', '-c', f"source {fish_quote(self.script)}; and api_process {fish_quote(command)}",
+                stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE, cwd=self.workspace_path,
+                start_new_session=True # Own process group, so a timeout also kills what fish spawned
+            )
+            stdout_chunks = []
+            stderr_chunks = []
+            outcome = "ok"
+            tasks = [
+                asyncio.ensure_future(self._stream(process.stdout, stdout_chunks, command, on_output)),
+                asyncio.ensure_future(self._stream(process.stderr, stderr_chunks, command, None)),
+                asyncio.ensure_future(process.wait())
+            ]
+            try:
+                _, pending = await asyncio.wait(tasks, timeout=timeout)
+                if pending:
+                    outcome = "timeout"
+            finally:
+                # Also reached on cancellation, which must not leave the fish process running
+                if process.returncode is None:
+                    try:
+                        os.killpg(process.pid, signal.SIGKILL)
+                    except ProcessLookupError:
+                        pass
+                    await process.wait()
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                latency = time.monotonic() - started
+                self.latencies.append(latency)
+
+            stdout = ''.join(stdout_chunks).strip()
+            stderr = ''.join(stderr_chunks).strip()
+            if outcome == "timeout":
+                stderr = f"Command timed out after {timeout}s"
+            elif stderr or process.returncode:
+                outcome = "error"
+
+            return {
+                "command": command,
+                "stdout": stdout,
+                "stderr": stderr,
+                "returncode": process.returncode,
+                "outcome": outcome,
+                "latency": latency,
+                # Same string AgentCore.process_command returns
+                "response": f"Error: {stderr}" if stderr else stdout
+            }
+
+    def submit(self, command, timeout=None, on_output=None):
+        """Schedule one command; returns a concurrent.futures.Future of its result dict.
+
+        on_output(command, line) is called from the executor thread for every stdout line.
+        Cancelling the future kills the fish process.
+        """
+        loop = self._ensure_loop()
+        return asyncio.run_coroutine_threadsafe(
+            self._run(command, timeout or self.timeout, on_output), loop
+        )
+
+    def run_batch(self, commands, timeout=None, on_output=None):
+        """Run commands concurrently and block until all finish; results keep the input order"""
+        futures = [self.submit(command, timeout, on_output) for command in commands]
+        return [future.result() for future in futures]
+
+    async def gather(self, commands, timeout=None, on_output=None):
+        """Awaitable run_batch for callers that already have their own event loop"""
+        futures = [asyncio.wrap_future(self.submit(command, timeout, on_output)) for command in commands]
+        return await asyncio.gather(*futures)
+
+    def latency_summary(self):
+        """Count, mean, median, p95 and max of recent per-command latencies in seconds"""
+        if not self.latencies:
+            return {"count": 0}
+        ordered = sorted(self.latencies)
+        count = len(ordered)
+        return {
+            "count": count,
+            "mean": sum(ordered) / count,
+            "p50": ordered[count // 2],
+            "p95": ordered[min(count - 1, int(count * 0.95))],
+            "max": ordered[-1]
+        }
+
+    def close(self):
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._loop = None
+
+
+if __name__ == "__main__":
+    import json
+    import sys
+
+    executor = AsyncAgentExecutor(workspace_path=".")
+    commands = sys.argv[1:] or ["VERSION"]
+    results = executor.run_batch(commands, on_output=lambda command, line: print(f"[{command}] {line}"))
+    print(json.dumps({"results": results, "latency": executor.latency_summary()}, indent=2))
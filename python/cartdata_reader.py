@@ -0,0 +1,160 @@
+"""
+Sentium Pico Cartdata Reader v2.0.0
+Decodes the cart's save slots (cartdata "sentium_pixel_v1") straight into population arrays
+"""
+
+import json
+import os
+import numpy as np
+from config import get_config
+from instrumentation import get_logger, inc, span
+
+logger = get_logger("cartdata")
+
+CARTDATA_ID = "sentium_pixel_v1"
+CARTDATA_SLOTS = 64 # dset/dget beyond slot 63 are no-ops in PICO-8, so nothing past it is ever saved
+
+# Slot layout written by save_game_state() in sentium-pico.p8
+HEADER_SLOTS = {"save_flag": 0, "generation": 1, "pixel_counter": 2, "pixel_count": 3, "cube_count": 4, "gen_timer": 5}
+PIXEL_BASE = 10
+PIXEL_FIELDS = ("x", "y", "energy", "generation", "curiosity", "timidity", "energy_cons", "number")
+MAX_SAVED_PIXELS = 8
+CARTDATA_ID_SCALE = 1000 # Live export ids are number * 1000 plus a random part
+# Energy cubes (slots 80+) and attention/broadcast (100, 101) lie past slot 63 and are never persisted
+
+
+def cartdata_path(pico8_home=None):
+    """Location of the cart's cartdata file under PICO-8's cdata/ directory"""
+    return (pico8_home or get_config().pico8_home) / "cdata" / f"{CARTDATA_ID}.p8d.txt"
+
+
+def decode_slots(text):
+    """64 slot values from a .p8d.txt file.
+
+    Each line holds 8 slots written back to back as 8 hex digits, a signed 16.16
+    fixed-point number (00010000 is 1.0).
+    """
+    digits = ''.join(text.split())[:CARTDATA_SLOTS * 8]
+    raw = np.frombuffer(bytes.fromhex(digits[:len(digits) // 8 * 8]), dtype='>i4')
+    slots = np.zeros(CARTDATA_SLOTS, dtype=np.float64)
+    slots[:len(raw)] = raw / 65536.0
+    return slots
+
+
+def decode_population(slots):
+    """Population arrays from decoded slots, or None when the cart has no save.
+
+    Pixels whose slots run past slot 63 were never persisted. The 7th pixel keeps
+    only x..timidity (energy_cons and number are NaN), and the 8th is absent.
+    """
+    header = {name: float(slots[slot]) for name, slot in HEADER_SLOTS.items()}
+    if header["save_flag"] == 0:
+        return None
+
+    pixel_count = int(min(header["pixel_count"], MAX_SAVED_PIXELS))
+    # Slot index of every pixel field, (pixel_count, 8); indexes past the last slot read as NaN
+    index = PIXEL_BASE + np.arange(pixel_count)[:, None] * len(PIXEL_FIELDS) + np.arange(len(PIXEL_FIELDS))
+    values = np.where(index < CARTDATA_SLOTS, slots[np.minimum(index, CARTDATA_SLOTS - 1)], np.nan)
+    stored = ~np.isnan(values[:, 0])
+    values = values[stored]
+
+    columns = {field: values[:, i] for i, field in enumerate(PIXEL_FIELDS)}
+    return {
+        "generation": int(header["generation"]),
+        "pixel_counter": int(header["pixel_counter"]),
+        "pixel_count": int(header["pixel_count"]),
+        "cube_count": int(header["cube_count"]),
+        "gen_timer": header["gen_timer"],
+        "stored_pixels": int(stored.sum()),
+        "columns": columns
+    }
+
+
+def population_to_export(population, timestamp=None):
+    """Export-shaped dict (as written to conscious_export.json) the analyzers already accept.
+
+    Cartdata carries no age or memories, so those keys are left out and the analyzers'
+    defaults apply. The saved slot holds the pixel's creation `number`, not the live
+    export `id` (number * 1000 plus a random part), so it is exported as "number" and
+    the pixel gets a negative id, -number * 1000, that can never clash with a live id.
+    A pixel whose number was not persisted gets -(its save position + 1) instead.
+    """
+    columns = population["columns"]
+    pixels = []
+    for i in range(population["stored_pixels"]):
+        pixel = {
+            "x": float(columns["x"][i]),
+            "y": float(columns["y"][i]),
+            "energy": float(columns["energy"][i]),
+            "generation": int(columns["generation"][i]),
+            "curiosity": float(columns["curiosity"][i]),
+            "timidity": float(columns["timidity"][i])
+        }
+        if not np.isnan(columns["number"][i]):
+            pixel["number"] = int(columns["number"][i])
+            pixel["id"] = -pixel["number"] * CARTDATA_ID_SCALE
+        else:
+            pixel["id"] = -(i + 1)
+        if not np.isnan(columns["energy_cons"][i]):
+            pixel["energy_cons"] = float(columns["energy_cons"][i])
+        pixels.append(pixel)
+
+    return {
+        "timestamp": timestamp,
+        "generation": population["generation"],
+        "pixel_count": population["pixel_count"],
+        "pixels": pixels,
+        "source": "cartdata"
+    }
+
+
+class CartdataReader:
+    """Reads the cartdata file only when its mtime (or size) changes"""
+
+    def __init__(self, path=None):
+        self.path = str(path or cartdata_path())
+        self._stamp = None
+        self.population = None
+
+    def poll(self):
+        """The newly saved population, or None when the file is missing, unchanged or holds no save"""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        if stamp == self._stamp:
+            return None
+        self._stamp = stamp
+
+        try:
+            with span("read"):
+                with open(self.path, 'r') as f:
+                    text = f.read()
+            with span("parse"):
+                self.population = decode_population(decode_slots(text))
+        except ValueError as e:
+            # PICO-8 may be mid-write; the next mtime change brings a complete file
+            inc("exports_dropped", reason="unreadable_cartdata")
+            logger.warning("Error decoding %s: %s", self.path, e)
+            return None
+
+        if self.population:
+            inc("cartdata_reads")
+            self.population["timestamp"] = stat.st_mtime
+        return self.population
+
+    def read(self):
+        """Latest population (re-read only if the file changed since the last call)"""
+        self.poll()
+        return self.population
+
+
+if __name__ == "__main__":
+    reader = CartdataReader()
+    population = reader.read()
+    if population:
+        print(json.dumps(population_to_export(population, population["timestamp"]), indent=2))
+    else:
+        print(f"No saved population in {reader.path}")
@@ -0,0 +1,102 @@
+"""
+Sentium Pico Configuration v2.0.0
+Workspace-relative settings resolved once per process from environment variables and an optional JSON file
+"""
+
+import json
+import os
+import sys
+from functools import lru_cache
+from pathlib import Path
+
+# Repository root: python/config.py -> python -> workspace
+DEFAULT_WORKSPACE = Path(__file__).resolve().parent.parent
+CONFIG_FILE_NAME = "sentium.json"
+
+# setting -> (environment variable, default relative to the workspace)
+PATH_SETTINGS = {
+    "data_dir": ("SENTIUM_DATA_DIR", "data"),
+    "log_dir": ("SENTIUM_LOG_DIR", "data/session_logs"),
+    "model_dir": ("SENTIUM_MODEL_DIR", "python/models"),
+    "hf_cache_dir": ("SENTIUM_HF_CACHE", "python/hf_models"),
+    "ai_model_dir": ("SENTIUM_AI_MODEL_DIR", "system/ai-model"),
+    "metrics_file": ("SENTIUM_METRICS_FILE", "data/metrics.prom"),
+    "history_dir": ("SENTIUM_HISTORY_DIR", "data/history"), # Metrics time series and its rollups
+    "live_export_file": ("SENTIUM_LIVE_EXPORT", "consciousness_live.json"), # NDJSON appended by the cart's printh
+}
+VALUE_SETTINGS = {
+    "state_backend": ("SENTIUM_STATE_BACKEND", "redis"),
+    "redis_host": ("SENTIUM_REDIS_HOST", "localhost"),
+    "redis_port": ("SENTIUM_REDIS_PORT", 6379),
+    "log_level": ("SENTIUM_LOG_LEVEL", "INFO"),
+    "metrics_port": ("SENTIUM_METRICS_PORT", 0), # 0 disables the Prometheus HTTP endpoint
+    "result_cache_disk": ("SENTIUM_RESULT_CACHE_DISK", 0), # 1 also keeps analysis results in data/result_cache
+}
+STATE_BACKENDS = ("redis", "memory")
+
+
+def default_pico8_home():
+    """PICO-8's per-user directory (holds carts/ and cdata/) on this platform"""
+    if sys.platform == "darwin":
+        return Path.home() / "Library" / "Application Support" / "pico-8"
+    if sys.platform.startswith("win"):
+        return Path(os.environ.get("APPDATA", Path.home())) / "pico-8"
+    return Path.home() / ".lexaloffle" / "pico-8"
+
+
+class SentiumConfig:
+    """Resolved settings. Precedence: environment variable, then config file, then default.
+
+    Relative paths (from the environment or the file) are taken relative to the workspace,
+    so a node can point data_dir / log_dir at tmpfs without touching the rest of the tree.
+    """
+
+    def __init__(self, environ=None):
+        environ = os.environ if environ is None else environ
+
+        workspace = environ.get("SENTIUM_WORKSPACE")
+        self.config_file = Path(environ.get("SENTIUM_CONFIG") or Path(workspace or DEFAULT_WORKSPACE) / CONFIG_FILE_NAME)
+        file_settings = {}
+        if self.config_file.exists():
+            with open(self.config_file, 'r') as f:
+                file_settings = json.load(f)
+
+        self.workspace = Path(workspace or file_settings.get("workspace") or DEFAULT_WORKSPACE).expanduser().resolve()
+
+        for name, (env_var, default) in PATH_SETTINGS.items():
+            value = Path(environ.get(env_var) or file_settings.get(name) or default).expanduser()
+            setattr(self, name, value if value.is_absolute() else self.workspace / value)
+
+        for name, (env_var, default) in VALUE_SETTINGS.items():
+            value = environ.get(env_var) or file_settings.get(name) or default
+            setattr(self, name, type(default)(value))
+
+        self.pico8_home = Path(environ.get("SENTIUM_PICO8_HOME") or file_settings.get("pico8_home") or default_pico8_home()).expanduser()
+
+        if self.state_backend not in STATE_BACKENDS:
+            raise ValueError(f"Unknown state backend {self.state_backend!r} (expected one of {', '.join(STATE_BACKENDS)})")
+
+        self._directories_ready = False
+
+    def ensure_directories(self):
+        """Create the data and log directories once per process"""
+        if not self._directories_ready:
+            self.data_dir.mkdir(parents=True, exist_ok=True)
+            self.log_dir.mkdir(parents=True, exist_ok=True)
+            self._directories_ready = True
+
+    def as_dict(self):
+        settings = {"workspace": str(self.workspace), "config_file": str(self.config_file), "pico8_home": str(self.pico8_home)}
+        settings.update({name: str(getattr(self, name)) for name in PATH_SETTINGS})
+        settings.update({name: getattr(self, name) for name in VALUE_SETTINGS})
+        return settings
+
+
+@lru_cache(maxsize=None)
+def get_config():
+    """Process-wide configuration, resolved on first use and shared by every module"""
+    return SentiumConfig()
+
+
+if __name__ == "__main__":
+    print(json.dumps(get_config().as_dict(), indent=2))
@@ -11,7 +11,17 @@ from sklearn.decomposition import PCA
 import json
 import time
 from datetime import datetime
+from config import get_config
 from data_bridge import DataBridge
+from instrumentation import get_logger, inc, span
+from lineage_index import LineageIndex
+from memory_index import MemoryEventIndex
+from metrics_history import MetricsHistory
+from population import Population
+from result_cache import ResultCache, content_key
+from spatial_analysis import analyze_spatial
+
+logger = get_logger("analyzer")
 
 # Import consciousness predictor if available
 try:
@@ -19,7 +29,7 @@ try:
     PREDICTOR_AVAILABLE = True
 except ImportError:
     PREDICTOR_AVAILABLE = False
-    print("Consciousness predictor not available (missing TensorFlow). Install with: pip install tensorflow")
+    logger.warning("Consciousness predictor not available. Install with: pip install scikit-learn")
 
 class ConsciousnessAnalyzer:
     def __init__(self):
@@ -27,69 +37,79 @@ class ConsciousnessAnalyzer:
         self.personality_clusters = None
         self.behavior_patterns = {}
         self.consciousness_metrics = {}
+        self.history = MetricsHistory()
+        # Ancestry of the live runs, accumulated across analyses; a saved build (python lineage_index.py
+        # build) covers older runs and is not merged in, so liveness only reflects the live cart
+        self.lineage = LineageIndex()
+        
+        # Identical exports (touches, recopies) return the previous insights without re-running anything
+        config = get_config()
+        self.result_cache = ResultCache(disk_dir=config.data_dir / "result_cache" if config.result_cache_disk else None)
+        self.last_cache_hit = False
         
         # Initialize AI predictor if available
         self.predictor = None
         if PREDICTOR_AVAILABLE:
             try:
-                self.predictor = ConsciousnessPredictor()
-                print("AI Consciousness Predictor initialized")
+                # Inference only needs the NumPy forward pass, so TensorFlow is never imported here
+                self.predictor = ConsciousnessPredictor(backend="numpy")
+                if self.predictor.load_artifact():
+                    logger.info("AI Consciousness Predictor initialized with saved model")
+                else:
+                    logger.info("AI Consciousness Predictor initialized (no saved model - run: python conscious_predictor.py)")
             except Exception as e:
-                print(f"Predictor initialization failed: {e}")
+                logger.error("Predictor initialization failed: %s", e)
         
     def analyze_pixel_consciousness(self, pixel_data):
         """Analyze individual pixel consciousness metrics"""
-        consciousness_scores = []
-        
-        for pixel in pixel_data:
-            # Calculate consciousness score based on multiple factors
-            memory_depth = len(pixel.get('memory', []))
-            personality_complexity = abs(pixel.get('curiosity', 0.5) - pixel.get('timidity', 0.5))
-            behavioral_autonomy = pixel.get('energy', 0) / max(pixel.get('age', 1), 1)
-            
-            # Weighted consciousness score
-            consciousness_score = (
-                memory_depth * 0.3 +
-                personality_complexity * 0.4 +
-                behavioral_autonomy * 0.3
+        population = Population.coerce(pixel_data)
+        
+        # Calculate consciousness score based on multiple factors
+        memory_depth = population.memory_depth
+        personality_complexity = np.abs(population.curiosity - population.timidity)
+        behavioral_autonomy = population.energy / np.maximum(population.age, 1)
+        
+        # Weighted consciousness score
+        consciousness_score = (
+            memory_depth * 0.3 +
+            personality_complexity * 0.4 +
+            behavioral_autonomy * 0.3
+        )
+        
+        return [
+            {
+                'pixel_id': pixel_id,
+                'consciousness_score': score,
+                'memory_depth': depth,
+                'personality_complexity': complexity,
+                'behavioral_autonomy': autonomy
+            }
+            for pixel_id, score, depth, complexity, autonomy in zip(
+                population.ids, consciousness_score.tolist(), memory_depth.tolist(),
+                personality_complexity.tolist(), behavioral_autonomy.tolist()
             )
-            
-            consciousness_scores.append({
-                'pixel_id': pixel.get('id'),
-                'consciousness_score': consciousness_score,
-                'memory_depth': memory_depth,
-                'personality_complexity': personality_complexity,
-                'behavioral_autonomy': behavioral_autonomy
-            })
-        
-        return consciousness_scores
+        ]
     
     def analyze_personality_clusters(self, pixels):
         """Cluster pixels by personality traits"""
-        if len(pixels) < 2:
+        population = Population.coerce(pixels)
+        if len(population) < 2:
             return {"error": "Need at least 2 pixels for clustering"}
         
         # Extract personality features
-        features = []
-        pixel_ids = []
-        
-        for pixel in pixels:
-            features.append([
-                pixel.get('curiosity', 0.5),
-                pixel.get('timidity', 0.5),
-                pixel.get('energy', 0) / 30.0,  # Normalize energy
-                len(pixel.get('memory', [])) / 10.0  # Normalize memory depth
-            ])
-            pixel_ids.append(pixel.get('id'))
-        
-        features = np.array(features)
+        features = np.column_stack([
+            population.curiosity,
+            population.timidity,
+            population.energy / 30.0,  # Normalize energy
+            population.memory_depth / 10.0  # Normalize memory depth
+        ])
         
         # Standardize features
         scaler = StandardScaler()
         features_scaled = scaler.fit_transform(features)
         
         # Determine optimal number of clusters (max 3 for small datasets)
-        n_clusters = min(3, len(pixels))
+        n_clusters = min(3, len(population))
         
         # Perform clustering
         kmeans = KMeans(n_clusters=n_clusters, random_state=42)
@@ -98,10 +118,10 @@ class ConsciousnessAnalyzer:
         # Analyze cluster characteristics
         cluster_analysis = {}
         for i in range(n_clusters):
-            cluster_pixels = [pixels[j] for j in range(len(pixels)) if clusters[j] == i]
+            cluster_pixels = population[clusters == i]
             
-            avg_curiosity = np.mean([p.get('curiosity', 0.5) for p in cluster_pixels])
-            avg_timidity = np.mean([p.get('timidity', 0.5) for p in cluster_pixels])
+            avg_curiosity = np.mean(cluster_pixels.curiosity)
+            avg_timidity = np.mean(cluster_pixels.timidity)
             
             # Classify personality type
             if avg_curiosity > 0.6 and avg_timidity < 0.4:
@@ -116,45 +136,43 @@ class ConsciousnessAnalyzer:
                 "avg_curiosity": float(avg_curiosity),
                 "avg_timidity": float(avg_timidity),
                 "pixel_count": len(cluster_pixels),
-                "pixel_ids": [p.get('id') for p in cluster_pixels]
+                "pixel_ids": cluster_pixels.ids
             }
         
         return cluster_analysis
     
     def predict_behavior(self, pixels, cursor_data):
         """Predict likely pixel behaviors based on current state"""
-        predictions = {}
+        population = Population.coerce(pixels)
         
         cursor_aware = cursor_data.get('is_aware', False)
         attention_level = cursor_data.get('attention_level', 0)
+        curiosity, timidity, energy = population.curiosity, population.timidity, population.energy
         
-        for pixel in pixels:
-            curiosity = pixel.get('curiosity', 0.5)
-            timidity = pixel.get('timidity', 0.5)
-            energy = pixel.get('energy', 0)
-            
-            # Predict cursor interaction behavior
-            if cursor_aware:
-                approach_probability = curiosity * attention_level - timidity * 0.5
-                flee_probability = timidity * attention_level - curiosity * 0.3
-            else:
-                approach_probability = 0.1
-                flee_probability = 0.1
-            
-            # Predict division likelihood
-            division_probability = 0 if energy < 20 else (energy - 20) / 10.0 * 0.8
-            
-            # Predict death risk
-            death_risk = 0.1 if energy > 5 else 0.8
-            
-            predictions[pixel.get('id')] = {
-                "approach_cursor": max(0, min(1, approach_probability)),
-                "flee_from_cursor": max(0, min(1, flee_probability)),
-                "likely_to_divide": max(0, min(1, division_probability)),
-                "death_risk": max(0, min(1, death_risk)),
-                "predicted_action": self._get_dominant_prediction(
-                    approach_probability, flee_probability, division_probability, death_risk
-                )
+        # Predict cursor interaction behavior
+        if cursor_aware:
+            approach_probability = curiosity * attention_level - timidity * 0.5
+            flee_probability = timidity * attention_level - curiosity * 0.3
+        else:
+            approach_probability = np.full(len(population), 0.1)
+            flee_probability = np.full(len(population), 0.1)
+        
+        # Predict division likelihood
+        division_probability = np.where(energy < 20, 0, (energy - 20) / 10.0 * 0.8)
+        
+        # Predict death risk
+        death_risk = np.where(energy > 5, 0.1, 0.8)
+        
+        predictions = {}
+        for pixel_id, approach, flee, divide, death in zip(
+                population.ids, approach_probability.tolist(), flee_probability.tolist(),
+                division_probability.tolist(), death_risk.tolist()):
+            predictions[pixel_id] = {
+                "approach_cursor": max(0, min(1, approach)),
+                "flee_from_cursor": max(0, min(1, flee)),
+                "likely_to_divide": max(0, min(1, divide)),
+                "death_risk": max(0, min(1, death)),
+                "predicted_action": self._get_dominant_prediction(approach, flee, divide, death)
             }
         
         return predictions
@@ -170,24 +188,22 @@ class ConsciousnessAnalyzer:
         }
         return max(actions, key=actions.get)
     
-    def calculate_emergence_metrics(self, data):
+    def calculate_emergence_metrics(self, data, population=None):
         """Calculate metrics for emergent behavior"""
-        pixels = data.get('pixels', [])
+        if population is None:
+            population = Population.from_export(data)
         generation = data.get('generation', 1)
         
-        if not pixels:
+        if not len(population):
             return {"error": "No pixels to analyze"}
         
         # Diversity metrics
-        curiosity_values = [p.get('curiosity', 0.5) for p in pixels]
-        timidity_values = [p.get('timidity', 0.5) for p in pixels]
-        
-        curiosity_diversity = np.std(curiosity_values)
-        timidity_diversity = np.std(timidity_values)
+        curiosity_diversity = np.std(population.curiosity)
+        timidity_diversity = np.std(population.timidity)
         
         # Collective behavior metrics
-        avg_energy = np.mean([p.get('energy', 0) for p in pixels])
-        total_memory_events = sum(len(p.get('memory', [])) for p in pixels)
+        avg_energy = np.mean(population.energy)
+        total_memory_events = int(population.memory_depth.sum())
         
         # Evolution pressure
         evolution_pressure = generation * 0.1 + curiosity_diversity + timidity_diversity
@@ -200,55 +216,86 @@ class ConsciousnessAnalyzer:
             "emergence_score": float((
                 curiosity_diversity * 0.3 +
                 timidity_diversity * 0.3 +
-                (total_memory_events / len(pixels)) * 0.4
+                (total_memory_events / len(population)) * 0.4
             ))
         }
     
-    def analyze_full_consciousness_state(self):
-        """Perform complete consciousness analysis"""
-        print("Starting consciousness analysis...")
+    def analyze_full_consciousness_state(self, data=None):
+        """Perform complete consciousness analysis (of `data`, or of the bridge's export file when not given).
+
+        Content already analyzed returns the cached insights, without rewriting them or logging the session again.
+        """
+        logger.debug("Starting consciousness analysis...")
+        self.last_cache_hit = False
         
         # Read data from PICO-8
-        data = self.bridge.read_consciousness_data()
+        if data is None:
+            data = self.bridge.read_consciousness_data()
+            key = self.bridge.last_export_key
+        else:
+            key = content_key(data) if data else None
         if not data:
-            print("No consciousness data available")
+            logger.info("No consciousness data available")
             return None
         
-        pixels = data.get('pixels', [])
+        cached = self.result_cache.get(key)
+        if cached is not None:
+            self.last_cache_hit = True
+            logger.debug("Export unchanged, reusing the previous analysis")
+            return cached
+        
+        # Pixel fields are decoded (and defaulted) once; every analysis below reads the arrays
+        with span("parse"):
+            population = Population.from_export(data)
         cursor_data = data.get('cursor_interaction', {})
         
-        print(f"Analyzing {len(pixels)} pixels from generation {data.get('generation')}")
+        logger.info("Analyzing %d pixels from generation %s", len(population), data.get('generation'))
+        inc("analyses")
+        inc("pixels_analyzed", len(population))
         
         # Perform all analyses
-        consciousness_scores = self.analyze_pixel_consciousness(pixels)
-        personality_clusters = self.analyze_personality_clusters(pixels)
-        behavior_predictions = self.predict_behavior(pixels, cursor_data)
-        emergence_metrics = self.calculate_emergence_metrics(data)
+        with span("score"):
+            consciousness_scores = self.analyze_pixel_consciousness(population)
+        with span("cluster"):
+            personality_clusters = self.analyze_personality_clusters(population)
+        behavior_predictions = self.predict_behavior(population, cursor_data)
+        emergence_metrics = self.calculate_emergence_metrics(data, population)
+        with span("spatial"):
+            spatial_metrics = analyze_spatial(population)
+        memory_index = MemoryEventIndex()
+        memory_index.add_snapshot(data)
+        with span("lineage"):
+            self.lineage.add_snapshot(data)
+            lineage_summary = self.lineage.summary()
         
         # AI Consciousness Prediction (if available)
         ai_insights = {}
         if self.predictor:
             try:
-                print("Running AI consciousness prediction...")
+                logger.debug("Running AI consciousness prediction...")
                 ai_insights = self.predictor.generate_consciousness_insights(data)
-                print("AI prediction complete!")
+                logger.debug("AI prediction complete!")
             except Exception as e:
-                print(f"AI prediction failed: {e}")
+                inc("prediction_failures")
+                logger.error("AI prediction failed: %s", e)
         
         # Compile comprehensive insights
         insights = {
             "analysis_timestamp": datetime.now().isoformat(),
             "generation": data.get('generation'),
-            "pixel_count": len(pixels),
+            "pixel_count": len(population),
             "consciousness_scores": consciousness_scores,
             "personality_clusters": personality_clusters,
             "behavior_predictions": behavior_predictions,
             "emergence_metrics": emergence_metrics,
+            "spatial_metrics": spatial_metrics,
+            "memory_events": memory_index.event_summary(),
+            "lineage": lineage_summary,
             "overall_consciousness_level": float(np.mean([
                 score['consciousness_score'] for score in consciousness_scores
             ])) if consciousness_scores else 0,
             "dominant_personality": self._get_dominant_personality(personality_clusters),
-            "session_insights": self._generate_session_insights(data, emergence_metrics)
+            "session_insights": self._generate_session_insights(data, emergence_metrics, spatial_metrics)
         }
         
         # Add AI insights if available
@@ -261,7 +308,12 @@ class ConsciousnessAnalyzer:
         # Log session data
         self.bridge.log_session_data(data)
         
-        print(f"Analysis complete! Overall consciousness level: {insights['overall_consciousness_level']:.2f}")
+        # Append the population aggregates to the metrics history
+        self.history.append_insights(insights)
+        
+        self.result_cache.put(key, insights)
+        
+        logger.info("Analysis complete! Overall consciousness level: %.2f", insights['overall_consciousness_level'])
         
         return insights
     
@@ -279,7 +331,7 @@ class ConsciousnessAnalyzer:
         
         return "unknown"
     
-    def _generate_session_insights(self, data, emergence_metrics):
+    def _generate_session_insights(self, data, emergence_metrics, spatial_metrics=None):
         """Generate human-readable insights about the session"""
         insights = []
         
@@ -311,6 +363,16 @@ class ConsciousnessAnalyzer:
         else:
             insights.append("Low emergence: Simple behavioral patterns")
         
+        # Spatial insights
+        crowding = (spatial_metrics or {}).get('crowding_index')
+        if crowding is not None:
+            if crowding < 0.7:
+                insights.append(f"Clustered population: {spatial_metrics['largest_group']} pixels gathered in one group")
+            elif crowding > 1.3:
+                insights.append("Dispersed population: Pixels keeping their distance")
+            else:
+                insights.append("Scattered population: No strong spatial grouping")
+        
         # Cursor interaction insights
         cursor_data = data.get('cursor_interaction', {})
         if cursor_data.get('is_aware', False):
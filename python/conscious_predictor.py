@@ -5,26 +5,73 @@ LSTM neural network for consciousness prediction and evolution analysis
 
 import numpy as np
 import pandas as pd
-import tensorflow as tf
-from tensorflow.keras.models import Sequential, load_model
-from tensorflow.keras.layers import LSTM, Dense, Dropout, Attention, Input
-from tensorflow.keras.optimizers import Adam
 from sklearn.preprocessing import MinMaxScaler
 from sklearn.metrics import mean_squared_error, mean_absolute_error
+import importlib.util
 import json
 import os
+import threading
 from datetime import datetime
 from pathlib import Path
+from config import get_config
 from data_bridge import DataBridge
+from headless_sim import generate_corpus
+from session_archive import archived_snapshots
+from instrumentation import get_logger, inc, span
+from numpy_lstm import NumpyLSTMModel, ArrayMinMaxScaler
+from population import Population
+
+logger = get_logger("predictor")
+
+# TensorFlow is imported on first use: training needs it, NumPy-backed inference never does
+tf = None
+
+def _load_tensorflow():
+    """Import TensorFlow lazily and return the module"""
+    global tf
+    if tf is None:
+        import tensorflow
+        tf = tensorflow
+    return tf
+
+# Trained model and its fitted scaler live together in one versioned artifact
+MODEL_DIR = get_config().model_dir
+ARTIFACT_VERSION = 1
+SCALER_ATTRIBUTES = ('min_', 'scale_', 'data_min_', 'data_max_', 'data_range_')
+
+# Older (scaled) training windows kept in the artifact and mixed into fine-tuning to avoid drift
+REPLAY_BUFFER_SIZE = 512
+REPLAY_HOLDOUT_SIZE = 128 # Replay buffer slots holding validation windows, which are never trained on
+VALIDATION_SPLIT = 0.2 # Newest fraction of windows held out for validation
+
+# Headless simulator run used when there are no session logs to train on (60 s of 32 worlds, a snapshot every 3 s)
+SYNTHETIC_WORLDS = 32
+SYNTHETIC_TICKS = 1800
+SYNTHETIC_SNAPSHOT_EVERY = 90
+
+# Loaded artifacts shared by every predictor in this process: path -> (mtime, model, scaler, meta, replay)
+_ARTIFACT_CACHE = {}
 
 class ConsciousnessPredictor:
-    def __init__(self):
+    def __init__(self, backend="auto"):
         self.bridge = DataBridge()
         self.model = None
+        
+        # Inference backend: "keras" (TensorFlow) or "numpy" (pure NumPy forward pass)
+        if backend == "auto":
+            backend = "keras" if importlib.util.find_spec("tensorflow") else "numpy"
+        self.backend = backend
         self.scaler = MinMaxScaler()
         self.sequence_length = 10  # Look back 10 time steps
-        self.model_path = "conscious_predictor_model.h5"
-        self.scaler_path = "consciousness_scaler.pkl"
+        self.artifact_path = MODEL_DIR / f"consciousness_predictor_v{ARTIFACT_VERSION}.npz"
+        self.artifact_meta = {}
+        self.replay_X = None
+        self.replay_y = None
+        self.replay_holdout = None
+        
+        # Online fine-tuning runs in a background thread; the swap lock guards model replacement
+        self._fine_tune_lock = threading.Lock()
+        self._swap_lock = threading.Lock()
         
         # Features to use for prediction
         self.features = [
@@ -32,59 +79,88 @@ class ConsciousnessPredictor:
             'generation', 'pixel_count', 'consciousness_score'
         ]
         
-        print("Consciousness Predictor initialized")
+        logger.info("Consciousness Predictor initialized")
     
-    def load_historical_data(self):
-        """Load all historical session data for training"""
-        print("Loading historical consciousness data...")
+    def _session_files(self, since=None):
+        """Session logs in chronological order, optionally only those logged after `since` (a file name)"""
+        session_files = sorted(self.bridge.session_logs_path.glob("session_*.json"))
+        if since:
+            session_files = [f for f in session_files if f.name > since]
+        return session_files
+    
+    def load_historical_data(self, session_files=None, allow_synthetic=True):
+        """Load historical session data for training (all session logs unless a list is given)"""
+        logger.info("Loading historical consciousness data...")
         
-        session_logs_path = self.bridge.session_logs_path
         all_data = []
+        if session_files is None:
+            session_files = self._session_files()
+            # Logs moved into the session archive (python session_archive.py import --delete) count too
+            for _, snapshot in archived_snapshots(skip_names={f.name for f in session_files}):
+                all_data.extend(self._session_records(snapshot))
         
         # Load all session log files
-        for session_file in session_logs_path.glob("session_*.json"):
+        for session_file in session_files:
             try:
                 with open(session_file, 'r') as f:
                     session_data = json.load(f)
                     
-                # Extract pixel data with timestamps
-                if 'pixels' in session_data:
-                    for pixel in session_data['pixels']:
-                        pixel_record = {
-                            'timestamp': session_data.get('timestamp', 0),
-                            'generation': session_data.get('generation', 1),
-                            'pixel_count': session_data.get('pixel_count', 1),
-                            'pixel_id': pixel.get('id', 0),
-                            'curiosity': pixel.get('curiosity', 0.5),
-                            'timidity': pixel.get('timidity', 0.5),
-                            'energy': pixel.get('energy', 0),
-                            'age': pixel.get('age', 1),
-                            'memory_depth': len(pixel.get('memory', [])),
-                            'consciousness_score': 0  # Will be calculated
-                        }
-                        
-                        # Calculate consciousness score
-                        pixel_record['consciousness_score'] = self._calculate_consciousness_score(pixel_record)
-                        all_data.append(pixel_record)
+                all_data.extend(self._session_records(session_data))
                         
             except Exception as e:
-                print(f"Error loading {session_file}: {e}")
+                logger.warning("Error loading %s: %s", session_file, e)
         
         if not all_data:
-            print("No historical data found. Generating synthetic data for initial training...")
+            if not allow_synthetic:
+                return pd.DataFrame(columns=['pixel_id', 'timestamp'] + self.features)
+            logger.info("No historical data found. Generating synthetic data for initial training...")
             return self._generate_synthetic_data()
         
         df = pd.DataFrame(all_data)
         df = df.sort_values(['pixel_id', 'timestamp'])
         
-        print(f"Loaded {len(df)} consciousness records from {len(df['pixel_id'].unique())} pixels")
+        logger.info("Loaded %d consciousness records from %d pixels", len(df), df['pixel_id'].nunique())
         return df
     
+    def _session_records(self, session_data):
+        """One training record per pixel of a session log snapshot"""
+        population = Population.from_export(session_data)
+        columns = {
+            'curiosity': population.curiosity,
+            'timidity': population.timidity,
+            'energy': population.energy,
+            'age': population.age,
+            'memory_depth': population.memory_depth
+        }
+        scores = self._calculate_consciousness_score(columns)
+        
+        timestamp = session_data.get('timestamp', 0)
+        generation = session_data.get('generation', 1)
+        pixel_count = session_data.get('pixel_count', 1)
+        return [
+            {
+                'timestamp': timestamp,
+                'generation': generation,
+                'pixel_count': pixel_count,
+                'pixel_id': pixel_id,
+                'curiosity': curiosity,
+                'timidity': timidity,
+                'energy': energy,
+                'age': age,
+                'memory_depth': memory_depth,
+                'consciousness_score': score
+            }
+            for pixel_id, curiosity, timidity, energy, age, memory_depth, score in zip(
+                population.ids, *(columns[name].tolist() for name in columns), scores.tolist()
+            )
+            if pixel_id is not None # Pixels without an id cannot form sequences
+        ]
+    
     def _calculate_consciousness_score(self, pixel_data):
-        """Calculate consciousness score from pixel features"""
+        """Calculate consciousness score from pixel features (scalars, or one array per feature)"""
         memory_depth = pixel_data['memory_depth']
-        personality_complexity = abs(pixel_data['curiosity'] - pixel_data['timidity'])
-        behavioral_autonomy = pixel_data['energy'] / max(pixel_data['age'], 1)
+        personality_complexity = np.abs(pixel_data['curiosity'] - pixel_data['timidity'])
+        behavioral_autonomy = pixel_data['energy'] / np.maximum(pixel_data['age'], 1)
         
         consciousness_score = (
             memory_depth * 0.3 +
@@ -95,60 +171,28 @@ class ConsciousnessPredictor:
         return consciousness_score
     
     def _generate_synthetic_data(self):
-        """Generate synthetic consciousness data for initial training"""
-        print("Generating synthetic consciousness data...")
+        """Generate initial training data by running the cart's rules headless"""
+        logger.info("Generating synthetic consciousness data...")
         
         synthetic_data = []
-        n_pixels = 5
-        n_timesteps = 50
-        
-        for pixel_id in range(1, n_pixels + 1):
-            # Each pixel has evolving traits over time
-            base_curiosity = np.random.uniform(0.2, 0.8)
-            base_timidity = 1.0 - base_curiosity + np.random.uniform(-0.2, 0.2)
-            base_timidity = np.clip(base_timidity, 0, 1)
-            
-            for t in range(n_timesteps):
-                # Evolving traits with some noise
-                curiosity = base_curiosity + np.random.normal(0, 0.1)
-                timidity = base_timidity + np.random.normal(0, 0.1)
-                curiosity = np.clip(curiosity, 0, 1)
-                timidity = np.clip(timidity, 0, 1)
-                
-                energy = np.random.uniform(5, 30)
-                age = t + 1
-                memory_depth = min(t // 5, 10)  # Memory grows slowly
-                generation = t // 10 + 1
-                
-                pixel_record = {
-                    'timestamp': t,
-                    'generation': generation,
-                    'pixel_count': n_pixels,
-                    'pixel_id': pixel_id,
-                    'curiosity': curiosity,
-                    'timidity': timidity,
-                    'energy': energy,
-                    'age': age,
-                    'memory_depth': memory_depth,
-                    'consciousness_score': 0
-                }
-                
-                # Calculate consciousness with some trend
-                consciousness_trend = np.sin(t * 0.1) * 0.5 + t * 0.02
-                pixel_record['consciousness_score'] = self._calculate_consciousness_score(pixel_record) + consciousness_trend
-                
-                synthetic_data.append(pixel_record)
+        for snapshot in generate_corpus(SYNTHETIC_WORLDS, SYNTHETIC_TICKS, snapshot_every=SYNTHETIC_SNAPSHOT_EVERY):
+            synthetic_data.extend(self._session_records(snapshot))
         
         df = pd.DataFrame(synthetic_data)
-        print(f"Generated {len(df)} synthetic consciousness records")
+        df = df.sort_values(['pixel_id', 'timestamp'])
+        logger.info("Generated %d synthetic consciousness records", len(df))
         return df
     
-    def prepare_sequences(self, df):
-        """Prepare time series sequences for LSTM training"""
-        print("Preparing time series sequences...")
+    def prepare_sequences(self, df, with_timestamps=False):
+        """Prepare time series sequences for LSTM training
+        
+        With with_timestamps, also return the timestamp of each window's target step.
+        """
+        logger.info("Preparing time series sequences...")
         
         sequences = []
         targets = []
+        timestamps = []
         
         # Group by pixel_id to create sequences
         for pixel_id in df['pixel_id'].unique():
@@ -159,6 +203,7 @@ class ConsciousnessPredictor:
                 
             # Extract feature matrix
             feature_data = pixel_data[self.features].values
+            times = pixel_data['timestamp'].values
             
             # Create sequences
             for i in range(len(feature_data) - self.sequence_length):
@@ -169,64 +214,205 @@ class ConsciousnessPredictor:
                 
                 sequences.append(sequence)
                 targets.append(target)
+                timestamps.append(times[i + self.sequence_length])
         
         X = np.array(sequences)
         y = np.array(targets)
         
-        print(f"Created {len(X)} sequences with shape {X.shape}")
+        logger.info("Created %d sequences with shape %s", len(X), X.shape)
+        if with_timestamps:
+            return X, y, np.array(timestamps)
         return X, y
     
-    def build_model(self, input_shape):
+    @staticmethod
+    def _split_by_time(X, y, timestamps):
+        """Split windows into (X_train, y_train, X_val, y_val), holding out those with the newest targets"""
+        order = np.argsort(timestamps, kind='stable')
+        split_idx = len(order) - int(VALIDATION_SPLIT * len(order))
+        train, val = order[:split_idx], order[split_idx:]
+        return X[train], y[train], X[val], y[val]
+    
+    def build_model(self, input_shape, verbose=True):
         """Build LSTM model for consciousness prediction"""
-        print("Building LSTM consciousness prediction model...")
-        
-        model = Sequential([
-            LSTM(64, return_sequences=True, input_shape=input_shape),
-            Dropout(0.2),
-            LSTM(32, return_sequences=False),
-            Dropout(0.2),
-            Dense(16, activation='relu'),
-            Dense(1, activation='linear')  # Consciousness score output
+        if verbose:
+            logger.info("Building LSTM consciousness prediction model...")
+        
+        keras = _load_tensorflow().keras
+        model = keras.Sequential([
+            keras.layers.LSTM(64, return_sequences=True, input_shape=input_shape),
+            keras.layers.Dropout(0.2),
+            keras.layers.LSTM(32, return_sequences=False),
+            keras.layers.Dropout(0.2),
+            keras.layers.Dense(16, activation='relu'),
+            keras.layers.Dense(1, activation='linear')  # Consciousness score output
         ])
         
         model.compile(
-            optimizer=Adam(learning_rate=0.001),
+            optimizer=keras.optimizers.Adam(learning_rate=0.001),
             loss='mse',
             metrics=['mae']
         )
         
-        print("Model architecture:")
-        model.summary()
+        if verbose:
+            logger.info("Model architecture:")
+            model.summary(print_fn=logger.info)
         return model
     
+    def save_artifact(self, extra_meta=None):
+        """Save model weights, fitted scaler and replay buffer as one versioned .npz artifact (atomic replace)"""
+        MODEL_DIR.mkdir(parents=True, exist_ok=True)
+        
+        weights = self.model.get_weights()
+        arrays = {f"weight_{i}": w for i, w in enumerate(weights)}
+        for attr in SCALER_ATTRIBUTES:
+            arrays[f"scaler_{attr}"] = getattr(self.scaler, attr)
+        if self.replay_X is not None:
+            arrays['replay_X'] = self.replay_X
+            arrays['replay_y'] = self.replay_y
+            arrays['replay_holdout'] = self.replay_holdout
+        
+        meta = dict(self.artifact_meta)
+        meta.update({
+            'version': ARTIFACT_VERSION,
+            'features': self.features,
+            'sequence_length': self.sequence_length,
+            'weight_count': len(weights),
+            'scaler_samples_seen': int(self.scaler.n_samples_seen_),
+            'saved_at': datetime.now().isoformat()
+        })
+        meta.update(extra_meta or {})
+        arrays['meta'] = np.array(json.dumps(meta))
+        
+        tmp_path = self.artifact_path.with_name(self.artifact_path.name + ".tmp")
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, **arrays)
+        os.replace(tmp_path, self.artifact_path)
+        
+        self.artifact_meta = meta
+        _ARTIFACT_CACHE[self._artifact_cache_key()] = (
+            self.artifact_path.stat().st_mtime_ns, self.model, self.scaler, meta,
+            (self.replay_X, self.replay_y, self.replay_holdout)
+        )
+        logger.info("Saved consciousness model artifact to: %s", self.artifact_path)
+    
+    def _artifact_cache_key(self):
+        return f"{self.artifact_path}:{self.backend}"
+    
+    def load_artifact(self):
+        """Restore model and scaler from the saved artifact, reusing the in-process copy when current"""
+        if not self.artifact_path.exists():
+            return False
+        
+        mtime = self.artifact_path.stat().st_mtime_ns
+        cached = _ARTIFACT_CACHE.get(self._artifact_cache_key())
+        if cached and cached[0] == mtime:
+            _, self.model, self.scaler, self.artifact_meta, (self.replay_X, self.replay_y, self.replay_holdout) = cached
+            return True
+        
+        try:
+            with np.load(self.artifact_path, allow_pickle=False) as artifact:
+                meta = json.loads(str(artifact['meta']))
+                if (meta.get('version') != ARTIFACT_VERSION or
+                        meta.get('features') != self.features or
+                        meta.get('sequence_length') != self.sequence_length):
+                    logger.warning("Saved model artifact does not match this predictor, retraining required")
+                    return False
+                
+                weights = [artifact[f"weight_{i}"] for i in range(meta['weight_count'])]
+                scaler_state = {attr: artifact[f"scaler_{attr}"] for attr in SCALER_ATTRIBUTES}
+                replay = (None, None, None)
+                if 'replay_X' in artifact.files:
+                    # Buffers saved before the holdout mask existed have no validation slots yet
+                    holdout = (artifact['replay_holdout'] if 'replay_holdout' in artifact.files
+                               else np.zeros(len(artifact['replay_y']), dtype=bool))
+                    replay = (artifact['replay_X'], artifact['replay_y'], holdout)
+        except Exception as e:
+            logger.error("Error loading model artifact: %s", e)
+            return False
+        
+        if self.backend == "numpy":
+            model = NumpyLSTMModel(weights)
+            scaler = ArrayMinMaxScaler(**scaler_state)
+        else:
+            model = self.build_model((self.sequence_length, len(self.features)), verbose=False)
+            model.set_weights(weights)
+            scaler = MinMaxScaler()
+            for attr, value in scaler_state.items():
+                setattr(scaler, attr, value)
+        scaler.n_features_in_ = len(self.features)
+        scaler.n_samples_seen_ = meta.get('scaler_samples_seen', 0)
+        
+        self.model, self.scaler, self.artifact_meta = model, scaler, meta
+        self.replay_X, self.replay_y, self.replay_holdout = replay
+        _ARTIFACT_CACHE[self._artifact_cache_key()] = (mtime, model, scaler, meta, replay)
+        return True
+    
+    def _scale_sequences(self, X):
+        """Apply the fitted scaler to a (windows, steps, features) array"""
+        return self.scaler.transform(X.reshape(-1, X.shape[-1])).reshape(X.shape)
+    
+    def _update_replay_buffer(self, X_scaled, y, holdout=False):
+        """Reservoir-sample new windows into the fixed-size replay buffer.
+        
+        Training windows and held-out validation windows fill separate slots, marked by the
+        persisted replay_holdout mask, so a window that was trained on never becomes validation data.
+        """
+        counter = 'holdout_seen' if holdout else 'replay_seen'
+        capacity = REPLAY_HOLDOUT_SIZE if holdout else REPLAY_BUFFER_SIZE - REPLAY_HOLDOUT_SIZE
+        seen = self.artifact_meta.get(counter, 0)
+        if self.replay_X is None:
+            self.replay_X = np.empty((0,) + X_scaled.shape[1:], dtype=np.float32)
+            self.replay_y = np.empty((0,), dtype=np.float32)
+            self.replay_holdout = np.empty((0,), dtype=bool)
+        
+        same = self.replay_holdout == holdout
+        replay_X = list(self.replay_X[same])
+        replay_y = list(self.replay_y[same])
+        for window, target in zip(X_scaled.astype(np.float32), y.astype(np.float32)):
+            seen += 1
+            if len(replay_X) < capacity:
+                replay_X.append(window)
+                replay_y.append(target)
+            else:
+                slot = np.random.randint(seen)
+                if slot < capacity:
+                    replay_X[slot] = window
+                    replay_y[slot] = target
+        
+        replay_X = np.array(replay_X, dtype=np.float32).reshape((-1,) + X_scaled.shape[1:])
+        self.replay_X = np.concatenate([self.replay_X[~same], replay_X])
+        self.replay_y = np.concatenate([self.replay_y[~same], np.array(replay_y, dtype=np.float32)])
+        self.replay_holdout = np.concatenate([self.replay_holdout[~same], np.full(len(replay_X), holdout)])
+        self.artifact_meta[counter] = seen
+    
     def train_model(self, retrain=False):
         """Train the consciousness prediction model"""
-        if os.path.exists(self.model_path) and not retrain:
-            print("Loading existing model...")
-            self.model = load_model(self.model_path)
+        if not retrain and self.load_artifact():
+            logger.info("Loaded saved consciousness model (%s)", self.artifact_meta.get('saved_at', 'unknown date'))
             return
         
-        print("Training new consciousness prediction model...")
+        logger.info("Training new consciousness prediction model...")
         
         # Load and prepare data
-        df = self.load_historical_data()
-        X, y = self.prepare_sequences(df)
+        session_files = self._session_files()
+        df = self.load_historical_data(session_files)
+        X, y, timestamps = self.prepare_sequences(df, with_timestamps=True)
         
         if len(X) == 0:
-            print("No valid sequences found for training!")
+            logger.warning("No valid sequences found for training!")
             return
         
-        # Normalize data
+        # Normalize data (fresh scaler so a shared, already-loaded one is never refitted in place)
+        self.scaler = MinMaxScaler()
         X_reshaped = X.reshape(-1, X.shape[-1])
         X_scaled = self.scaler.fit_transform(X_reshaped)
         X_scaled = X_scaled.reshape(X.shape)
         
-        # Split train/validation
-        split_idx = int(0.8 * len(X_scaled))
-        X_train, X_val = X_scaled[:split_idx], X_scaled[split_idx:]
-        y_train, y_val = y[:split_idx], y[split_idx:]
+        # Split train/validation, validating on the newest windows
+        X_train, y_train, X_val, y_val = self._split_by_time(X_scaled, y, timestamps)
         
         # Build and train model
+        tf = _load_tensorflow()
         self.model = self.build_model((self.sequence_length, len(self.features)))
         
         history = self.model.fit(
@@ -241,70 +427,165 @@ class ConsciousnessPredictor:
             ]
         )
         
-        # Save model
-        self.model.save(self.model_path)
-        
         # Evaluate
         val_pred = self.model.predict(X_val)
         mse = mean_squared_error(y_val, val_pred)
         mae = mean_absolute_error(y_val, val_pred)
         
-        print(f"Model trained! Validation MSE: {mse:.4f}, MAE: {mae:.4f}")
+        logger.info("Model trained! Validation MSE: %.4f, MAE: %.4f", mse, mae)
+        
+        if self.backend == "numpy":
+            self.model = NumpyLSTMModel(self.model.get_weights())
+        
+        # Start a fresh replay buffer; the validation windows seed its holdout slots
+        self.artifact_meta = {}
+        self.replay_X = self.replay_y = self.replay_holdout = None
+        self._update_replay_buffer(X_train, y_train)
+        self._update_replay_buffer(X_val, y_val, holdout=True)
+        
+        # Save model and scaler together
+        self.save_artifact({
+            'val_mse': float(mse),
+            'val_mae': float(mae),
+            'last_session': session_files[-1].name if session_files else None
+        })
+    
+    def fine_tune(self, epochs=5, batch_size=32, learning_rate=0.0001):
+        """Update the model on windows from sessions logged since it was last trained.
+        
+        New windows are mixed with the replay buffer, a copy of the model is trained on them,
+        and the copy replaces the live model only if it lowers validation loss.
+        """
+        if not self._fine_tune_lock.acquire(blocking=False):
+            logger.info("Fine-tuning already in progress")
+            return False
+        
+        try:
+            if self.model is None and not self.load_artifact():
+                logger.warning("No trained model to fine-tune - run a full training first")
+                return False
+            
+            session_files = self._session_files(since=self.artifact_meta.get('last_session'))
+            if not session_files:
+                logger.info("No new sessions since last training")
+                return False
+            
+            df = self.load_historical_data(session_files, allow_synthetic=False)
+            X, y, timestamps = self.prepare_sequences(df, with_timestamps=True)
+            if len(X) == 0:
+                logger.info("New sessions contain no complete windows yet")
+                return False
+            
+            X_scaled = self._scale_sequences(X)
+            
+            # Validate on the newest new windows plus the replay buffer's holdout slots, so old skill
+            # counts too and the candidate is never scored on windows any model was trained on
+            X_new, y_new, X_held, y_held = self._split_by_time(X_scaled, y, timestamps)
+            X_train, y_train, X_val, y_val = X_new, y_new, X_held, y_held
+            if self.replay_X is not None and len(self.replay_X):
+                holdout = self.replay_holdout
+                X_train = np.concatenate([X_train, self.replay_X[~holdout]])
+                y_train = np.concatenate([y_train, self.replay_y[~holdout]])
+                X_val = np.concatenate([X_val, self.replay_X[holdout]])
+                y_val = np.concatenate([y_val, self.replay_y[holdout]])
+            if len(X_val) == 0:
+                logger.info("Not enough windows to validate a fine-tune yet")
+                return False
+            
+            # Training always happens on a Keras copy, whichever backend serves inference
+            keras = _load_tensorflow().keras
+            live_model = self.model
+            if isinstance(live_model, NumpyLSTMModel):
+                live_model = self.build_model((self.sequence_length, len(self.features)), verbose=False)
+                live_model.set_weights(self.model.get_weights())
+            candidate = keras.models.clone_model(live_model)
+            candidate.set_weights(live_model.get_weights())
+            candidate.compile(optimizer=keras.optimizers.Adam(learning_rate=learning_rate), loss='mse', metrics=['mae'])
+            
+            current_loss = live_model.evaluate(X_val, y_val, verbose=0)[0]
+            candidate.fit(X_train, y_train, epochs=epochs, batch_size=batch_size, shuffle=True, verbose=0)
+            candidate_loss = candidate.evaluate(X_val, y_val, verbose=0)[0]
+            
+            improved = candidate_loss < current_loss
+            with self._swap_lock:
+                if improved:
+                    self.model = candidate if self.backend == "keras" else NumpyLSTMModel(candidate.get_weights())
+                self._update_replay_buffer(X_new, y_new)
+                self._update_replay_buffer(X_held, y_held, holdout=True)
+                # Always advance the watermark so the same sessions are not replayed as "new" again
+                self.save_artifact({
+                    'last_session': session_files[-1].name,
+                    'val_mse': float(candidate_loss if improved else current_loss),
+                    'fine_tuned_at': datetime.now().isoformat()
+                })
+            
+            status = "accepted" if improved else "rejected"
+            logger.info("Fine-tuning %s: validation loss %.4f -> %.4f on %d new windows",
+                        status, current_loss, candidate_loss, len(X))
+            return improved
+        
+        except Exception as e:
+            logger.error("Fine-tuning error: %s", e)
+            return False
+        finally:
+            self._fine_tune_lock.release()
+    
+    def start_fine_tuning(self, **kwargs):
+        """Run fine_tune in a background thread; inference keeps using the current model meanwhile"""
+        if self._fine_tune_lock.locked():
+            return None
+        
+        thread = threading.Thread(target=self.fine_tune, kwargs=kwargs, name="consciousness-fine-tune", daemon=True)
+        thread.start()
+        return thread
         
     def predict_consciousness(self, current_data):
         """Predict future consciousness levels"""
-        if self.model is None:
-            print("Model not loaded! Please train first.")
+        # Take one reference so a background fine-tune swap cannot change the model mid-batch
+        model = self.model
+        if model is None:
+            logger.warning("Model not loaded! Please train first.")
             return None
         
         try:
             # Prepare current data for prediction
-            pixels = current_data.get('pixels', [])
-            if not pixels:
+            population = Population.from_export(current_data)
+            if not len(population):
                 return None
             
-            predictions = {}
+            columns = {
+                'curiosity': population.curiosity,
+                'timidity': population.timidity,
+                'energy': population.energy,
+                'age': population.age,
+                'memory_depth': population.memory_depth,
+                'generation': np.full(len(population), current_data.get('generation', 1), dtype=np.float64),
+                'pixel_count': np.full(len(population), current_data.get('pixel_count', 1), dtype=np.float64)
+            }
+            columns['consciousness_score'] = self._calculate_consciousness_score(columns)
+            current_scores = columns['consciousness_score'].tolist()
+            rows = np.column_stack([columns[feature] for feature in self.features])
             
-            for pixel in pixels:
-                pixel_features = {
-                    'curiosity': pixel.get('curiosity', 0.5),
-                    'timidity': pixel.get('timidity', 0.5),
-                    'energy': pixel.get('energy', 0),
-                    'age': pixel.get('age', 1),
-                    'memory_depth': len(pixel.get('memory', [])),
-                    'generation': current_data.get('generation', 1),
-                    'pixel_count': current_data.get('pixel_count', 1),
-                    'consciousness_score': self._calculate_consciousness_score({
-                        'curiosity': pixel.get('curiosity', 0.5),
-                        'timidity': pixel.get('timidity', 0.5),
-                        'energy': pixel.get('energy', 0),
-                        'age': pixel.get('age', 1),
-                        'memory_depth': len(pixel.get('memory', []))
-                    })
-                }
-                
-                # Create sequence (for now, repeat current state)
-                sequence = np.array([[list(pixel_features.values())] * self.sequence_length])
-                
-                # Normalize
-                sequence_reshaped = sequence.reshape(-1, sequence.shape[-1])
-                sequence_scaled = self.scaler.transform(sequence_reshaped)
-                sequence_scaled = sequence_scaled.reshape(sequence.shape)
-                
-                # Predict
-                pred = self.model.predict(sequence_scaled, verbose=0)[0][0]
-                
-                predictions[pixel.get('id')] = {
-                    'current_consciousness': pixel_features['consciousness_score'],
-                    'predicted_consciousness': float(pred),
-                    'consciousness_trend': 'increasing' if pred > pixel_features['consciousness_score'] else 'decreasing',
+            # Create sequences (for now, repeat current state) and predict all pixels in one batch
+            sequences = np.repeat(rows.astype(np.float64)[:, np.newaxis, :], self.sequence_length, axis=1)
+            with span("predict"):
+                sequences_scaled = self._scale_sequences(sequences)
+                preds = model.predict(sequences_scaled, verbose=0)[:, 0]
+            inc("pixels_predicted", len(population))
+            
+            predictions = {}
+            for pixel_id, current, pred in zip(population.ids, current_scores, preds.tolist()):
+                predictions[pixel_id] = {
+                    'current_consciousness': current,
+                    'predicted_consciousness': pred,
+                    'consciousness_trend': 'increasing' if pred > current else 'decreasing',
                     'confidence': 0.8  # Placeholder
                 }
             
             return predictions
             
         except Exception as e:
-            print(f"Prediction error: {e}")
+            logger.error("Prediction error: %s", e)
             return None
     
     def generate_consciousness_insights(self, current_data):
@@ -375,10 +656,26 @@ class ConsciousnessPredictor:
         return alerts
 
 if __name__ == "__main__":
+    import sys
+    
     predictor = ConsciousnessPredictor()
     
-    print("Training consciousness prediction model...")
-    predictor.train_model(retrain=True)
+    if len(sys.argv) > 1 and sys.argv[1] == "finetune":
+        print("Fine-tuning consciousness prediction model on new sessions...")
+        predictor.fine_tune()
+    elif len(sys.argv) > 1 and sys.argv[1] == "verify-numpy":
+        # Compare the NumPy backend against Keras on the stored replay windows
+        predictor.backend = "keras"
+        if not predictor.load_artifact() or predictor.replay_X is None:
+            print("No saved model artifact with replay windows to verify against")
+            sys.exit(1)
+        numpy_model = NumpyLSTMModel(predictor.model.get_weights())
+        keras_preds = predictor.model.predict(predictor.replay_X, verbose=0)
+        numpy_preds = numpy_model.predict(predictor.replay_X)
+        print(f"Max abs difference over {len(keras_preds)} windows: {np.max(np.abs(keras_preds - numpy_preds)):.2e}")
+    else:
+        print("Training consciousness prediction model...")
+        predictor.train_model(retrain=True)
     
     print("\nTesting with current consciousness data...")
     current_data = predictor.bridge.read_consciousness_data()
@@ -8,28 +8,49 @@ import time
 import os
 from datetime import datetime
 from pathlib import Path
+from config import get_config
+from instrumentation import get_logger, inc, span
 from state_manager import StateManager
 from agent_core import AgentCore
+from agent_executor import AsyncAgentExecutor
+from cartdata_reader import CartdataReader, population_to_export
+from result_cache import content_key
+from session_archive import RunTagger
+
+logger = get_logger("data_bridge")
 
 class DataBridge:
-    def __init__(self, workspace_path="/Users/lopanapol/git-repo/sentium-pico"):
-        self.workspace_path = Path(workspace_path)
-        self.data_path = self.workspace_path / "data"
-        self.session_logs_path = self.data_path / "session_logs"
+    def __init__(self, workspace_path=None):
+        config = get_config()
+        if workspace_path is None:
+            # Configured locations (env vars / sentium.json); directories are created once per process
+            self.workspace_path = config.workspace
+            self.data_path = config.data_dir
+            self.session_logs_path = config.log_dir
+            config.ensure_directories()
+        else:
+            self.workspace_path = Path(workspace_path)
+            self.data_path = self.workspace_path / "data"
+            self.session_logs_path = self.data_path / "session_logs"
+            self.data_path.mkdir(parents=True, exist_ok=True)
+            self.session_logs_path.mkdir(exist_ok=True)
         self.state_manager = StateManager()
         self.agent_core = AgentCore(workspace_path=str(self.workspace_path))
+        self.agent_executor = AsyncAgentExecutor(workspace_path=str(self.workspace_path))
         
         # File paths for data exchange
         self.conscious_export_file = self.data_path / "conscious_export.json"
         self.python_insights_file = self.data_path / "python_insights.json"
         self.storage_path = self.data_path / "storage"
         
-        # Ensure directories exist
-        self.data_path.mkdir(exist_ok=True)
-        self.session_logs_path.mkdir(exist_ok=True)
         self.storage_path.mkdir(exist_ok=True)
+        self.cartdata_reader = CartdataReader()
+        self.last_export_key = None # Content hash of the export last read successfully
+        # Cart run of each source's snapshots; cartdata is stamped with the file mtime, not the cart's time()
+        self.export_runs = RunTagger()
+        self.cartdata_runs = RunTagger()
         
-        print(f"Data bridge initialized at: {self.data_path}")
+        logger.info("Data bridge initialized at: %s", self.data_path)
     
     def get_state(self, key):
         return self.state_manager.get_state(key)
@@ -45,21 +66,48 @@ class DataBridge:
 
     def process_agent_command(self, command):
         return self.agent_core.process_command(command)
+
+    def submit_agent_commands(self, commands, on_output=None):
+        """Start agent commands concurrently; returns futures so the caller is not blocked"""
+        return [self.agent_executor.submit(command, on_output=on_output) for command in commands]
+
+    def process_agent_commands(self, commands, on_output=None):
+        """Run agent commands concurrently and return their responses in order"""
+        return [result["response"] for result in self.agent_executor.run_batch(commands, on_output=on_output)]
     
     def read_consciousness_data(self):
-        """Read consciousness data exported from PICO-8"""
+        """Read consciousness data exported from PICO-8 (its content hash is kept in last_export_key)"""
+        self.last_export_key = None
         try:
             if self.conscious_export_file.exists():
-                with open(self.conscious_export_file, 'r') as f:
-                    data = json.load(f)
-                    print(f"Read consciousness data with {len(data.get('pixels', []))} pixels")
-                    return data
+                with span("read"):
+                    with open(self.conscious_export_file, 'rb') as f:
+                        raw = f.read()
+                with span("parse"):
+                    data = json.loads(raw)
+                self.last_export_key = content_key(raw)
+                data = self.export_runs.tag(data)
+                inc("exports_read")
+                logger.debug("Read consciousness data with %d pixels", len(data.get('pixels', [])))
+                return data
             else:
-                print("No consciousness data file found")
+                logger.info("No consciousness data file found")
                 return None
         except Exception as e:
-            print(f"Error reading consciousness data: {e}")
+            # Typically a half-written export; the next one replaces it
+            inc("exports_dropped", reason="unreadable")
+            logger.warning("Error reading consciousness data: %s", e)
+            return None
+    
+    def read_cartdata_state(self, only_new=False):
+        """Full per-pixel state from the cart's save slots (no JSON export involved).
+
+        With only_new, returns None unless the cartdata file changed since the last read.
+        """
+        population = self.cartdata_reader.poll() if only_new else self.cartdata_reader.read()
+        if not population:
             return None
+        return self.cartdata_runs.tag(population_to_export(population, population["timestamp"]))
     
     def write_insights(self, insights):
         """Write Python insights back for PICO-8 to read"""
@@ -67,28 +115,37 @@ class DataBridge:
             insights['timestamp'] = time.time()
             insights['generated_at'] = datetime.now().isoformat()
             
-            with open(self.python_insights_file, 'w') as f:
-                json.dump(insights, f, indent=2)
+            with span("write"):
+                with open(self.python_insights_file, 'w') as f:
+                    json.dump(insights, f, indent=2)
             
-            print(f"Wrote insights: {list(insights.keys())}")
+            logger.debug("Wrote insights: %s", list(insights.keys()))
             return True
         except Exception as e:
-            print(f"Error writing insights: {e}")
+            logger.error("Error writing insights: %s", e)
             return False
     
     def log_session_data(self, data):
-        """Log session data for historical analysis"""
+        """Log session data for historical analysis.
+
+        Cartdata snapshots are not logged: they lack the ages and memories the
+        session logs train on, and their ids are not the live export ids.
+        """
+        if data.get('source') == 'cartdata':
+            logger.debug("Not logging cartdata snapshot")
+            return False
         try:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             log_file = self.session_logs_path / f"session_{timestamp}.json"
             
-            with open(log_file, 'w') as f:
-                json.dump(data, f, indent=2)
+            with span("log"):
+                with open(log_file, 'w') as f:
+                    json.dump(data, f, indent=2)
             
-            print(f"Logged session data to: {log_file.name}")
+            logger.debug("Logged session data to: %s", log_file.name)
             return True
         except Exception as e:
-            print(f"Error logging session data: {e}")
+            logger.error("Error logging session data: %s", e)
             return False
 
     def store_data(self, key, value):
@@ -96,10 +153,10 @@ class DataBridge:
             filename = self.storage_path / f"{key.replace(':', '-')}.json"
             with open(filename, 'w') as f:
                 json.dump(value, f, indent=2)
-            print(f"Stored data for key {key} in {filename}")
+            logger.debug("Stored data for key %s in %s", key, filename)
             return True
         except Exception as e:
-            print(f"Error storing data: {e}")
+            logger.error("Error storing data: %s", e)
             return False
     
     def create_sample_export(self):
@@ -150,7 +207,7 @@ class DataBridge:
         with open(self.conscious_export_file, 'w') as f:
             json.dump(sample_data, f, indent=2)
         
-        print("Created sample consciousness export for testing")
+        logger.info("Created sample consciousness export for testing")
         return sample_data
 
 if __name__ == "__main__":
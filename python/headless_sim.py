@@ -0,0 +1,457 @@
+"""
+Sentium Pico Headless Simulator v2.0.0
+NumPy port of the cart's life rules over struct-of-arrays worlds, for bulk training data
+"""
+
+import json
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+import numpy as np
+
+# Constants from sentium-pico.p8
+MAX_PIXELS = 8
+DIV_ENERGY = 25
+DIV_COOLDOWN = 30
+MUTATION_RATE = 0.05
+METABOLIC_RATE = 0.2
+GEN_INTERVAL = 600
+MEMORY_SIZE = 10
+FPS = 30 # The cart's time() advances 1/30 s per _update
+EXPORT_INTERVAL = 180 # Ticks between the cart's exports
+MOUSE_X = MOUSE_Y = 64 # Headless: the cursor rests where _init puts it and never moves
+
+MAX_CUBES = 16 # Cube slots per world (the rules keep fewer than ~8 alive without mouse clicks)
+EVENTS = ("", "nutrient_consumed", "division", "generation_advance")
+EVENT_CODES = {name: code for code, name in enumerate(EVENTS)}
+WORLD_ID_STRIDE = 100000 # Snapshot ids are world * stride + cart id, so ids never collide across worlds
+
+
+class WorldBatch:
+    """Many independent worlds advanced in lockstep.
+
+    Every per-pixel attribute is a (worlds, MAX_PIXELS) array and every cube attribute a
+    (worlds, MAX_CUBES) array. The cart never removes pixels (kill_pixel is unused), so
+    the live pixels of a world are always slots 0..count-1, in the cart's list order.
+    Ticks follow _update: generation system, update_consciousness (which ends with
+    update_biological_processes), then update_biological_processes a second time.
+
+    Not ported: cursor interaction, metacognition, global workspace and predictive
+    processing. Without a mouse they only feed attention_level, which stays 0 here.
+    """
+
+    def __init__(self, n_worlds, rng):
+        self.n = n_worlds
+        self.rng = rng
+        self.tick = 0
+        self.cur_gen = np.ones(n_worlds, dtype=np.int32)
+        self.gen_timer = np.zeros(n_worlds, dtype=np.int32)
+        self.pixel_counter = np.zeros(n_worlds, dtype=np.int32)
+
+        shape = (n_worlds, MAX_PIXELS)
+        self.count = np.zeros(n_worlds, dtype=np.int32)
+        self.x, self.y = np.zeros(shape), np.zeros(shape)
+        self.last_x, self.last_y = np.zeros(shape), np.zeros(shape)
+        self.target_x, self.target_y = np.zeros(shape), np.zeros(shape)
+        self.energy, self.size, self.age = np.zeros(shape), np.zeros(shape), np.zeros(shape, dtype=np.int32)
+        self.curiosity, self.timidity, self.energy_cons = np.zeros(shape), np.zeros(shape), np.zeros(shape)
+        self.happiness, self.excitement, self.distress = np.zeros(shape), np.zeros(shape), np.zeros(shape)
+        self.color = np.zeros(shape, dtype=np.int8)
+        self.consc_level = np.zeros(shape)
+        self.generation = np.zeros(shape, dtype=np.int32)
+        self.division_timer, self.div_progress = np.zeros(shape), np.zeros(shape)
+        self.metab_eff, self.repro_drive = np.zeros(shape), np.zeros(shape)
+        self.stuck_timer = np.zeros(shape, dtype=np.int32)
+        self.pixel_id, self.number = np.zeros(shape, dtype=np.int64), np.zeros(shape, dtype=np.int32)
+        self.parent_id = np.full(shape, -1, dtype=np.int64)
+        self.memory_event = np.zeros(shape + (MEMORY_SIZE,), dtype=np.int8)
+        self.memory_impact = np.zeros(shape + (MEMORY_SIZE,))
+        self.memory_count = np.zeros(shape, dtype=np.int32)
+
+        # The cart's global sig_event / event_type / emotion_impact, one per world
+        self.sig_event = np.zeros(n_worlds, dtype=bool)
+        self.event_code = np.zeros(n_worlds, dtype=np.int8)
+        self.event_impact = np.zeros(n_worlds)
+
+        self.cube_x, self.cube_y = np.zeros((n_worlds, MAX_CUBES)), np.zeros((n_worlds, MAX_CUBES))
+        self.cube_value = np.zeros((n_worlds, MAX_CUBES))
+        self.cube_active = np.zeros((n_worlds, MAX_CUBES), dtype=bool)
+
+        # _init: create_initial_energy_cubes, then init_consciousness
+        self._add_cubes(np.full(n_worlds, 3))
+        worlds = np.arange(n_worlds)
+        self._create_pixels(worlds, np.full(n_worlds, 64.0), np.full(n_worlds, 64.0),
+                            0.5 + self._rnd(n_worlds, 0.3), 0.4 + self._rnd(n_worlds, 0.3), 0.5 + self._rnd(n_worlds, 0.3))
+
+    def _rnd(self, shape, limit=1.0):
+        return self.rng.random(shape) * limit
+
+    def _create_pixels(self, worlds, x, y, curiosity, timidity, energy_cons):
+        """create_pixel() appended to each listed world (at most one per world per call); returns the slots"""
+        slots = self.count[worlds]
+        n = len(worlds)
+        x, y = np.clip(x, 4, 124), np.clip(y, 4, 124)
+        # Pixels are never removed, so the next counter value is never in use
+        self.pixel_counter[worlds] += 1
+        index = (worlds, slots)
+        self.x[index], self.y[index] = x, y
+        self.last_x[index], self.last_y[index] = x, y
+        self.target_x[index] = np.clip(x + self._rnd(n, 20) - 10, 8, 120)
+        self.target_y[index] = np.clip(y + self._rnd(n, 20) - 10, 8, 120)
+        self.curiosity[index] = np.clip(curiosity, 0, 1)
+        self.timidity[index] = np.clip(timidity, 0, 1)
+        self.energy_cons[index] = np.clip(energy_cons, 0, 1)
+        self.energy[index] = 80 + self._rnd(n, 20)
+        self.size[index] = 1 + self._rnd(n, 0.5)
+        self.metab_eff[index] = 0.8 + self._rnd(n, 0.4)
+        self.repro_drive[index] = 0.7 + self._rnd(n, 0.3)
+        self.age[index] = 0
+        self.generation[index] = self.cur_gen[worlds]
+        self.division_timer[index] = 0
+        self.div_progress[index] = 0
+        self.stuck_timer[index] = 0
+        self.happiness[index], self.excitement[index], self.distress[index] = 0.5, 0.5, 0
+        self.color[index] = 8
+        self.consc_level[index] = 0
+        self.memory_count[index] = 0
+        self.number[index] = self.pixel_counter[worlds]
+        self.pixel_id[index] = self.pixel_counter[worlds] * 1000 + np.floor(self._rnd(n, 1000)).astype(np.int64)
+        self.parent_id[index] = -1
+        self.count[worlds] += 1
+        return slots
+
+    def _add_cubes(self, n_new):
+        """add_energy_cube() n_new[w] times in each world (away from the centre, value 20..34)"""
+        if not n_new.any():
+            return
+        free = ~self.cube_active
+        rank = np.cumsum(free, axis=1) - 1
+        new = free & (rank < n_new[:, None])
+        total = int(new.sum())
+        if total == 0:
+            return
+        x = 10 + self._rnd(total, 108)
+        y = 10 + self._rnd(total, 108)
+        near_centre = np.hypot(x - 64, y - 64) < 20
+        while near_centre.any():
+            k = int(near_centre.sum())
+            x[near_centre] = 10 + self._rnd(k, 108)
+            y[near_centre] = 10 + self._rnd(k, 108)
+            near_centre = np.hypot(x - 64, y - 64) < 20
+        self.cube_x[new], self.cube_y[new] = x, y
+        self.cube_value[new] = 20 + np.floor(self._rnd(total, 15))
+        self.cube_active[new] = True
+
+    def _signal(self, worlds, event, impact):
+        self.sig_event[worlds] = True
+        self.event_code[worlds] = EVENT_CODES[event]
+        self.event_impact[worlds] = impact
+
+    def _update_generation_system(self):
+        self.gen_timer += 1
+        advance = self.gen_timer >= GEN_INTERVAL
+        if advance.any():
+            self.cur_gen[advance] += 1
+            self.gen_timer[advance] = 0
+            self._signal(advance, "generation_advance", 0.5)
+            live = advance[:, None] & (np.arange(MAX_PIXELS) < self.count[:, None])
+            self.excitement[live] = np.minimum(1, self.excitement[live] + 0.2)
+            self.repro_drive[live] = np.minimum(1, self.repro_drive[live] + 0.2)
+            self.div_progress[live] = np.minimum(100, self.div_progress[live] + 20)
+
+    def _update_movement(self, w, s):
+        n = len(w)
+        px, py, energy = self.x[w, s], self.y[w, s], self.energy[w, s]
+        move_speed = np.full(n, 0.5)
+        tx, ty = self.target_x[w, s].copy(), self.target_y[w, s].copy()
+
+        # The cart looks up the nearest cube below 40 energy, but only steers to it below 30
+        stuck = self.stuck_timer[w, s] > 60
+        seek = ~stuck & (energy < 30)
+        if seek.any():
+            hungry = w[seek]
+            cube_dist = (self.cube_x[hungry] - px[seek, None]) ** 2 + (self.cube_y[hungry] - py[seek, None]) ** 2
+            cube_dist[~self.cube_active[hungry]] = np.inf
+            nearest = np.argmin(cube_dist, axis=1)
+            has_cube = np.isfinite(cube_dist[np.arange(len(hungry)), nearest])
+            tx[seek] = np.where(has_cube, self.cube_x[hungry, nearest], tx[seek])
+            ty[seek] = np.where(has_cube, self.cube_y[hungry, nearest], ty[seek])
+            seek[seek] = has_cube
+        wander = ~stuck & ~seek
+        tx[stuck], ty[stuck], move_speed[stuck] = MOUSE_X, MOUSE_Y, 0.7
+        move_speed[seek & (energy < 15)] = 0.8
+
+        retarget = wander & (self._rnd(n) < 0.02)
+        tx[retarget] = 20 + self._rnd(int(retarget.sum()), 88)
+        ty[retarget] = 20 + self._rnd(int(retarget.sum()), 88)
+        tx = np.where(wander & (px < 20), np.maximum(tx, 40 + self._rnd(n, 40)), tx)
+        tx = np.where(wander & (px >= 20) & (px > 108), np.minimum(tx, 48 + self._rnd(n, 40)), tx)
+        ty = np.where(wander & (py < 20), np.maximum(ty, 40 + self._rnd(n, 40)), ty)
+        ty = np.where(wander & (py >= 20) & (py > 108), np.minimum(ty, 48 + self._rnd(n, 40)), ty)
+
+        dx, dy = tx - px, ty - py
+        distance = np.hypot(dx, dy)
+        moving = distance > 2
+        safe = np.where(moving, distance, 1)
+        speed = move_speed * (1 - self.timidity[w, s] * 0.5)
+        speed = np.where((energy > 70) & (self.energy_cons[w, s] > 0.7), speed * 0.7, speed)
+        nx = np.where(moving, np.clip(px + dx / safe * speed, 4, 124), px)
+        ny = np.where(moving, np.clip(py + dy / safe * speed, 4, 124), py)
+
+        # Stuck detection (only while moving towards a target)
+        stuck_timer = self.stuck_timer[w, s]
+        still = moving & (np.abs(nx - self.last_x[w, s]) + np.abs(ny - self.last_y[w, s]) < 0.1)
+        stuck_timer = np.where(moving & ~still, 0, stuck_timer + still)
+        very_stuck = still & (stuck_timer > 60)
+        tx[very_stuck], ty[very_stuck] = MOUSE_X, MOUSE_Y
+        self.curiosity[w[very_stuck], s] = np.minimum(1, self.curiosity[w[very_stuck], s] + 0.01)
+        reset = very_stuck & (stuck_timer > 180)
+        stuck_timer[reset] = 0
+        tx[reset] = 32 + self._rnd(int(reset.sum()), 64)
+        ty[reset] = 32 + self._rnd(int(reset.sum()), 64)
+
+        self.x[w, s], self.y[w, s] = nx, ny
+        self.target_x[w, s], self.target_y[w, s] = tx, ty
+        self.stuck_timer[w, s] = stuck_timer
+        self.last_x[w, s] = np.where(moving, nx, self.last_x[w, s])
+        self.last_y[w, s] = np.where(moving, ny, self.last_y[w, s])
+
+    def _update_emotions(self, w, s):
+        excitement = self.excitement[w, s] * 0.985
+        if self.tick > 120: # cursor stillness_timer > 120: the idle cursor has been still since _init
+            excitement *= 0.97
+        happiness = self.happiness[w, s] * 0.99
+        energy = self.energy[w, s]
+        distress = np.where(energy < 30, (30 - energy) / 30, self.distress[w, s] * 0.95)
+        self.color[w, s] = np.select([distress > 0.7, excitement > 0.7, happiness > 0.7], [8, 14, 11], 7)
+        self.excitement[w, s], self.happiness[w, s], self.distress[w, s] = excitement, happiness, distress
+
+    def _calculate_phi(self, w, s):
+        m = np.minimum(self.memory_count[w, s] / MEMORY_SIZE, 1) * 0.35
+        e = (self.happiness[w, s] + self.excitement[w, s]) * 0.15
+        offset = np.abs(self.x[w, s] - self.target_x[w, s]) + np.abs(self.y[w, s] - self.target_y[w, s])
+        b = 1 - np.minimum(offset, 50) / 50 * 0.2
+        return np.minimum((m + e + b) / 4, 1) # attention_level term is 0 headless
+
+    def _check_energy_sources(self, w, s):
+        # All cubes within reach are eaten in one call; the pixel does not move in between
+        px, py, size = self.x[w, s], self.y[w, s], self.size[w, s]
+        radius = 4 + size
+        reach = self.cube_active[w] & ((self.cube_x[w] - px[:, None]) ** 2 + (self.cube_y[w] - py[:, None]) ** 2 < (radius * radius)[:, None])
+        eaten = reach.sum(axis=1)
+        fed = eaten > 0
+        if fed.any():
+            gained = (self.cube_value[w] * reach).sum(axis=1) * self.metab_eff[w, s]
+            self.energy[w, s] = np.minimum(100, self.energy[w, s] + gained)
+            self.happiness[w, s] += 0.2 * eaten
+            self.excitement[w, s] += 0.1 * eaten
+            self.size[w, s] = np.minimum(2.5, size + 0.08 * eaten)
+            self.div_progress[w, s] = np.minimum(100, self.div_progress[w, s] + 10 * eaten)
+            fed_worlds = w[fed]
+            self._signal(fed_worlds, "nutrient_consumed", 0.3 + self._rnd(len(fed_worlds), 0.2))
+            active = self.cube_active[w]
+            active[reach] = False
+            self.cube_active[w] = active
+
+        n_new = np.zeros(self.n, dtype=np.int32)
+        n_new[w] = eaten # Each eaten cube is replaced
+        remaining = self.cube_active[w].sum(axis=1) + eaten
+        n_new[w] += np.where(remaining == 1, 3, np.where((remaining < 5) & (self._rnd(len(w)) < 0.02), 1, 0))
+        self._add_cubes(n_new)
+
+    def _form_memories(self, w, s):
+        w = w[self.sig_event[w]]
+        if not len(w):
+            return
+        full = self.memory_count[w, s] >= MEMORY_SIZE
+        fw = w[full]
+        self.memory_event[fw, s] = np.roll(self.memory_event[fw, s], -1, axis=1)
+        self.memory_impact[fw, s] = np.roll(self.memory_impact[fw, s], -1, axis=1)
+        slot = np.minimum(self.memory_count[w, s], MEMORY_SIZE - 1)
+        self.memory_event[w, s, slot] = self.event_code[w]
+        self.memory_impact[w, s, slot] = self.event_impact[w]
+        self.memory_count[w, s] = np.minimum(self.memory_count[w, s] + 1, MEMORY_SIZE)
+        self.sig_event[w] = False
+
+    def _update_consciousness(self):
+        for s in range(MAX_PIXELS):
+            w = np.flatnonzero(self.count > s)
+            if not len(w):
+                break
+            energy = self.energy[w, s].copy()
+            self._update_movement(w, s)
+            self._update_emotions(w, s)
+            self.consc_level[w, s] = self._calculate_phi(w, s)
+            self.energy[w, s] = np.maximum(0, energy - 0.02)
+            self._check_energy_sources(w, s)
+            self._form_memories(w, s)
+        self._update_biological_processes()
+
+    def _divide(self, w, s):
+        """divide_pixel() for slot s of each listed world"""
+        n = len(w)
+        mutate = lambda trait: trait[w, s] + (self._rnd(n, 2) - 1) * MUTATION_RATE
+        curiosity, timidity, energy_cons = mutate(self.curiosity), mutate(self.timidity), mutate(self.energy_cons)
+
+        # PICO-8 angles are in turns and its sin() is inverted
+        angle = self._rnd(n) * 6.2831853
+        separation = self.size[w, s] * 2 + 1
+        offset_x = np.cos(angle * 2 * np.pi) * separation
+        offset_y = -np.sin(angle * 2 * np.pi) * separation
+        child_x = np.clip(self.x[w, s] + offset_x, 8, 120)
+        child_y = np.clip(self.y[w, s] + offset_y, 8, 120)
+        self.x[w, s] = np.clip(self.x[w, s] - offset_x * 0.5, 8, 120)
+        self.y[w, s] = np.clip(self.y[w, s] - offset_y * 0.5, 8, 120)
+
+        c = self._create_pixels(w, child_x, child_y, curiosity, timidity, energy_cons)
+        self.generation[w, c] = self.generation[w, s]
+        self.parent_id[w, c] = self.pixel_id[w, s]
+        half = np.floor(self.energy[w, s] * 0.5)
+        self.energy[w, c] = half
+        self.energy[w, s] = half
+        self.size[w, c] = self.size[w, s] * (0.9 + self._rnd(n, 0.2))
+        self.metab_eff[w, c] = self.metab_eff[w, s] * (0.95 + self._rnd(n, 0.1))
+        self.repro_drive[w, c] = self.repro_drive[w, s] * (0.95 + self._rnd(n, 0.1))
+        self.division_timer[w, s] = DIV_COOLDOWN
+        self.div_progress[w, s] = 0
+        self.div_progress[w, c] = 0
+        self.size[w, s] *= 0.9
+        self._signal(w, "division", 0.4)
+        self.excitement[w, s] = np.minimum(1, self.excitement[w, s] + 0.3)
+        self.excitement[w, c] = np.minimum(1, self.excitement[w, c] + 0.2)
+
+    def _update_biological_processes(self):
+        # Descending like the cart, so a newborn (appended at the end) waits for the next pass
+        for s in range(MAX_PIXELS - 1, -1, -1):
+            w = np.flatnonzero(self.count > s)
+            if not len(w):
+                continue
+            self.age[w, s] += 1
+            self.division_timer[w, s] = np.maximum(0, self.division_timer[w, s] - 1)
+            energy = np.maximum(0, self.energy[w, s] - METABOLIC_RATE * self.metab_eff[w, s])
+            self.energy[w, s] = energy
+            growing = energy > DIV_ENERGY * 0.6
+            self.div_progress[w, s] = np.where(growing, np.minimum(100, self.div_progress[w, s] + self.repro_drive[w, s] * 1.5),
+                                               np.maximum(0, self.div_progress[w, s] - 0.2))
+            self.size[w, s] = np.where(growing, np.minimum(2.5, self.size[w, s] + 0.02), np.maximum(0.5, self.size[w, s] - 0.005))
+
+            can_divide = ((energy >= DIV_ENERGY) & (self.division_timer[w, s] <= 0) & (self.count[w] < MAX_PIXELS) &
+                          (self.age[w, s] > 20) & (self.div_progress[w, s] >= 50))
+            if can_divide.any():
+                self._divide(w[can_divide], s)
+
+    def step(self):
+        """One _update() of every world"""
+        self.tick += 1
+        self._update_generation_system()
+        self._update_consciousness()
+        self._update_biological_processes()
+
+    def snapshots(self, world_offset=0):
+        """Session-log-shaped dict per world (as DataBridge.log_session_data writes them)"""
+        seconds = self.tick / FPS
+        result = []
+        for w in range(self.n):
+            base = (world_offset + w) * WORLD_ID_STRIDE
+            pixels = []
+            for s in range(self.count[w]):
+                events = self.memory_event[w, s, :self.memory_count[w, s]]
+                impacts = self.memory_impact[w, s, :self.memory_count[w, s]]
+                parent = int(self.parent_id[w, s])
+                pixels.append({
+                    "id": base + int(self.pixel_id[w, s]),
+                    "parent_id": base + parent if parent >= 0 else None,
+                    "number": int(self.number[w, s]),
+                    "x": round(float(self.x[w, s]), 3),
+                    "y": round(float(self.y[w, s]), 3),
+                    "curiosity": round(float(self.curiosity[w, s]), 4),
+                    "timidity": round(float(self.timidity[w, s]), 4),
+                    "energy_cons": round(float(self.energy_cons[w, s]), 4),
+                    "energy": round(float(self.energy[w, s]), 3),
+                    "age": int(self.age[w, s]),
+                    "color": int(self.color[w, s]),
+                    "generation": int(self.generation[w, s]),
+                    "consc_level": round(float(self.consc_level[w, s]), 4),
+                    "memory": [{"event": EVENTS[e], "impact": round(float(i), 3)} for e, i in zip(events, impacts)]
+                })
+            result.append({
+                "timestamp": seconds,
+                "generation": int(self.cur_gen[w]),
+                "pixel_count": int(self.count[w]),
+                "pixels": pixels,
+                "energy_cubes": int(self.cube_active[w].sum()),
+                "session_duration": seconds,
+                "world": world_offset + w,
+                "source": "headless_sim"
+            })
+        return result
+
+
+def simulate(n_worlds, ticks, snapshot_every=EXPORT_INTERVAL, seed=None, world_offset=0):
+    """Run n_worlds worlds for `ticks` updates; returns snapshots taken every snapshot_every ticks"""
+    batch = WorldBatch(n_worlds, np.random.default_rng(seed))
+    snapshots = []
+    for _ in range(ticks):
+        batch.step()
+        if batch.tick % snapshot_every == 0:
+            snapshots.extend(batch.snapshots(world_offset))
+    return snapshots
+
+
+def _simulate_batch(args):
+    return simulate(*args)
+
+
+def generate_corpus(n_worlds, ticks, processes=1, worlds_per_batch=256, snapshot_every=EXPORT_INTERVAL, seed=None):
+    """Simulate n_worlds worlds split into batches across worker processes; returns all snapshots"""
+    seeds = np.random.SeedSequence(seed).spawn((n_worlds + worlds_per_batch - 1) // worlds_per_batch)
+    jobs = [(min(worlds_per_batch, n_worlds - i * worlds_per_batch), ticks, snapshot_every, seeds[i], i * worlds_per_batch)
+            for i in range(len(seeds))]
+    if processes > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            results = list(pool.map(_simulate_batch, jobs))
+    else:
+        results = [_simulate_batch(job) for job in jobs]
+    return [snapshot for batch in results for snapshot in batch]
+
+
+def write_session_logs(snapshots, output_dir):
+    """Write snapshots as session_*.json files the predictor's training loader picks up.
+
+    Names start with the same wall-clock stamp as the bridge's session_<stamp>.json logs, so
+    both sort together by time and the predictor's fine-tune watermark covers them alike.
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    for snapshot in snapshots:
+        name = f"session_{stamp}_sim_w{snapshot['world']:06d}_t{int(snapshot['timestamp'] * FPS):08d}.json"
+        with open(output_dir / name, 'w') as f:
+            json.dump(snapshot, f)
+    return len(snapshots)
+
+
+if __name__ == "__main__":
+    # python headless_sim.py WORLDS TICKS [--processes N] [--every TICKS] [--seed N] [--out DIR]
+    args = sys.argv[1:]
+    options = {"--processes": 1, "--every": EXPORT_INTERVAL, "--seed": None, "--out": None}
+    positional = []
+    while args:
+        arg = args.pop(0)
+        if arg in options:
+            options[arg] = args.pop(0)
+        else:
+            positional.append(arg)
+    if len(positional) != 2:
+        print("Usage: python headless_sim.py WORLDS TICKS [--processes N] [--every TICKS] [--seed N] [--out DIR]")
+        sys.exit(1)
+
+    snapshots = generate_corpus(int(positional[0]), int(positional[1]), processes=int(options["--processes"]),
+                                snapshot_every=int(options["--every"]),
+                                seed=int(options["--seed"]) if options["--seed"] is not None else None)
+    if options["--out"]:
+        print(f"Wrote {write_session_logs(snapshots, options['--out'])} session logs to {options['--out']}")
+    else:
+        pixels = sum(snapshot["pixel_count"] for snapshot in snapshots)
+        print(json.dumps({"snapshots": len(snapshots), "pixel_records": pixels}))
@@ -8,6 +8,7 @@ import numpy as np
 import pandas as pd
 import json
 import pickle
+import sys
 from datetime import datetime
 from pathlib import Path
 import warnings
@@ -16,19 +17,40 @@ warnings.filterwarnings('ignore')
 try:
     from transformers import AutoTokenizer, AutoModel, pipeline
     from datasets import load_dataset
+    from huggingface_hub import HfApi, snapshot_download
     import torch
     HUGGINGFACE_AVAILABLE = True
 except ImportError:
     HUGGINGFACE_AVAILABLE = False
     print("Hugging Face transformers not available. Install with: pip install transformers datasets torch")
 
+from config import get_config
 from data_bridge import DataBridge
+from population import Population
+
+# Local, pre-populated model cache (fill it with: python hf_conscious_predictor.py prefetch)
+MODEL_CACHE_DIR = get_config().hf_cache_dir
+
+# Files needed to run a pipeline offline; safetensors weights are preferred over .bin
+MODEL_FILE_PATTERNS = ["*.json", "*.txt", "*.model", "merges.txt", "vocab.*"]
+
+# Pipelines shared by every predictor in this process (warm start)
+_PIPELINE_CACHE = {}
+
+# Description phrases per trait, indexed by band: 0 = low, 1 = moderate, 2 = high
+DESCRIPTION_BANDS = [
+    ("cautious and reserved", "moderately curious", "highly curious and exploratory"),
+    ("bold and confident", "balanced in confidence", "very shy and fearful"),
+    ("low energy and tired", "moderate energy", "high energy and active"),
+    ("young and developing", "growing in experience", "experienced and mature"),
+    ("no significant memories", "developing memory", "rich memory and learning")
+]
 
 class HuggingFaceConsciousnessPredictor:
-    def __init__(self):
+    def __init__(self, load_models=True):
         self.bridge = DataBridge()
-        self.model_cache_dir = Path("hf_models")
-        self.model_cache_dir.mkdir(exist_ok=True)
+        self.model_cache_dir = MODEL_CACHE_DIR
+        self.model_cache_dir.mkdir(parents=True, exist_ok=True)
         
         # Pre-trained models for consciousness analysis
         self.consciousness_models = {
@@ -38,65 +60,129 @@ class HuggingFaceConsciousnessPredictor:
             "cognitive": "facebook/bart-large-mnli"     # For cognitive state analysis
         }
         
+        # Pipeline task and extra arguments for each model used at runtime
+        self.pipeline_tasks = {
+            "sentiment": ("sentiment-analysis", {"return_all_scores": True}),
+            "emotion": ("text-classification", {"return_all_scores": True}),
+            "cognitive": ("zero-shot-classification", {})
+        }
+        
         self.pipelines = {}
         self.consciousness_features = {}
         
-        if HUGGINGFACE_AVAILABLE:
+        if HUGGINGFACE_AVAILABLE and load_models:
             self._initialize_models()
         
     def _initialize_models(self):
-        """Initialize Hugging Face models for consciousness analysis"""
+        """Initialize Hugging Face models from the local cache (no network access)"""
         print("Initializing Hugging Face consciousness models...")
         
         try:
-            # Sentiment analysis for emotional consciousness
-            self.pipelines['sentiment'] = pipeline(
-                "sentiment-analysis", 
-                model=self.consciousness_models['sentiment'],
-                return_all_scores=True
-            )
-            
-            # Emotion detection for emotional consciousness
-            self.pipelines['emotion'] = pipeline(
-                "text-classification",
-                model=self.consciousness_models['emotion'],
-                return_all_scores=True
-            )
-            
-            # Cognitive state analysis
-            self.pipelines['cognitive'] = pipeline(
-                "zero-shot-classification",
-                model=self.consciousness_models['cognitive']
-            )
+            for name in self.pipeline_tasks:
+                self.pipelines[name] = self._load_pipeline(name)
             
             print("Hugging Face models initialized successfully")
             
         except Exception as e:
+            self.pipelines = {}
             print(f"Error initializing models: {e}")
+            print("Run 'python hf_conscious_predictor.py prefetch' to populate the model cache")
             print("Falling back to rule-based analysis")
     
+    def _local_model_path(self, name):
+        """Resolve a model to its snapshot directory in the local cache without touching the hub"""
+        return Path(snapshot_download(
+            self.consciousness_models[name],
+            cache_dir=str(self.model_cache_dir),
+            local_files_only=True
+        ))
+    
+    def _load_pipeline(self, name):
+        """Build (or reuse) a pipeline for one model, loading weights straight from disk"""
+        model_path = self._local_model_path(name)
+        if model_path in _PIPELINE_CACHE:
+            return _PIPELINE_CACHE[model_path]
+        
+        task, extra_args = self.pipeline_tasks[name]
+        # safetensors weights are memory-mapped by transformers instead of unpickled
+        has_safetensors = any(model_path.glob("*.safetensors"))
+        
+        loaded = pipeline(
+            task,
+            model=str(model_path),
+            tokenizer=str(model_path),
+            model_kwargs={"use_safetensors": has_safetensors, "local_files_only": True},
+            **extra_args
+        )
+        _PIPELINE_CACHE[model_path] = loaded
+        return loaded
+    
+    def prefetch_models(self):
+        """Download the runtime models into the local cache (the only step that needs network)"""
+        api = HfApi()
+        for name in self.pipeline_tasks:
+            repo_id = self.consciousness_models[name]
+            repo_files = api.list_repo_files(repo_id)
+            
+            # Prefer safetensors weights; fall back to PyTorch .bin only when a repo has none
+            if any(f.endswith(".safetensors") for f in repo_files):
+                weight_patterns = ["*.safetensors"]
+            else:
+                weight_patterns = ["*.bin"]
+            
+            print(f"Prefetching {repo_id} ({weight_patterns[0]})...")
+            snapshot_download(
+                repo_id,
+                cache_dir=str(self.model_cache_dir),
+                allow_patterns=MODEL_FILE_PATTERNS + weight_patterns
+            )
+        
+        print(f"Model cache ready at: {self.model_cache_dir}")
+        return self.verify_model_cache()
+    
+    def verify_model_cache(self):
+        """Check that every runtime model can be resolved offline with config and weights present"""
+        all_ok = True
+        for name in self.pipeline_tasks:
+            repo_id = self.consciousness_models[name]
+            try:
+                model_path = self._local_model_path(name)
+                has_config = (model_path / "config.json").exists()
+                weights = list(model_path.glob("*.safetensors")) or list(model_path.glob("*.bin"))
+                
+                if has_config and weights:
+                    print(f"  OK: {repo_id} ({weights[0].name})")
+                else:
+                    print(f"  Incomplete: {repo_id} (config: {has_config}, weights: {len(weights)})")
+                    all_ok = False
+            except Exception as e:
+                print(f"  Missing: {repo_id} ({e})")
+                all_ok = False
+        
+        return all_ok
+    
     def _pixel_to_text_description(self, pixel):
-        """Convert pixel data to text description for NLP analysis"""
+        """Convert a Pixel record to text description for NLP analysis"""
         descriptions = []
         
         # Personality description
-        if pixel.get('curiosity', 0.5) > 0.7:
+        if pixel.curiosity > 0.7:
             descriptions.append("highly curious and exploratory")
-        elif pixel.get('curiosity', 0.5) < 0.3:
+        elif pixel.curiosity < 0.3:
             descriptions.append("cautious and reserved")
         else:
             descriptions.append("moderately curious")
             
-        if pixel.get('timidity', 0.5) > 0.7:
+        if pixel.timidity > 0.7:
             descriptions.append("very shy and fearful")
-        elif pixel.get('timidity', 0.5) < 0.3:
+        elif pixel.timidity < 0.3:
             descriptions.append("bold and confident")
         else:
             descriptions.append("balanced in confidence")
         
         # Energy and age description
-        energy = pixel.get('energy', 0)
-        age = pixel.get('age', 1)
+        energy = pixel.energy
+        age = pixel.age
         
         if energy > 20:
             descriptions.append("high energy and active")
@@ -113,7 +199,7 @@ class HuggingFaceConsciousnessPredictor:
             descriptions.append("growing in experience")
         
         # Memory description
-        memory_count = len(pixel.get('memory', []))
+        memory_count = pixel.memory_depth
         if memory_count > 5:
             descriptions.append("rich memory and learning")
         elif memory_count == 0:
@@ -125,12 +211,13 @@ class HuggingFaceConsciousnessPredictor:
     
     def analyze_consciousness_with_nlp(self, pixels):
         """Use NLP models to analyze consciousness from pixel descriptions"""
+        population = Population.coerce(pixels)
         if not HUGGINGFACE_AVAILABLE or not self.pipelines:
-            return self._fallback_consciousness_analysis(pixels)
+            return self._fallback_consciousness_analysis(population)
         
         consciousness_scores = []
         
-        for pixel in pixels:
+        for pixel in population:
             description = self._pixel_to_text_description(pixel)
             
             # Analyze with multiple models
@@ -144,7 +231,7 @@ class HuggingFaceConsciousnessPredictor:
             )
             
             consciousness_scores.append({
-                'pixel_id': pixel.get('id'),
+                'pixel_id': pixel.id,
                 'consciousness_score': consciousness_score,
                 'description': description,
                 'sentiment_analysis': sentiment_scores,
@@ -216,48 +303,129 @@ class HuggingFaceConsciousnessPredictor:
             base_score += cognitive_confidence * 2.5
         
         # Traditional metrics
-        energy = pixel.get('energy', 0) / 30.0
-        memory = len(pixel.get('memory', [])) * 0.2
-        personality_complexity = abs(pixel.get('curiosity', 0.5) - pixel.get('timidity', 0.5))
+        energy = pixel.energy / 30.0
+        memory = pixel.memory_depth * 0.2
+        personality_complexity = abs(pixel.curiosity - pixel.timidity)
         
         base_score += energy + memory + personality_complexity
         
         return float(base_score)
     
+    def _pixel_columns(self, pixels):
+        """Columnar view of the population (one array per field) for vectorized scoring"""
+        population = Population.coerce(pixels)
+        return {
+            'id': population.ids,
+            'curiosity': population.curiosity,
+            'timidity': population.timidity,
+            'energy': population.energy,
+            'age': population.age,
+            'memory_depth': population.memory_depth
+        }
+    
+    def _describe_population(self, columns):
+        """Vectorized _pixel_to_text_description: band every trait, then look up the phrase combination"""
+        def band(values, low, high):
+            return (values >= low).astype(np.int64) + (values > high)
+        
+        memory_depth = columns['memory_depth']
+        bands = [
+            band(columns['curiosity'], 0.3, 0.7),
+            band(columns['timidity'], 0.3, 0.7),
+            band(columns['energy'], 5, 20),
+            band(columns['age'], 3, 10),
+            (memory_depth > 0).astype(np.int64) + (memory_depth > 5)
+        ]
+        
+        # Encode the five bands as one base-3 code and build each distinct description only once
+        codes = np.zeros(len(memory_depth), dtype=np.int64)
+        for trait_band in bands:
+            codes = codes * 3 + trait_band
+        unique_codes, inverse = np.unique(codes, return_inverse=True)
+        
+        phrases = []
+        for code in unique_codes.tolist():
+            parts = []
+            for trait_phrases in reversed(DESCRIPTION_BANDS):
+                parts.append(trait_phrases[code % 3])
+                code //= 3
+            phrases.append(f"An organism that is {', '.join(reversed(parts))}")
+        
+        return [phrases[i] for i in inverse.reshape(-1).tolist()]
+    
+    def _fallback_scores(self, columns):
+        """Rule-based consciousness score for every pixel at once"""
+        memory_depth = columns['memory_depth']
+        personality_complexity = np.abs(columns['curiosity'] - columns['timidity'])
+        behavioral_autonomy = columns['energy'] / np.maximum(columns['age'], 1)
+        
+        return (
+            memory_depth * 0.4 +
+            personality_complexity * 0.3 +
+            behavioral_autonomy * 0.3
+        )
+    
     def _fallback_consciousness_analysis(self, pixels):
         """Fallback analysis when Hugging Face models aren't available"""
-        consciousness_scores = []
+        columns = self._pixel_columns(pixels)
+        scores = self._fallback_scores(columns)
+        descriptions = self._describe_population(columns)
         
-        for pixel in pixels:
-            # Simple rule-based consciousness scoring
-            memory_depth = len(pixel.get('memory', []))
-            personality_complexity = abs(pixel.get('curiosity', 0.5) - pixel.get('timidity', 0.5))
-            behavioral_autonomy = pixel.get('energy', 0) / max(pixel.get('age', 1), 1)
-            
-            consciousness_score = (
-                memory_depth * 0.4 +
-                personality_complexity * 0.3 +
-                behavioral_autonomy * 0.3
-            )
-            
-            consciousness_scores.append({
-                'pixel_id': pixel.get('id'),
-                'consciousness_score': consciousness_score,
-                'description': self._pixel_to_text_description(pixel),
+        return [
+            {
+                'pixel_id': pixel_id,
+                'consciousness_score': score,
+                'description': description,
                 'analysis_method': 'rule_based_fallback'
-            })
+            }
+            for pixel_id, score, description in zip(columns['id'], scores.tolist(), descriptions)
+        ]
+    
+    def _fallback_consciousness_evolution(self, pixels):
+        """Rule-based evolution projection computed over the whole population at once"""
+        columns = self._pixel_columns(pixels)
+        current_scores = self._fallback_scores(columns)
+        descriptions = self._describe_population(columns)
+        
+        # Without NLP signals there is nothing to push growth, so every pixel keeps its factor of 1.0
+        growth_factors = np.ones_like(current_scores)
+        predicted_scores = current_scores * growth_factors
+        growth_potential = growth_factors - 1.0
+        recommendation = self._generate_recommendation({})
+        
+        predictions = [
+            {
+                'pixel_id': pixel_id,
+                'current_consciousness': current,
+                'predicted_consciousness': predicted,
+                'growth_potential': growth,
+                'insights': description,
+                'recommendation': list(recommendation)
+            }
+            for pixel_id, current, predicted, growth, description in zip(
+                columns['id'], current_scores.tolist(), predicted_scores.tolist(),
+                growth_potential.tolist(), descriptions
+            )
+        ]
         
-        return consciousness_scores
+        return {
+            'predictions': predictions,
+            'overall_trend': self._trend_from_growth(growth_potential),
+            'analysis_method': 'rule_based'
+        }
     
     def predict_consciousness_evolution(self, current_data):
         """Predict how consciousness will evolve using NLP insights"""
-        pixels = current_data.get('pixels', [])
+        population = Population.from_export(current_data)
         
-        if not pixels:
+        if not len(population):
             return {"error": "No pixels to analyze"}
         
+        if not HUGGINGFACE_AVAILABLE or not self.pipelines:
+            return self._fallback_consciousness_evolution(population)
+        
         # Analyze current consciousness with NLP
-        consciousness_analysis = self.analyze_consciousness_with_nlp(pixels)
+        consciousness_analysis = self.analyze_consciousness_with_nlp(population)
         
         # Generate predictions based on NLP insights
         predictions = []
@@ -294,7 +462,7 @@ class HuggingFaceConsciousnessPredictor:
         return {
             'predictions': predictions,
             'overall_trend': self._calculate_overall_trend(predictions),
-            'analysis_method': 'huggingface_nlp' if HUGGINGFACE_AVAILABLE else 'rule_based'
+            'analysis_method': 'huggingface_nlp'
         }
     
     def _generate_recommendation(self, analysis):
@@ -327,8 +495,15 @@ class HuggingFaceConsciousnessPredictor:
         if not predictions:
             return "stable"
         
-        growth_rates = [p['growth_potential'] for p in predictions]
-        avg_growth = sum(growth_rates) / len(growth_rates)
+        growth_rates = np.fromiter((p['growth_potential'] for p in predictions), dtype=np.float64, count=len(predictions))
+        return self._trend_from_growth(growth_rates)
+    
+    def _trend_from_growth(self, growth_rates):
+        """Classify the population trend from an array of per-pixel growth potentials"""
+        if len(growth_rates) == 0:
+            return "stable"
+        
+        avg_growth = float(np.mean(growth_rates))
         
         if avg_growth > 0.2:
             return "rapidly_expanding"
@@ -364,6 +539,22 @@ if __name__ == "__main__":
     print("Hugging Face Consciousness Predictor")
     print("====================================")
     
+    command = sys.argv[1] if len(sys.argv) > 1 else "analyze"
+    if command in ("prefetch", "verify"):
+        if not HUGGINGFACE_AVAILABLE:
+            print(f"Cannot {command} the model cache: transformers, datasets, huggingface_hub or torch is missing. "
+                  "Install with: pip install transformers datasets huggingface_hub torch", file=sys.stderr)
+            sys.exit(1)
+        
+        # Cache maintenance only, so skip building the pipelines
+        cache_tool = HuggingFaceConsciousnessPredictor(load_models=False)
+        if command == "prefetch":
+            ok = cache_tool.prefetch_models()
+        else:
+            print(f"Verifying model cache at: {cache_tool.model_cache_dir}")
+            ok = cache_tool.verify_model_cache()
+        sys.exit(0 if ok else 1)
+    
     predictor = HuggingFaceConsciousnessPredictor()
     
     # Test with current data
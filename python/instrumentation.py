@@ -0,0 +1,151 @@
+"""
+Sentium Pico Instrumentation v2.0.0
+Levelled logging, stage timers, counters and latency histograms with Prometheus text export
+"""
+
+import bisect
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from config import get_config
+
+METRIC_PREFIX = "sentium_"
+# Upper bounds (seconds) of the stage latency histogram buckets
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_logging_configured = False
+
+def get_logger(name):
+    """Logger under the `sentium` namespace; the first call applies the configured level"""
+    global _logging_configured
+    if not _logging_configured:
+        root = logging.getLogger("sentium")
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(logging.Formatter("%(message)s")) # Same console output as the old prints
+        root.addHandler(handler)
+        root.setLevel(get_config().log_level.upper())
+        root.propagate = False
+        _logging_configured = True
+    return logging.getLogger(f"sentium.{name}")
+
+
+def _label_text(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{value}"' for key, value in labels) + "}"
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus layout"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1) # Last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """Process-wide counters and histograms, keyed by name and label set"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters = {}
+        self.histograms = {}
+
+    def inc(self, name, value=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name, value, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(value)
+
+    @contextmanager
+    def span(self, stage):
+        """Time a pipeline stage (read, parse, score, cluster, spatial, lineage, predict, write, log)"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe("stage_seconds", time.perf_counter() - started, stage=stage)
+
+    def render(self):
+        """Metrics in the Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            counters = sorted(self.counters.items())
+            histograms = sorted(self.histograms.items())
+
+        typed = set()
+        for (name, labels), value in counters:
+            metric = f"{METRIC_PREFIX}{name}_total"
+            if metric not in typed:
+                lines.append(f"# TYPE {metric} counter")
+                typed.add(metric)
+            lines.append(f"{metric}{_label_text(labels)} {value}")
+
+        for (name, labels), histogram in histograms:
+            metric = f"{METRIC_PREFIX}{name}"
+            if metric not in typed:
+                lines.append(f"# TYPE {metric} histogram")
+                typed.add(metric)
+            cumulative = 0
+            for bound, count in zip(list(histogram.buckets) + ["+Inf"], histogram.counts):
+                cumulative += count
+                lines.append(f"{metric}_bucket{_label_text(labels + (('le', bound),))} {cumulative}")
+            lines.append(f"{metric}_sum{_label_text(labels)} {histogram.sum:.6f}")
+            lines.append(f"{metric}_count{_label_text(labels)} {histogram.count}")
+
+        return "\n".join(lines) + "\n"
+
+    def write(self, path=None):
+        """Write the metrics file atomically (for node_exporter's textfile collector or tailing)"""
+        path = path or get_config().metrics_file
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            f.write(self.render())
+        os.replace(tmp_path, path)
+
+    def serve(self, port=None, host="127.0.0.1"):
+        """Serve /metrics over HTTP from a daemon thread; returns the server (None if disabled)"""
+        port = get_config().metrics_port if port is None else port
+        if not port:
+            return None
+        registry = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = registry.render().encode('utf-8')
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass # Scrapes are not worth a log line each
+
+        server = ThreadingHTTPServer((host, port), MetricsHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+
+METRICS = MetricsRegistry()
+span = METRICS.span
+inc = METRICS.inc
+
@@ -0,0 +1,417 @@
+"""
+Sentium Pico Lineage Index v2.0.0
+Parent-child graph of every pixel seen in exports and session logs, with ancestry, subtree and lineage survival queries
+"""
+
+import json
+import os
+import sys
+import numpy as np
+from config import get_config
+from instrumentation import get_logger
+from population import Population
+from session_archive import session_snapshots
+from spatial_analysis import ragged_arange
+
+logger = get_logger("lineage")
+
+NODE_COLUMNS = {
+    "ids": np.int64,
+    "run": np.int32, # Interned cart run code, see run_names; pixel ids are only unique within a run
+    "parent": np.int64, # Node position of the parent, -1 for a root
+    "generation": np.int32,
+    "first_seen": np.float64, # Cart timestamp of the first snapshot holding the pixel (NaN for placeholders)
+    "last_seen": np.float64,
+    "observations": np.int32, # Snapshots holding the pixel; 0 for a parent only known through its children
+    "curiosity": np.float32, # Latest observed personality and energy
+    "timidity": np.float32,
+    "energy": np.float32,
+    "inferred": np.bool_ # Parent guessed from the previous snapshot because the export had no parent_id
+}
+INITIAL_CAPACITY = 1024
+INFER_CHUNK = 1024 # New pixels matched against the previous snapshot per distance matrix
+MAX_JUMPS = 64 # Pointer-jumping rounds; enough for chains of 2**64 nodes, so more only happens on a cycle
+
+
+class LineageIndex:
+    """Every pixel ever seen as a node in parallel arrays, linked by integer parent positions.
+
+    A node is a (run, pixel id) pair: the cart's ids and time() restart with every
+    run, so runs (the "run" the data bridge stamps on exports, see
+    session_archive.assign_runs) are interned like the memory index's and first/last
+    seen and liveness are measured against the latest timestamp of the node's own run.
+    Nodes are added incrementally and all queries work on the position arrays.
+    Children lists (CSR), depths and lineage roots are derived lazily and rebuilt
+    only after the graph changed. Exports carrying parent_id (null for a root) are
+    linked as given; for exports without it a new pixel's parent is inferred as the
+    nearest pixel of the same generation in the previous snapshot of the same run
+    and world, since a division places the child next to its parent and copies its
+    generation. Pixels without an id (cartdata snapshots) cannot be followed and are
+    skipped.
+    """
+
+    def __init__(self):
+        self._positions = {} # (run code, pixel id) -> node position
+        self._size = 0
+        self._columns = {name: np.zeros(INITIAL_CAPACITY, dtype=dtype) for name, dtype in NODE_COLUMNS.items()}
+        self.run_names = []
+        self._run_codes = {}
+        self._run_latest = [] # Latest cart timestamp seen in every run
+        self.last_run = None # Run of the last snapshot added
+        self._previous = {} # (run code, world) -> (positions, x, y, generation) of its last snapshot
+        self._derived = None
+
+    def __len__(self):
+        return self._size
+
+    def __getattr__(self, name):
+        # Column access trimmed to the nodes in use: index.parent, index.generation, ...
+        if name in NODE_COLUMNS:
+            return self._columns[name][:self._size]
+        raise AttributeError(name)
+
+    def _grow(self, needed):
+        capacity = len(self._columns["ids"])
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        for name, column in self._columns.items():
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[:self._size] = column[:self._size]
+            self._columns[name] = grown
+
+    def _run_code(self, run):
+        code = self._run_codes.get(run)
+        if code is None:
+            code = self._run_codes[run] = len(self.run_names)
+            self.run_names.append(run)
+            self._run_latest.append(-np.inf)
+        return code
+
+    def _single_run(self, run):
+        """Pixel ids only identify a pixel within one run; per-pixel queries default to the last snapshot's"""
+        return self.last_run if run is None else run
+
+    def _node(self, run_code, pixel_id):
+        """Position of a pixel, adding an unobserved root node on first sight"""
+        key = (run_code, pixel_id)
+        position = self._positions.get(key)
+        if position is None:
+            position = self._positions[key] = self._size
+            if position == len(self._columns["ids"]):
+                self._grow(position + 1)
+            columns = self._columns
+            columns["ids"][position] = pixel_id
+            columns["run"][position] = run_code
+            columns["parent"][position] = -1
+            columns["first_seen"][position] = np.nan
+            columns["last_seen"][position] = np.nan
+            self._size += 1
+        return position
+
+    def position(self, pixel_id, run=None):
+        """Node position of a pixel of a run (the last snapshot's by default); KeyError if it was never seen"""
+        return self._positions[(self._run_codes.get(self._single_run(run), -1), pixel_id)]
+
+    def __contains__(self, pixel_id):
+        return (self._run_codes.get(self._single_run(None), -1), pixel_id) in self._positions
+
+    def add_snapshot(self, data, timestamp=None, run=None):
+        """Add the pixels of an export or session log; returns the number of new nodes"""
+        population = Population.from_export(data)
+        if not len(population):
+            return 0
+        timestamp = data.get('timestamp', 0) if timestamp is None else timestamp
+        timestamp = float(timestamp or 0)
+        run = data.get('run') if run is None else run
+        run_code = self._run_code(run)
+        self.last_run = run
+        size_before = self._size
+
+        count = len(population)
+        positions = np.full(count, -1, dtype=np.int64)
+        parents = np.full(count, -1, dtype=np.int64)
+        node = self._node
+        for i, (pixel_id, parent_id) in enumerate(zip(population.ids, population.parent_ids)):
+            if pixel_id is None:
+                continue
+            positions[i] = node(run_code, int(pixel_id))
+            if parent_id is not None:
+                parents[i] = node(run_code, int(parent_id))
+        # The decode maps a missing parent_id and an explicit null (a root) both to None;
+        # only the latter is known, so the key's presence is read from the export itself
+        has_parent_field = np.fromiter(('parent_id' in pixel for pixel in data['pixels']), dtype=bool, count=count)
+
+        tracked = positions >= 0
+        positions, parents, has_parent_field = positions[tracked], parents[tracked], has_parent_field[tracked]
+        x, y, generation = population.x[tracked], population.y[tracked], population.generation[tracked]
+
+        columns = self._columns
+        new = columns["observations"][positions] == 0
+        first_sight = np.isnan(columns["first_seen"][positions])
+        columns["first_seen"][positions[first_sight]] = timestamp
+        columns["last_seen"][positions] = timestamp
+        columns["observations"][positions] += 1
+        columns["generation"][positions] = generation
+        columns["curiosity"][positions] = population.curiosity[tracked]
+        columns["timidity"][positions] = population.timidity[tracked]
+        columns["energy"][positions] = population.energy[tracked]
+
+        # Explicit links always win over earlier inferred ones
+        explicit = has_parent_field & (parents != positions)
+        if explicit.any():
+            columns["parent"][positions[explicit]] = parents[explicit]
+            columns["inferred"][positions[explicit]] = False
+        world = (run_code, data.get('world'))
+        unlinked = new & ~has_parent_field
+        self._infer_parents(self._previous.get(world), positions[unlinked], x[unlinked], y[unlinked],
+                            generation[unlinked])
+
+        self._previous[world] = (positions, x, y, generation)
+        self._run_latest[run_code] = max(self._run_latest[run_code], timestamp)
+        self._derived = None
+        return self._size - size_before
+
+    def _infer_parents(self, previous_snapshot, positions, x, y, generation):
+        """Link new pixels to the nearest same-generation pixel of the previous snapshot"""
+        if previous_snapshot is None or not len(positions):
+            return
+        previous, px, py, pgeneration = previous_snapshot
+        if not len(previous):
+            return
+        # Chunks of new pixels keep the distance matrix small on large snapshots
+        for start in range(0, len(positions), INFER_CHUNK):
+            chunk = slice(start, start + INFER_CHUNK)
+            distance = (x[chunk, None] - px[None, :]) ** 2 + (y[chunk, None] - py[None, :]) ** 2
+            distance[generation[chunk, None] != pgeneration[None, :]] = np.inf
+            distance[positions[chunk, None] == previous[None, :]] = np.inf
+            nearest = np.argmin(distance, axis=1)
+            found = np.isfinite(distance[np.arange(len(nearest)), nearest])
+            self._columns["parent"][positions[chunk][found]] = previous[nearest[found]]
+            self._columns["inferred"][positions[chunk][found]] = True
+
+    def add_session_logs(self, session_files=None, include_archive=True):
+        """Add session logs (all of them under log_dir unless a list is given) and, by default,
+        the archived snapshots, replayed in log-name (wall-clock) order under their runs;
+        returns the number of new nodes"""
+        return sum(self.add_snapshot(snapshot) for _, snapshot in session_snapshots(session_files, include_archive))
+
+    def _derive(self):
+        """Children CSR, depth and root of every node, cached until the graph changes"""
+        if self._derived is not None:
+            return self._derived
+        n = self._size
+        parent = self.parent
+        linked = parent >= 0
+
+        # Children of node p are child_order[child_start[p]:child_start[p] + child_count[p]]
+        child_count = np.bincount(parent[linked], minlength=n)
+        child_order = np.flatnonzero(linked)[np.argsort(parent[linked], kind='stable')]
+        child_start = np.cumsum(child_count) - child_count
+
+        # Pointer jumping: every node adds the distance covered by the node it points at,
+        # then points two hops further, so depth and root settle in log(depth) rounds
+        step = np.where(linked, parent, np.arange(n))
+        depth = linked.astype(np.int64)
+        for _ in range(MAX_JUMPS):
+            further = step[step]
+            if np.array_equal(further, step):
+                break
+            depth += depth[step]
+            step = further
+        else:
+            logger.warning("Lineage graph has a parent cycle; depths are truncated")
+
+        self._derived = (child_order, child_start, child_count, depth, step)
+        return self._derived
+
+    def depths(self):
+        """Generations of division between every node and its lineage root"""
+        return self._derive()[3]
+
+    def roots(self):
+        """Position of the lineage root of every node"""
+        return self._derive()[4]
+
+    def alive(self):
+        """Mask of the nodes present in the most recent snapshot of their run"""
+        return self.last_seen >= np.asarray(self._run_latest, dtype=np.float64)[self.run]
+
+    def _run_nodes(self, run):
+        """Positions of the nodes of one run, or of all runs when run is None"""
+        if run is None:
+            return np.arange(self._size)
+        return np.flatnonzero(self.run == self._run_codes.get(run, -1))
+
+    def ancestors(self, pixel_id, run=None):
+        """Pixel ids from the parent up to the lineage root"""
+        parent, ids = self.parent, self.ids
+        chain = []
+        position = parent[self.position(pixel_id, run)]
+        while position >= 0 and len(chain) < self._size:
+            chain.append(int(ids[position]))
+            position = parent[position]
+        return chain
+
+    def descendant_positions(self, position):
+        """Positions of every node below `position`, breadth first"""
+        child_order, child_start, child_count, _, _ = self._derive()
+        found = []
+        frontier = np.array([position], dtype=np.int64)
+        for _ in range(self._size):
+            counts = child_count[frontier]
+            frontier = child_order[np.repeat(child_start[frontier], counts) + ragged_arange(counts)]
+            if not len(frontier):
+                break
+            found.append(frontier)
+        return np.concatenate(found) if found else np.zeros(0, dtype=np.int64)
+
+    def descendants(self, pixel_id, run=None):
+        """Pixel ids of every descendant, breadth first"""
+        return self.ids[self.descendant_positions(self.position(pixel_id, run))].tolist()
+
+    def subtree_sizes(self):
+        """Number of nodes in the subtree of every node (itself included)"""
+        parent, depth = self.parent, self.depths()
+        sizes = np.ones(self._size, dtype=np.int64)
+        # Fold level by level from the deepest up; a level's nodes are all complete by then
+        by_depth = np.argsort(depth, kind='stable')
+        level_end = np.cumsum(np.bincount(depth, minlength=1))
+        for level in range(len(level_end) - 1, 0, -1):
+            nodes = by_depth[level_end[level - 1]:level_end[level]]
+            np.add.at(sizes, parent[nodes], sizes[nodes])
+        return sizes
+
+    def subtree_aggregates(self, pixel_id, run=None):
+        """Size, survival and trait statistics of a pixel's subtree (itself included)"""
+        root = self.position(pixel_id, run)
+        nodes = np.concatenate(([root], self.descendant_positions(root)))
+        observed = nodes[self.observations[nodes] > 0]
+        depth = self.depths()
+        result = {
+            "pixel_id": int(pixel_id),
+            "run": self.run_names[self.run[root]],
+            "size": int(len(nodes)),
+            "observed": int(len(observed)),
+            "alive": int(self.alive()[nodes].sum()),
+            "depth": int(depth[nodes].max() - depth[root]),
+            "max_generation": int(self.generation[nodes].max())
+        }
+        if len(observed):
+            lifespan = self.last_seen[observed] - self.first_seen[observed]
+            result.update({
+                "mean_curiosity": float(self.curiosity[observed].mean()),
+                "std_curiosity": float(self.curiosity[observed].std()),
+                "mean_timidity": float(self.timidity[observed].mean()),
+                "std_timidity": float(self.timidity[observed].std()),
+                "mean_energy": float(self.energy[observed].mean()),
+                "mean_lifespan": float(lifespan.mean())
+            })
+        return result
+
+    def lineage_stats(self, top=10, run=None):
+        """Per-lineage size, survival and depth of one run (all runs by default),
+        for the `top` largest lineages plus totals"""
+        nodes = self._run_nodes(run)
+        if not len(nodes):
+            return {"lineages": 0, "surviving_lineages": 0, "survival_rate": 0.0, "max_depth": 0, "largest": []}
+        roots, depth = self.roots()[nodes], self.depths()[nodes]
+        labels, inverse = np.unique(roots, return_inverse=True)
+        observed = self.observations[nodes] > 0
+        alive = self.alive()[nodes] & observed
+        lifespan = np.where(observed, self.last_seen[nodes] - self.first_seen[nodes], 0.0)
+
+        size = np.bincount(inverse)
+        observed_count = np.bincount(inverse, weights=observed)
+        alive_count = np.bincount(inverse, weights=alive).astype(np.int64)
+        mean_lifespan = np.bincount(inverse, weights=lifespan) / np.maximum(observed_count, 1)
+        max_depth = np.zeros(len(labels), dtype=np.int64)
+        np.maximum.at(max_depth, inverse, depth)
+
+        largest = np.argsort(-size, kind='stable')[:top]
+        surviving = int((alive_count > 0).sum())
+        return {
+            "lineages": int(len(labels)),
+            "surviving_lineages": surviving,
+            "survival_rate": surviving / len(labels),
+            "max_depth": int(max_depth.max()),
+            "largest": [
+                {"root_id": int(self.ids[labels[i]]), "run": self.run_names[self.run[labels[i]]],
+                 "size": int(size[i]), "alive": int(alive_count[i]),
+                 "max_depth": int(max_depth[i]), "mean_lifespan": float(mean_lifespan[i])}
+                for i in largest
+            ]
+        }
+
+    def inheritance(self, run=None):
+        """Parent-child correlation of curiosity and timidity over observed pairs of one run (all by default)"""
+        parent = self.parent
+        observed = self.observations > 0
+        child = self._run_nodes(run)
+        child = child[(parent[child] >= 0) & observed[child]]
+        child = child[observed[parent[child]]]
+        result = {"pairs": int(len(child)), "inferred_pairs": int(self.inferred[child].sum())}
+        for trait in ("curiosity", "timidity"):
+            values = getattr(self, trait)
+            if len(child) > 1 and values[child].std() > 0 and values[parent[child]].std() > 0:
+                result[f"{trait}_correlation"] = float(np.corrcoef(values[child], values[parent[child]])[0, 1])
+            else:
+                result[f"{trait}_correlation"] = None
+        return result
+
+    def summary(self, top=3, run=None):
+        """Compact lineage overview of one run (the last snapshot's by default) for the analysis insights"""
+        run = self._single_run(run)
+        stats = self.lineage_stats(top, run)
+        stats.update({"run": run, "nodes": int(len(self._run_nodes(run))), "inheritance": self.inheritance(run)})
+        return stats
+
+    def save(self, path=None):
+        path = str(path or get_config().data_dir / "lineage.npz")
+        tmp_path = f"{path}.tmp.npz"
+        np.savez(tmp_path, run_names=np.array(json.dumps(self.run_names)),
+                 run_latest=np.array(self._run_latest, dtype=np.float64),
+                 **{name: column[:self._size] for name, column in self._columns.items()})
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path=None):
+        """Index saved by save(), or an empty one when there is none"""
+        path = str(path or get_config().data_dir / "lineage.npz")
+        index = cls()
+        if not os.path.exists(path):
+            return index
+        with np.load(path) as saved:
+            index._grow(len(saved["ids"]))
+            index._size = len(saved["ids"])
+            for name in NODE_COLUMNS:
+                index._columns[name][:index._size] = saved[name]
+            index.run_names = json.loads(str(saved["run_names"]))
+            index._run_latest = saved["run_latest"].tolist()
+            index.last_run = index.run_names[-1] if index.run_names else None
+        index._run_codes = {run: code for code, run in enumerate(index.run_names)}
+        index._positions = dict(zip(zip(index.run.tolist(), index.ids.tolist()), range(index._size)))
+        return index
+
+
+if __name__ == "__main__":
+    # python lineage_index.py build | stats [RUN] | ancestors ID [RUN] | descendants ID [RUN] | subtree ID [RUN]
+    command = sys.argv[1] if len(sys.argv) > 1 else "stats"
+    if command == "build":
+        index = LineageIndex()
+        index.add_session_logs()
+        index.save()
+        print(json.dumps(index.lineage_stats(), indent=2))
+    else:
+        index = LineageIndex.load()
+        pixel_id = int(sys.argv[2]) if len(sys.argv) > 2 and command != "stats" else None
+        run = sys.argv[3] if len(sys.argv) > 3 else None
+        if command == "ancestors" and pixel_id is not None:
+            print(json.dumps(index.ancestors(pixel_id, run)))
+        elif command == "descendants" and pixel_id is not None:
+            print(json.dumps(index.descendants(pixel_id, run)))
+        elif command == "subtree" and pixel_id is not None:
+            print(json.dumps(index.subtree_aggregates(pixel_id, run), indent=2))
+        else:
+            print(json.dumps(index.lineage_stats(run=sys.argv[2] if len(sys.argv) > 2 else None), indent=2))
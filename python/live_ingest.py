@@ -0,0 +1,123 @@
+"""
+Sentium Pico Live Ingest v2.0.0
+Tail-follows the cart's NDJSON consciousness_live.json and yields only newly appended records
+"""
+
+import json
+import os
+import time
+from config import get_config
+from instrumentation import get_logger, inc, span
+from session_archive import RunTagger
+
+logger = get_logger("live_ingest")
+
+POLL_INTERVAL = 0.5 # Seconds between checks of the live file
+MAX_READ_BYTES = 1 << 20 # Upper bound on one read, so a large backlog is ingested in slices
+
+
+class LiveExportFollower:
+    """Follow consciousness_live.json (one JSON object per line, appended by printh).
+
+    The byte offset of the last complete line and the file identity (device, inode)
+    are saved after every poll, so a restarted follower resumes where it stopped.
+    A trailing line without its newline is left for the next poll. When the file
+    shrinks (truncated) or is replaced (rotated), reading restarts at its beginning.
+    Records are tagged with their cart run like the data bridge's exports.
+    """
+
+    def __init__(self, path=None, state_file=None, from_start=False):
+        config = get_config()
+        self.path = str(path or config.live_export_file)
+        self.state_file = str(state_file or config.data_dir / "live_ingest_state.json")
+        self.offset = 0
+        self.identity = None
+        self.runs = RunTagger()
+        if not from_start:
+            self._load_state()
+
+    def _load_state(self):
+        try:
+            with open(self.state_file, 'r') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return
+        if state.get('path') == self.path:
+            self.offset = state.get('offset', 0)
+            self.identity = tuple(state['identity']) if state.get('identity') else None
+
+    def _save_state(self):
+        tmp_path = f"{self.state_file}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({"path": self.path, "offset": self.offset, "identity": self.identity}, f)
+        os.replace(tmp_path, self.state_file)
+
+    def poll(self):
+        """Return the records appended since the last poll (possibly none)"""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return []
+
+        identity = (stat.st_dev, stat.st_ino)
+        if identity != self.identity:
+            if self.identity is not None:
+                logger.info("%s was replaced, reading it from the start", self.path)
+            self.identity = identity
+            self.offset = 0
+        elif stat.st_size < self.offset:
+            logger.info("%s was truncated, reading it from the start", self.path)
+            self.offset = 0
+
+        if stat.st_size == self.offset:
+            return []
+
+        with span("read"):
+            with open(self.path, 'rb') as f:
+                f.seek(self.offset)
+                chunk = f.read(min(stat.st_size - self.offset, MAX_READ_BYTES))
+
+        # Only complete lines are consumed; a partial last line is re-read next time
+        end = chunk.rfind(b'\n') + 1
+        if end == 0:
+            if len(chunk) == MAX_READ_BYTES:
+                # A single line larger than one read can never complete a parse; skip past it
+                inc("exports_dropped", reason="oversized")
+                self.offset += len(chunk)
+                self._save_state()
+            return []
+
+        records = []
+        with span("parse"):
+            for line in chunk[:end].splitlines():
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    records.append(self.runs.tag(json.loads(line)))
+                except ValueError as e:
+                    inc("exports_dropped", reason="malformed")
+                    logger.warning("Skipping malformed live export line: %s", e)
+
+        self.offset += end
+        self._save_state()
+        inc("live_records", len(records))
+        return records
+
+    def follow(self, handler, interval=POLL_INTERVAL, stop_event=None):
+        """Call handler(record) for every new record until stop_event is set (or forever)"""
+        while stop_event is None or not stop_event.is_set():
+            records = self.poll()
+            for record in records:
+                handler(record)
+            if not records:
+                time.sleep(interval)
+
+
+if __name__ == "__main__":
+    follower = LiveExportFollower()
+    print(f"Following {follower.path} from byte {follower.offset}")
+    try:
+        follower.follow(lambda record: print(json.dumps(record)))
+    except KeyboardInterrupt:
+        pass
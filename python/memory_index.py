@@ -0,0 +1,208 @@
+"""
+Sentium Pico Memory Index v2.0.0
+Columnar index of pixel memory events across exports and session logs, with vectorized group-bys
+"""
+
+import json
+import sys
+import numpy as np
+from instrumentation import get_logger
+from session_archive import session_snapshots
+
+logger = get_logger("memory_index")
+
+COLUMNS = {
+    "timestamp": np.float64, # Timestamp of the export or session log the event was seen in
+    "run": np.int32, # Interned cart run code, see run_names; timestamps and pixel ids restart every run
+    "pixel_id": np.int64,
+    "slot": np.int16, # Position in the pixel's memory list (0 is the oldest kept)
+    "event": np.int16, # Interned event code, see event_names
+    "impact": np.float32
+}
+
+
+class MemoryEventIndex:
+    """Every memory event of every pixel in every snapshot added, as typed columns.
+
+    Event names are interned: each distinct name gets a small integer code once,
+    so group-bys are bincounts over codes; cart runs are interned the same way,
+    and a pixel is identified by its (run, id) pair. Pixels re-export their whole
+    memory list in every snapshot, so an event is seen once per snapshot that still
+    holds it; pass latest=True to the queries to count each pixel's latest snapshot
+    only, and run= to restrict them to one run.
+    """
+
+    def __init__(self):
+        self.event_names = []
+        self._event_codes = {}
+        self.run_names = []
+        self._run_codes = {}
+        self._pending = {name: [] for name in COLUMNS}
+        self._columns = {name: np.zeros(0, dtype=dtype) for name, dtype in COLUMNS.items()}
+
+    def intern(self, name):
+        """Code of an event name, assigning the next one on first sight"""
+        code = self._event_codes.get(name)
+        if code is None:
+            code = self._event_codes[name] = len(self.event_names)
+            self.event_names.append(name)
+        return code
+
+    def _run_code(self, run):
+        code = self._run_codes.get(run)
+        if code is None:
+            code = self._run_codes[run] = len(self.run_names)
+            self.run_names.append(run)
+        return code
+
+    def add_snapshot(self, data, timestamp=None, run=None):
+        """Add the memories of every pixel in an export or session log; returns the events added"""
+        timestamp = data.get('timestamp', 0) if timestamp is None else timestamp
+        run = data.get('run') if run is None else run
+        pixel_ids, slots, events, impacts = [], [], [], []
+        for index, pixel in enumerate(data.get('pixels', [])):
+            pixel_id = pixel.get('id', index + 1)
+            for slot, memory in enumerate(pixel.get('memory', [])):
+                pixel_ids.append(pixel_id)
+                slots.append(slot)
+                events.append(self.intern(memory.get('event', 'unknown')))
+                impacts.append(memory.get('impact', 0.0))
+
+        if pixel_ids:
+            pending = self._pending
+            pending["timestamp"].append(np.full(len(pixel_ids), timestamp or 0, dtype=np.float64))
+            pending["run"].append(np.full(len(pixel_ids), self._run_code(run), dtype=np.int32))
+            pending["pixel_id"].append(np.array(pixel_ids, dtype=np.int64))
+            pending["slot"].append(np.array(slots, dtype=np.int16))
+            pending["event"].append(np.array(events, dtype=np.int16))
+            pending["impact"].append(np.array(impacts, dtype=np.float32))
+        return len(pixel_ids)
+
+    def add_session_logs(self, session_files=None, include_archive=True):
+        """Add session logs (all of them under log_dir unless a list is given) and, by default,
+        the archived snapshots, each under its cart run; returns the events added"""
+        return sum(self.add_snapshot(snapshot) for _, snapshot in session_snapshots(session_files, include_archive))
+
+    @property
+    def columns(self):
+        """The index as a dict of equal-length arrays (pending additions are merged first)"""
+        if self._pending["pixel_id"]:
+            for name in COLUMNS:
+                self._columns[name] = np.concatenate([self._columns[name]] + self._pending[name])
+                self._pending[name] = []
+        return self._columns
+
+    def __len__(self):
+        return len(self.columns["pixel_id"])
+
+    def _rows(self, latest, run=None):
+        """Columns of one run (all runs by default), restricted to each pixel's most recent
+        snapshot in its run when latest is set"""
+        columns = self.columns
+        if run is not None:
+            keep = columns["run"] == self._run_codes.get(run, -1)
+            columns = {name: values[keep] for name, values in columns.items()}
+        if not latest or not len(columns["pixel_id"]):
+            return columns
+        pixel_index = self._pixel_groups(columns)
+        latest_time = np.full(pixel_index.max() + 1, -np.inf)
+        np.maximum.at(latest_time, pixel_index, columns["timestamp"])
+        keep = columns["timestamp"] == latest_time[pixel_index]
+        return {name: values[keep] for name, values in columns.items()}
+
+    @staticmethod
+    def _pixel_groups(rows):
+        """Group number of every row's (run, pixel id) pair"""
+        pairs = np.stack([rows["run"].astype(np.int64), rows["pixel_id"]])
+        return np.unique(pairs, axis=1, return_inverse=True)[1].reshape(-1)
+
+    def frequency(self, latest=False, run=None):
+        """Occurrences of every event type, {name: count}"""
+        counts = np.bincount(self._rows(latest, run)["event"], minlength=len(self.event_names))
+        return {name: int(count) for name, count in zip(self.event_names, counts)}
+
+    def mean_impact(self, latest=False, run=None):
+        """Mean impact of every event type seen, {name: mean}"""
+        rows = self._rows(latest, run)
+        counts = np.bincount(rows["event"], minlength=len(self.event_names))
+        totals = np.bincount(rows["event"], weights=rows["impact"], minlength=len(self.event_names))
+        return {name: float(totals[code] / counts[code]) for code, name in enumerate(self.event_names) if counts[code]}
+
+    def event_summary(self, latest=False, run=None):
+        """Count, mean/min/max impact and distinct pixels for every event type seen"""
+        rows = self._rows(latest, run)
+        n_events = len(self.event_names)
+        events, impacts = rows["event"], rows["impact"].astype(np.float64)
+        counts = np.bincount(events, minlength=n_events)
+        totals = np.bincount(events, weights=impacts, minlength=n_events)
+        minimum = np.full(n_events, np.inf)
+        maximum = np.full(n_events, -np.inf)
+        np.minimum.at(minimum, events, impacts)
+        np.maximum.at(maximum, events, impacts)
+        if len(events):
+            pairs = np.unique(np.stack([events.astype(np.int64), self._pixel_groups(rows)]), axis=1)
+        else:
+            pairs = np.zeros((2, 0), dtype=np.int64)
+        pixels = np.bincount(pairs[0], minlength=n_events)
+
+        return {
+            name: {
+                "count": int(counts[code]),
+                "mean_impact": float(totals[code] / counts[code]),
+                "min_impact": float(minimum[code]),
+                "max_impact": float(maximum[code]),
+                "pixels": int(pixels[code])
+            }
+            for code, name in enumerate(self.event_names) if counts[code]
+        }
+
+    def _single_run(self, run):
+        """Pixel ids only identify a pixel within one run; per-pixel queries default to the last run added"""
+        if run is None and self.run_names:
+            return self.run_names[-1]
+        return run
+
+    def pixel_event_counts(self, latest=False, run=None):
+        """(pixel ids, counts) where counts[i, code] is how often pixel i saw that event type, in one run"""
+        rows = self._rows(latest, self._single_run(run))
+        pixel_ids, pixel_index = np.unique(rows["pixel_id"], return_inverse=True)
+        n_events = len(self.event_names)
+        flat = np.bincount(pixel_index * n_events + rows["event"], minlength=len(pixel_ids) * n_events)
+        return pixel_ids, flat.reshape(len(pixel_ids), n_events)
+
+    def pixel_histories(self, latest=True, run=None):
+        """Every pixel's events in order within one run, {pixel_id: [{"event", "impact", "timestamp"}]}"""
+        rows = self._rows(latest, self._single_run(run))
+        order = np.lexsort((rows["slot"], rows["timestamp"], rows["pixel_id"]))
+        pixel_ids = rows["pixel_id"][order]
+        bounds = np.flatnonzero(np.diff(pixel_ids)) + 1
+        histories = {}
+        for chunk in np.split(order, bounds) if len(order) else []:
+            histories[int(rows["pixel_id"][chunk[0]])] = [
+                {"event": self.event_names[code], "impact": float(impact), "timestamp": float(timestamp)}
+                for code, impact, timestamp in zip(rows["event"][chunk], rows["impact"][chunk], rows["timestamp"][chunk])
+            ]
+        return histories
+
+    def pixel_history(self, pixel_id, latest=True, run=None):
+        """One pixel's events in order within one run (empty when the pixel is unknown)"""
+        rows = self._rows(latest, self._single_run(run))
+        mask = rows["pixel_id"] == pixel_id
+        order = np.lexsort((rows["slot"][mask], rows["timestamp"][mask]))
+        return [
+            {"event": self.event_names[code], "impact": float(impact), "timestamp": float(timestamp)}
+            for code, impact, timestamp in zip(rows["event"][mask][order], rows["impact"][mask][order],
+                                               rows["timestamp"][mask][order])
+        ]
+
+
+if __name__ == "__main__":
+    # python memory_index.py [PIXEL_ID [RUN]]
+    index = MemoryEventIndex()
+    index.add_session_logs()
+    print(f"Indexed {len(index)} memory events ({len(index.event_names)} event types, {len(index.run_names)} runs)")
+    if len(sys.argv) > 1:
+        run = sys.argv[2] if len(sys.argv) > 2 else None
+        print(json.dumps(index.pixel_history(int(sys.argv[1]), run=run), indent=2))
+    else:
+        print(json.dumps(index.event_summary(), indent=2))
@@ -0,0 +1,180 @@
+"""
+Sentium Pico Metrics History v2.0.0
+Append-only time series of per-analysis population metrics with minute/hour/day rollups and range queries
+"""
+
+import json
+import os
+import sys
+import time
+import numpy as np
+from config import get_config
+from instrumentation import get_logger
+
+logger = get_logger("history")
+
+# Aggregates of one analysis, in record order
+METRICS = ("generation", "pixel_count", "overall_consciousness", "emergence_score",
+           "personality_diversity", "collective_energy", "evolution_pressure", "memory_richness")
+RAW_RECORD = np.dtype([("timestamp", "<f8")] + [(name, "<f4") for name in METRICS])
+# One bucket: its start, the records in it, and sum/min/max of every metric (mean = sum / count)
+ROLLUP_RECORD = np.dtype([("timestamp", "<f8"), ("count", "<u4")] +
+                         [(f"{name}_{stat}", "<f8" if stat == "sum" else "<f4")
+                          for name in METRICS for stat in ("sum", "min", "max")])
+RESOLUTIONS = {"minute": 60, "hour": 3600, "day": 86400} # Rollup bucket widths in seconds
+MAX_POINTS = 1000 # resolution="auto" picks the finest series with at most this many points in range
+
+
+def metrics_from_insights(insights):
+    """The stored aggregates of one analysis result"""
+    emergence = insights.get('emergence_metrics') or {}
+    return {
+        "generation": insights.get('generation') or 0,
+        "pixel_count": insights.get('pixel_count', 0),
+        "overall_consciousness": insights.get('overall_consciousness_level', 0),
+        "emergence_score": emergence.get('emergence_score', 0),
+        "personality_diversity": emergence.get('personality_diversity', 0),
+        "collective_energy": emergence.get('collective_energy', 0),
+        "evolution_pressure": emergence.get('evolution_pressure', 0),
+        "memory_richness": emergence.get('memory_richness', 0)
+    }
+
+
+class MetricsHistory:
+    """Fixed-size binary records, one file per resolution (raw.bin, minute.bin, hour.bin, day.bin).
+
+    Records are appended in timestamp order, so every file is sorted and a range is
+    two binary searches over a memory-mapped timestamp column. Each rollup's last
+    record is the open bucket and is rewritten in place until a record lands in a
+    later bucket. A timestamp earlier than the last one (clock step back) is stored
+    as the last timestamp, which keeps the files sorted.
+    """
+
+    def __init__(self, directory=None):
+        self.directory = directory or get_config().history_dir
+        os.makedirs(self.directory, exist_ok=True)
+        self._last_timestamp = None
+
+    def _path(self, resolution):
+        return os.path.join(self.directory, f"{resolution}.bin")
+
+    def _load(self, resolution):
+        """Memory-mapped records of one series (an empty array when there are none)"""
+        dtype = RAW_RECORD if resolution == "raw" else ROLLUP_RECORD
+        path = self._path(resolution)
+        size = os.path.getsize(path) if os.path.exists(path) else 0
+        count = size // dtype.itemsize
+        if count == 0:
+            return np.zeros(0, dtype=dtype)
+        return np.memmap(path, dtype=dtype, mode='r', shape=(count,))
+
+    def _latest_timestamp(self):
+        if self._last_timestamp is None:
+            raw = self._load("raw")
+            self._last_timestamp = float(raw["timestamp"][-1]) if len(raw) else -np.inf
+        return self._last_timestamp
+
+    def append(self, metrics, timestamp=None):
+        """Store one analysis (a dict of METRICS) and fold it into every rollup"""
+        timestamp = max(time.time() if timestamp is None else timestamp, self._latest_timestamp())
+        self._last_timestamp = timestamp
+
+        record = np.zeros(1, dtype=RAW_RECORD)
+        record["timestamp"] = timestamp
+        for name in METRICS:
+            record[name] = metrics.get(name, 0) or 0
+        path = self._path("raw")
+        size = os.path.getsize(path) if os.path.exists(path) else 0
+        with open(path, 'r+b' if size else 'wb') as f:
+            # Drop a torn trailing record from an interrupted write, or every later record would be misaligned
+            f.seek(size - size % RAW_RECORD.itemsize)
+            f.write(record.tobytes())
+            f.truncate()
+
+        for resolution, width in RESOLUTIONS.items():
+            self._fold(resolution, timestamp - timestamp % width, record[0])
+
+    def append_insights(self, insights, timestamp=None):
+        self.append(metrics_from_insights(insights), timestamp)
+
+    def _fold(self, resolution, bucket, record):
+        path = self._path(resolution)
+        size = os.path.getsize(path) if os.path.exists(path) else 0
+        size -= size % ROLLUP_RECORD.itemsize # Ignore a torn trailing record from an interrupted write
+
+        with open(path, 'r+b' if size else 'wb') as f:
+            current = None
+            if size:
+                f.seek(size - ROLLUP_RECORD.itemsize)
+                current = np.frombuffer(f.read(ROLLUP_RECORD.itemsize), dtype=ROLLUP_RECORD).copy()
+            if current is not None and current["timestamp"][0] == bucket:
+                offset = size - ROLLUP_RECORD.itemsize
+                current["count"] += 1
+                for name in METRICS:
+                    value = record[name]
+                    current[f"{name}_sum"] += value
+                    current[f"{name}_min"] = min(current[f"{name}_min"][0], value)
+                    current[f"{name}_max"] = max(current[f"{name}_max"][0], value)
+            else:
+                offset = size
+                current = np.zeros(1, dtype=ROLLUP_RECORD)
+                current["timestamp"] = bucket
+                current["count"] = 1
+                for name in METRICS:
+                    for stat in ("sum", "min", "max"):
+                        current[f"{name}_{stat}"] = record[name]
+            f.seek(offset)
+            f.write(current.tobytes())
+            f.truncate()
+
+    def query(self, start=None, end=None, resolution="auto", metrics=METRICS):
+        """Series between start and end (epoch seconds, inclusive) as a dict of arrays.
+
+        Raw queries return one value per metric; rollups return the mean under the
+        metric's name plus `<metric>_min`, `<metric>_max` and the bucket `count`.
+        """
+        if resolution == "auto":
+            resolution = self._auto_resolution(start, end)
+        series = self._load(resolution)
+        timestamps = series["timestamp"]
+        lo = 0 if start is None else int(np.searchsorted(timestamps, start, side='left'))
+        hi = len(series) if end is None else int(np.searchsorted(timestamps, end, side='right'))
+        rows = np.asarray(series[lo:hi])
+
+        result = {"resolution": resolution, "timestamp": rows["timestamp"]}
+        if resolution == "raw":
+            for name in metrics:
+                result[name] = rows[name]
+        else:
+            result["count"] = rows["count"]
+            for name in metrics:
+                result[name] = rows[f"{name}_sum"] / np.maximum(rows["count"], 1)
+                result[f"{name}_min"] = rows[f"{name}_min"]
+                result[f"{name}_max"] = rows[f"{name}_max"]
+        return result
+
+    def _auto_resolution(self, start, end):
+        """The finest series that has at most MAX_POINTS records in the range"""
+        for resolution in ("raw",) + tuple(RESOLUTIONS):
+            timestamps = self._load(resolution)["timestamp"]
+            lo = 0 if start is None else np.searchsorted(timestamps, start, side='left')
+            hi = len(timestamps) if end is None else np.searchsorted(timestamps, end, side='right')
+            if hi - lo <= MAX_POINTS:
+                return resolution
+        return "day"
+
+    def latest(self):
+        """The most recent raw record as a dict, or None"""
+        raw = self._load("raw")
+        if not len(raw):
+            return None
+        return {name: float(raw[-1][name]) for name in RAW_RECORD.names}
+
+
+if __name__ == "__main__":
+    # python metrics_history.py [SECONDS_BACK] [raw|minute|hour|day|auto]
+    history = MetricsHistory()
+    start = time.time() - float(sys.argv[1]) if len(sys.argv) > 1 else None
+    result = history.query(start=start, resolution=sys.argv[2] if len(sys.argv) > 2 else "auto")
+    print(json.dumps({key: value.tolist() if isinstance(value, np.ndarray) else value
+                      for key, value in result.items()}, indent=2))
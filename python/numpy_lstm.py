@@ -0,0 +1,79 @@
+"""
+Sentium Pico NumPy LSTM v2.0.0
+Pure-NumPy inference for the trained consciousness LSTM (no TensorFlow import needed)
+"""
+
+import numpy as np
+
+
+def _sigmoid(x):
+    return 1.0 / (1.0 + np.exp(-x))
+
+
+class NumpyLSTMModel:
+    """Forward pass of the ConsciousnessPredictor network from its Keras weight list.
+
+    Layout matches build_model: LSTM(64, return_sequences) -> LSTM(32) -> Dense(16, relu) -> Dense(1).
+    Dropout layers are identity at inference time and carry no weights.
+    """
+
+    def __init__(self, weights):
+        weights = [np.asarray(w, dtype=np.float32) for w in weights]
+        if len(weights) != 10:
+            raise ValueError(f"Expected 10 weight arrays (2 LSTM + 2 Dense layers), got {len(weights)}")
+
+        self.weights = weights
+        self.lstm_layers = [tuple(weights[0:3]), tuple(weights[3:6])]
+        self.dense_layers = [tuple(weights[6:8]), tuple(weights[8:10])]
+
+    def get_weights(self):
+        """Same accessor as a Keras model, so artifacts can be saved from either backend"""
+        return list(self.weights)
+
+    def _lstm(self, inputs, kernel, recurrent_kernel, bias, return_sequences):
+        """Run one LSTM layer over a (batch, steps, features) array (Keras gate order i, f, c, o)"""
+        batch, steps, _ = inputs.shape
+        units = recurrent_kernel.shape[0]
+
+        # Input projections for every timestep in one matmul
+        projected = inputs @ kernel + bias
+        h = np.zeros((batch, units), dtype=np.float32)
+        c = np.zeros((batch, units), dtype=np.float32)
+        outputs = np.empty((batch, steps, units), dtype=np.float32) if return_sequences else None
+
+        for t in range(steps):
+            z = projected[:, t] + h @ recurrent_kernel
+            i = _sigmoid(z[:, :units])
+            f = _sigmoid(z[:, units:2 * units])
+            g = np.tanh(z[:, 2 * units:3 * units])
+            o = _sigmoid(z[:, 3 * units:])
+            c = f * c + i * g
+            h = o * np.tanh(c)
+            if return_sequences:
+                outputs[:, t] = h
+
+        return outputs if return_sequences else h
+
+    def predict(self, X, verbose=0):
+        """Predict for a batch of sequences; returns shape (batch, 1) like Keras"""
+        x = np.asarray(X, dtype=np.float32)
+        x = self._lstm(x, *self.lstm_layers[0], return_sequences=True)
+        x = self._lstm(x, *self.lstm_layers[1], return_sequences=False)
+
+        (hidden_kernel, hidden_bias), (output_kernel, output_bias) = self.dense_layers
+        x = np.maximum(x @ hidden_kernel + hidden_bias, 0)
+        return x @ output_kernel + output_bias
+
+
+class ArrayMinMaxScaler:
+    """Fitted MinMaxScaler state restored from plain arrays (transform only)"""
+
+    def __init__(self, min_, scale_, **fitted):
+        self.min_ = np.asarray(min_, dtype=np.float64)
+        self.scale_ = np.asarray(scale_, dtype=np.float64)
+        for attr, value in fitted.items():
+            setattr(self, attr, value)
+        self.n_samples_seen_ = getattr(self, 'n_samples_seen_', 0)
+
+    def transform(self, X):
+        return np.asarray(X, dtype=np.float64) * self.scale_ + self.min_
@@ -0,0 +1,120 @@
+"""
+Sentium Pico Population Model v2.0.0
+Typed pixel records and an array-backed population decoded once from exports and session logs
+"""
+
+import numpy as np
+
+# Defaults for fields an export may leave out, applied once when a population is decoded
+PIXEL_DEFAULTS = {
+    "x": 64.0, # Screen centre, where the first pixel is created
+    "y": 64.0,
+    "curiosity": 0.5,
+    "timidity": 0.5,
+    "energy": 0.0,
+    "age": 1.0,
+    "generation": 1,
+}
+ARRAY_FIELDS = ("x", "y", "curiosity", "timidity", "energy", "age")
+
+
+class Pixel:
+    """One pixel's state, as taken from a Population (whose decode applied PIXEL_DEFAULTS); memory is the exported event list"""
+
+    __slots__ = ("id", "x", "y", "curiosity", "timidity", "energy", "age", "generation", "parent_id", "memory")
+
+    def __init__(self, id, x, y, curiosity, timidity, energy, age, generation, parent_id, memory):
+        self.id = id
+        self.x = x
+        self.y = y
+        self.curiosity = curiosity
+        self.timidity = timidity
+        self.energy = energy
+        self.age = age
+        self.generation = generation
+        self.parent_id = parent_id
+        self.memory = memory
+
+    @property
+    def memory_depth(self):
+        return len(self.memory)
+
+    def __repr__(self):
+        return (f"Pixel(id={self.id!r}, x={self.x:.1f}, y={self.y:.1f}, curiosity={self.curiosity:.2f}, "
+                f"timidity={self.timidity:.2f}, energy={self.energy:.1f}, age={self.age:g})")
+
+
+class Population:
+    """Every pixel of one snapshot as parallel arrays.
+
+    ARRAY_FIELDS are float64 arrays and generation and memory_depth int64 arrays;
+    ids, parent ids and memory lists stay Python lists because exports may omit or mix
+    their types. Indexing with an int gives a Pixel record, with a slice, mask or index
+    array a Population over that selection (slices share the arrays).
+    """
+
+    def __init__(self, ids, x, y, curiosity, timidity, energy, age, generation, memory_depth, parent_ids, memories):
+        self.ids = ids
+        self.x = x
+        self.y = y
+        self.curiosity = curiosity
+        self.timidity = timidity
+        self.energy = energy
+        self.age = age
+        self.generation = generation
+        self.memory_depth = memory_depth
+        self.parent_ids = parent_ids
+        self.memories = memories
+
+    @classmethod
+    def from_pixels(cls, pixels):
+        """Decode a list of exported pixel dicts, applying PIXEL_DEFAULTS"""
+        count = len(pixels)
+        columns = {
+            field: np.fromiter((pixel.get(field, default) for pixel in pixels), dtype=np.float64, count=count)
+            for field, default in PIXEL_DEFAULTS.items()
+        }
+        memories = [pixel.get('memory', []) for pixel in pixels]
+        return cls(
+            ids=[pixel.get('id') for pixel in pixels],
+            generation=columns['generation'].astype(np.int64),
+            memory_depth=np.fromiter((len(memory) for memory in memories), dtype=np.int64, count=count),
+            parent_ids=[pixel.get('parent_id') for pixel in pixels],
+            memories=memories,
+            **{field: columns[field] for field in ARRAY_FIELDS}
+        )
+
+    @classmethod
+    def from_export(cls, data):
+        return cls.from_pixels(data.get('pixels', []) if data else [])
+
+    @classmethod
+    def coerce(cls, pixels):
+        """A Population from either a Population or a list of pixel dicts"""
+        return pixels if isinstance(pixels, cls) else cls.from_pixels(pixels)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, key):
+        if isinstance(key, (int, np.integer)):
+            return Pixel(self.ids[key], float(self.x[key]), float(self.y[key]), float(self.curiosity[key]),
+                         float(self.timidity[key]), float(self.energy[key]), float(self.age[key]),
+                         int(self.generation[key]), self.parent_ids[key], self.memories[key])
+        if isinstance(key, slice):
+            positions = range(len(self))[key]
+        else:
+            key = np.asarray(key)
+            positions = np.flatnonzero(key) if key.dtype == bool else key
+        return Population(
+            ids=[self.ids[i] for i in positions],
+            x=self.x[key], y=self.y[key], curiosity=self.curiosity[key], timidity=self.timidity[key],
+            energy=self.energy[key], age=self.age[key], generation=self.generation[key],
+            memory_depth=self.memory_depth[key],
+            parent_ids=[self.parent_ids[i] for i in positions],
+            memories=[self.memories[i] for i in positions]
+        )
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
@@ -0,0 +1,99 @@
+"""
+Sentium Pico Result Cache v2.0.0
+Analysis results keyed by a BLAKE2 hash of the export content, in memory with an optional disk tier
+"""
+
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from instrumentation import get_logger, inc
+
+logger = get_logger("result_cache")
+
+MEMORY_ENTRIES = 32 # Results kept in memory (least recently used first out)
+DISK_ENTRIES = 256 # Result files kept on disk before the oldest are pruned
+
+
+def content_key(content):
+    """Cache key of an export: BLAKE2b of its bytes (a dict is hashed as canonical JSON)"""
+    if isinstance(content, dict):
+        content = json.dumps(content, sort_keys=True, separators=(',', ':')).encode('utf-8')
+    elif isinstance(content, str):
+        content = content.encode('utf-8')
+    return hashlib.blake2b(content, digest_size=16).hexdigest()
+
+
+class ResultCache:
+    """LRU of analysis results; with disk_dir, results also survive restarts as <key>.json files"""
+
+    def __init__(self, memory_entries=MEMORY_ENTRIES, disk_dir=None, disk_entries=DISK_ENTRIES):
+        self.memory_entries = memory_entries
+        self.disk_entries = disk_entries
+        self.disk_dir = str(disk_dir) if disk_dir else None
+        self._entries = OrderedDict()
+        if self.disk_dir:
+            os.makedirs(self.disk_dir, exist_ok=True)
+
+    def _disk_path(self, key):
+        return os.path.join(self.disk_dir, f"{key}.json")
+
+    def get(self, key):
+        """The cached result for key, or None"""
+        if key is None:
+            return None
+        result = self._entries.get(key)
+        if result is not None:
+            self._entries.move_to_end(key)
+            inc("result_cache_hits", tier="memory")
+            return result
+
+        if self.disk_dir:
+            try:
+                with open(self._disk_path(key), 'r') as f:
+                    result = json.load(f)
+            except FileNotFoundError:
+                pass
+            except (OSError, ValueError) as e:
+                logger.warning("Ignoring unreadable cached result %s: %s", key, e)
+            if result is not None:
+                self._remember(key, result)
+                inc("result_cache_hits", tier="disk")
+                return result
+
+        inc("result_cache_misses")
+        return None
+
+    def put(self, key, result):
+        if key is None:
+            return
+        self._remember(key, result)
+        if self.disk_dir:
+            try:
+                tmp_path = f"{self._disk_path(key)}.tmp"
+                with open(tmp_path, 'w') as f:
+                    json.dump(result, f)
+                os.replace(tmp_path, self._disk_path(key))
+                self._prune_disk()
+            except (OSError, TypeError, ValueError) as e:
+                logger.warning("Could not store cached result %s: %s", key, e)
+
+    def _remember(self, key, result):
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.memory_entries:
+            self._entries.popitem(last=False)
+
+    def _prune_disk(self):
+        entries = [entry for entry in os.scandir(self.disk_dir) if entry.name.endswith('.json')]
+        if len(entries) <= self.disk_entries:
+            return
+        entries.sort(key=lambda entry: entry.stat().st_mtime)
+        for entry in entries[:len(entries) - self.disk_entries]:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
+
+    def clear(self):
+        self._entries.clear()
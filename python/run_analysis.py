@@ -9,17 +9,23 @@ from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
 from conscious_analyzer import ConsciousnessAnalyzer
 from data_bridge import DataBridge
+from instrumentation import METRICS, get_logger, inc
+from live_ingest import LiveExportFollower
 from pathlib import Path
 
+logger = get_logger("monitor")
+
 class ConsciousnessMonitor(FileSystemEventHandler):
     def __init__(self):
         self.analyzer = ConsciousnessAnalyzer()
         self.bridge = DataBridge()
         self.last_analysis = 0
         self.analysis_cooldown = 2  # Minimum seconds between analyses
+        self.analysis_count = 0
+        self.fine_tune_every = 20  # Analyses between background model fine-tunes
         
-        print("Consciousness Monitor initialized")
-        print(f"Watching: {self.bridge.conscious_export_file}")
+        logger.info("Consciousness Monitor initialized")
+        logger.info("Watching: %s", self.bridge.conscious_export_file)
         
     def on_modified(self, event):
         if event.is_directory:
@@ -31,28 +37,51 @@ class ConsciousnessMonitor(FileSystemEventHandler):
             
             # Avoid rapid-fire analysis
             if current_time - self.last_analysis < self.analysis_cooldown:
+                inc("exports_dropped", reason="cooldown")
                 return
                 
-            print(f"\nConsciousness data updated at {time.strftime('%H:%M:%S')}")
+            logger.info("\nConsciousness data updated at %s", time.strftime('%H:%M:%S'))
+            self.analyze(current_time=current_time)
+    
+    def analyze(self, data=None, current_time=None):
+        """Analyze one export (read from the bridge when data is None) and show live insights"""
+        try:
+            # Perform analysis
+            results = self.analyzer.analyze_full_consciousness_state(data)
             
-            try:
-                # Perform analysis
-                results = self.analyzer.analyze_full_consciousness_state()
+            if results:
+                self._print_live_insights(results)
+                self.last_analysis = current_time or time.time()
+                if not self.analyzer.last_cache_hit:
+                    self._maybe_fine_tune()
+            else:
+                logger.info("No valid consciousness data to analyze")
                 
-                if results:
-                    self._print_live_insights(results)
-                    self.last_analysis = current_time
-                else:
-                    print("No valid consciousness data to analyze")
-                    
-            except Exception as e:
-                print(f"Analysis error: {e}")
+        except Exception as e:
+            inc("analysis_errors")
+            logger.error("Analysis error: %s", e)
+        
+        self._write_metrics()
+    
+    def _write_metrics(self):
+        try:
+            METRICS.write()
+        except OSError as e:
+            logger.warning("Could not write metrics file: %s", e)
+    
+    def _maybe_fine_tune(self):
+        """Periodically fine-tune the AI predictor on newly logged sessions in the background"""
+        self.analysis_count += 1
+        predictor = self.analyzer.predictor
+        if predictor and predictor.model is not None and self.analysis_count % self.fine_tune_every == 0:
+            if predictor.start_fine_tuning():
+                logger.info("Started background fine-tuning of the AI predictor")
     
     def _print_live_insights(self, results):
         """Print key insights in real-time"""
-        print(f"Generation {results.get('generation', '?')} | "
-              f"Pixels: {results.get('pixel_count', 0)} | "
-              f"Consciousness: {results.get('overall_consciousness_level', 0):.2f}")
+        logger.info("Generation %s | Pixels: %d | Consciousness: %.2f",
+                    results.get('generation', '?'), results.get('pixel_count', 0),
+                    results.get('overall_consciousness_level', 0))
         
         # Show personality breakdown
         clusters = results.get('personality_clusters', {})
@@ -64,19 +93,19 @@ class ConsciousnessMonitor(FileSystemEventHandler):
                 personality_summary.append(f"{count} {ptype}")
             
             if personality_summary:
-                print(f"Personalities: {', '.join(personality_summary)}")
+                logger.info("Personalities: %s", ', '.join(personality_summary))
         
         # Show emergence level
         emergence = results.get('emergence_metrics', {}).get('emergence_score', 0)
         emergence_level = "High" if emergence > 0.7 else "Moderate" if emergence > 0.4 else "Low"
-        print(f"Emergence: {emergence_level} ({emergence:.2f})")
+        logger.info("Emergence: %s (%.2f)", emergence_level, emergence)
         
         # Show top insight
         insights = results.get('session_insights', [])
         if insights:
-            print(f"Key insight: {insights[0]}")
+            logger.info("Key insight: %s", insights[0])
         
-        print("-" * 50)
+        logger.info("-" * 50)
 
 def run_live_monitor():
     """Run the live consciousness monitor"""
@@ -88,10 +117,13 @@ def run_live_monitor():
     observer.schedule(monitor, str(watch_path), recursive=False)
     
     observer.start()
+    metrics_server = METRICS.serve()
     
     print(f"Live consciousness monitoring started!")
     print(f"Watching directory: {watch_path}")
     print("Start your PICO-8 Sentium Pico simulation to see live analysis")
+    if metrics_server:
+        print(f"Prometheus metrics at: http://127.0.0.1:{metrics_server.server_port}/metrics")
     print("Press Ctrl+C to stop monitoring\n")
     
     try:
@@ -103,6 +135,38 @@ def run_live_monitor():
     
     observer.join()
 
+def run_live_follow():
+    """Analyze each record the cart appends to consciousness_live.json, straight from the file"""
+    monitor = ConsciousnessMonitor()
+    follower = LiveExportFollower()
+    metrics_server = METRICS.serve()
+    
+    print(f"Following live consciousness export: {follower.path}")
+    if metrics_server:
+        print(f"Prometheus metrics at: http://127.0.0.1:{metrics_server.server_port}/metrics")
+    print("Press Ctrl+C to stop\n")
+    
+    try:
+        follower.follow(monitor.analyze)
+    except KeyboardInterrupt:
+        print("\nConsciousness following stopped")
+
+def run_cartdata_follow(interval=0.5):
+    """Analyze the population each time the cart saves its cartdata slots"""
+    monitor = ConsciousnessMonitor()
+    print(f"Watching cartdata: {monitor.bridge.cartdata_reader.path}")
+    print("Press Ctrl+C to stop\n")
+    
+    try:
+        while True:
+            data = monitor.bridge.read_cartdata_state(only_new=True)
+            if data:
+                monitor.analyze(data)
+            else:
+                time.sleep(interval)
+    except KeyboardInterrupt:
+        print("\nCartdata watching stopped")
+
 def run_single_analysis():
     """Run a single analysis without monitoring"""
     print("Running single consciousness analysis...")
@@ -110,6 +174,8 @@ def run_single_analysis():
     analyzer = ConsciousnessAnalyzer()
     results = analyzer.analyze_full_consciousness_state()
     
+    METRICS.write()
+    
     if results:
         print("\n" + "="*60)
         print("CONSCIOUSNESS ANALYSIS REPORT")
@@ -154,5 +220,9 @@ if __name__ == "__main__":
     
     if len(sys.argv) > 1 and sys.argv[1] == "monitor":
         run_live_monitor()
+    elif len(sys.argv) > 1 and sys.argv[1] == "follow":
+        run_live_follow()
+    elif len(sys.argv) > 1 and sys.argv[1] == "cartdata":
+        run_cartdata_follow()
     else:
         run_single_analysis()
@@ -0,0 +1,463 @@
+"""
+Sentium Pico Session Archive v2.0.0
+Session logs stored as keyframes plus per-pixel deltas, compressed with a shared dictionary, with random access
+"""
+
+import heapq
+import json
+import os
+import sys
+import zlib
+from datetime import datetime
+import numpy as np
+from config import get_config
+from instrumentation import get_logger, inc, span
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = get_logger("session_archive")
+
+KEYFRAME_INTERVAL = 64 # Snapshots per keyframe; reading any snapshot replays at most this many deltas
+DICTIONARY_SIZE = 32768 # Bytes; also zlib's largest preset dictionary
+DICTIONARY_SAMPLES = 2000 # Frames the dictionary is trained on when an archive is created
+ZSTD_LEVEL = 10
+ZLIB_LEVEL = 9
+
+# One index record per snapshot, in archive order
+INDEX_RECORD = np.dtype([("name", "S48"), ("timestamp", "<f8"), ("offset", "<u8"), ("length", "<u4"), ("keyframe", "<u4")])
+KEYFRAME, DELTA = "k", "d"
+
+
+def _pixel_keys(pixels):
+    """Delta key of every pixel: its id, made unique by position when ids are missing or repeated"""
+    keys = []
+    seen = set()
+    for index, pixel in enumerate(pixels):
+        key = str(pixel.get('id', f"#{index}"))
+        if key in seen:
+            key = f"{key}#{index}"
+        seen.add(key)
+        keys.append(key)
+    return keys
+
+
+def same_json(old, new):
+    """Equal as JSON: same value and type all the way down (in Python 1 == 1.0 == True, in JSON not)"""
+    if type(old) is not type(new):
+        return False
+    if isinstance(new, list):
+        return len(old) == len(new) and all(map(same_json, old, new))
+    if isinstance(new, dict):
+        return old.keys() == new.keys() and all(same_json(old[key], new[key]) for key in new)
+    return old == new
+
+
+def encode_delta(previous, current):
+    """Changes from one snapshot to the next.
+
+    Top-level keys and pixel fields are stored only when they changed, pixels by id;
+    a key that appears (even as null) or disappears counts as a change, and so does
+    the pixels list itself appearing or disappearing. A memory list that only had
+    events dropped from the front and appended at the back (the cart's ring) is
+    stored as that shift and the new tail.
+    """
+    delta = {}
+    changed = {key: value for key, value in current.items()
+               if key != 'pixels' and (key not in previous or not same_json(previous[key], value))}
+    removed = [key for key in previous if key not in current and key != 'pixels']
+    if changed:
+        delta["set"] = changed
+    if removed:
+        delta["unset"] = removed
+    if ('pixels' in previous) != ('pixels' in current):
+        delta["has_pixels"] = 'pixels' in current
+
+    previous_pixels = dict(zip(_pixel_keys(previous.get('pixels', [])), previous.get('pixels', [])))
+    current_pixels = current.get('pixels', [])
+    order = _pixel_keys(current_pixels)
+    pixels = {}
+    for key, pixel in zip(order, current_pixels):
+        before = previous_pixels.get(key)
+        if before is None:
+            pixels[key] = {"new": pixel}
+            continue
+        fields = {}
+        for field, value in pixel.items():
+            old = before.get(field)
+            if field in before and same_json(old, value):
+                continue
+            if field == 'memory' and isinstance(old, list) and isinstance(value, list):
+                shift = _ring_shift(old, value)
+                if shift is not None:
+                    fields["memory+"] = [shift, value[len(old) - shift:]]
+                    continue
+            fields[field] = value
+        dropped = [field for field in before if field not in pixel]
+        if dropped:
+            fields["-"] = dropped
+        if fields:
+            pixels[key] = fields
+    if pixels:
+        delta["pixels"] = pixels
+    if order != list(previous_pixels):
+        delta["order"] = order
+    return delta
+
+
+def _ring_shift(old, new):
+    """How many events were dropped from the front of old to make new a continuation of it (None if not)"""
+    for shift in range(len(old) + 1):
+        kept = len(old) - shift
+        if kept <= len(new) and same_json(old[shift:], new[:kept]):
+            return shift
+    return None
+
+
+def apply_delta(previous, delta):
+    """The snapshot that encode_delta(previous, ...) was computed from"""
+    unset = delta.get("unset", ())
+    current = {key: value for key, value in previous.items() if key not in unset and key != 'pixels'}
+    current.update(delta.get("set", {}))
+
+    previous_pixels = dict(zip(_pixel_keys(previous.get('pixels', [])), previous.get('pixels', [])))
+    changes = delta.get("pixels", {})
+    pixels = []
+    for key in delta.get("order", list(previous_pixels)):
+        change = changes.get(key, {})
+        if "new" in change:
+            pixels.append(change["new"])
+            continue
+        pixel = {field: value for field, value in previous_pixels[key].items() if field not in change.get("-", ())}
+        for field, value in change.items():
+            if field == "memory+":
+                shift, tail = value
+                pixel['memory'] = pixel['memory'][shift:] + tail
+            elif field != "-":
+                pixel[field] = value
+        pixels.append(pixel)
+    # Archives written before has_pixels recorded a removed pixels list under "unset"
+    if delta.get("has_pixels", ('pixels' in previous and 'pixels' not in unset) or bool(pixels)):
+        current['pixels'] = pixels
+    return current
+
+
+class SessionArchive:
+    """Append-only archive in one directory: frames.bin, index.bin, meta.json and an optional dictionary.
+
+    Frames are compact JSON, either a whole snapshot (keyframe) or its delta from the
+    previous snapshot, compressed one by one with zstd (or zlib when zstandard is not
+    installed) using a dictionary trained on the first frames. index.bin has a
+    fixed-size record per snapshot (name, timestamp, frame offset and length, keyframe)
+    so any snapshot is found without scanning.
+    """
+
+    def __init__(self, directory=None):
+        self.directory = str(directory or get_config().data_dir / "session_archive")
+        os.makedirs(self.directory, exist_ok=True)
+        self.frames_path = os.path.join(self.directory, "frames.bin")
+        self.index_path = os.path.join(self.directory, "index.bin")
+        self.meta_path = os.path.join(self.directory, "meta.json")
+        self.dictionary_path = os.path.join(self.directory, "dictionary.bin")
+
+        self.meta = {"codec": "zstd" if zstandard else "zlib", "dictionary": False, "keyframe_interval": KEYFRAME_INTERVAL}
+        if os.path.exists(self.meta_path):
+            with open(self.meta_path, 'r') as f:
+                self.meta = json.load(f)
+        if self.meta["codec"] == "zstd" and zstandard is None:
+            raise ImportError("This archive is zstd-compressed; install zstandard (pip install zstandard) to read it")
+
+        self.dictionary = None
+        if self.meta["dictionary"]:
+            with open(self.dictionary_path, 'rb') as f:
+                self.dictionary = f.read()
+        self._load_index()
+        self._last = None # (position, snapshot) of the last snapshot reconstructed
+
+    def _load_index(self):
+        size = os.path.getsize(self.index_path) if os.path.exists(self.index_path) else 0
+        count = size // INDEX_RECORD.itemsize
+        self.index = np.fromfile(self.index_path, dtype=INDEX_RECORD, count=count) if count else np.zeros(0, dtype=INDEX_RECORD)
+        self._names = {name.decode('utf-8'): i for i, name in enumerate(self.index["name"])}
+
+    def __len__(self):
+        return len(self.index)
+
+    def __contains__(self, name):
+        return name in self._names
+
+    # Compression
+
+    def _compress(self, payload):
+        if self.meta["codec"] == "zstd":
+            dictionary = zstandard.ZstdCompressionDict(self.dictionary) if self.dictionary else None
+            return zstandard.ZstdCompressor(level=ZSTD_LEVEL, dict_data=dictionary).compress(payload)
+        compressor = zlib.compressobj(ZLIB_LEVEL, zdict=self.dictionary) if self.dictionary else zlib.compressobj(ZLIB_LEVEL)
+        return compressor.compress(payload) + compressor.flush()
+
+    def _decompress(self, frame):
+        if self.meta["codec"] == "zstd":
+            dictionary = zstandard.ZstdCompressionDict(self.dictionary) if self.dictionary else None
+            return zstandard.ZstdDecompressor(dict_data=dictionary).decompress(frame)
+        decompressor = zlib.decompressobj(zdict=self.dictionary) if self.dictionary else zlib.decompressobj()
+        return decompressor.decompress(frame) + decompressor.flush()
+
+    def _train_dictionary(self, samples):
+        """Build the archive's dictionary from sample frames (only while the archive is empty)"""
+        samples = samples[:DICTIONARY_SAMPLES]
+        if self.meta["codec"] == "zstd":
+            try:
+                dictionary = zstandard.train_dictionary(DICTIONARY_SIZE, samples).as_bytes()
+            except zstandard.ZstdError as e:
+                # Too few or too uniform samples to train on
+                logger.info("No dictionary trained: %s", e)
+                return
+        else:
+            # zlib takes a raw preset dictionary; the most common content should sit at its end
+            dictionary = b"".join(reversed(samples))[-DICTIONARY_SIZE:]
+        self.dictionary = dictionary
+        self.meta["dictionary"] = True
+        with open(self.dictionary_path, 'wb') as f:
+            f.write(dictionary)
+
+    # Writing
+
+    def _frames(self, snapshots):
+        """(name, timestamp, kind, payload) for each snapshot appended after the current last one"""
+        position = len(self)
+        previous = self.read(position - 1) if position else None
+        for name, snapshot in snapshots:
+            keyframe = previous is None or position % self.meta["keyframe_interval"] == 0
+            body = snapshot if keyframe else encode_delta(previous, snapshot)
+            payload = json.dumps([KEYFRAME if keyframe else DELTA, body], separators=(',', ':')).encode('utf-8')
+            yield name, snapshot.get('timestamp', 0) or 0, keyframe, payload
+            previous = snapshot
+            position += 1
+
+    def extend(self, snapshots):
+        """Append (name, snapshot) pairs in order; returns how many were added.
+
+        Appending to an empty archive trains its dictionary on the new frames first.
+        """
+        frames = list(self._frames(snapshots))
+        if not frames:
+            return 0
+        if not len(self) and not self.meta["dictionary"]:
+            self._train_dictionary([payload for _, _, _, payload in frames])
+
+        records = np.zeros(len(frames), dtype=INDEX_RECORD)
+        offset = os.path.getsize(self.frames_path) if os.path.exists(self.frames_path) else 0
+        keyframe = int(self.index["keyframe"][-1]) if len(self) else 0
+        with span("archive"):
+            with open(self.frames_path, 'ab') as f:
+                for i, (name, timestamp, is_keyframe, payload) in enumerate(frames):
+                    frame = self._compress(payload)
+                    f.write(frame)
+                    if is_keyframe:
+                        keyframe = len(self) + i
+                    records[i] = (name.encode('utf-8')[:INDEX_RECORD["name"].itemsize], timestamp, offset, len(frame), keyframe)
+                    offset += len(frame)
+        # Frames first, index second: a crash in between leaves unindexed bytes, never a dangling record
+        with open(self.index_path, 'ab') as f:
+            f.write(records.tobytes())
+        tmp_path = f"{self.meta_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.meta, f)
+        os.replace(tmp_path, self.meta_path)
+
+        self._load_index()
+        inc("snapshots_archived", len(frames))
+        return len(frames)
+
+    def append(self, snapshot, name=None):
+        return self.extend([(name or f"snapshot_{len(self)}", snapshot)])
+
+    def import_session_logs(self, session_files=None, delete=False):
+        """Archive session logs not archived yet (all of them under log_dir unless a list is given).
+
+        With delete, each log file is removed once it is in the archive and reads back
+        identical to the file; a log that does not is kept and reported.
+        """
+        if session_files is None:
+            session_files = sorted(get_config().log_dir.glob("session_*.json"))
+        pending = []
+        for session_file in session_files:
+            name = os.path.basename(str(session_file))
+            if name in self:
+                continue
+            try:
+                with open(session_file, 'r') as f:
+                    pending.append((name, json.load(f)))
+            except (OSError, ValueError) as e:
+                logger.warning("Skipping %s: %s", session_file, e)
+        added = self.extend(pending)
+        if delete:
+            loaded = dict(pending)
+            for session_file in session_files:
+                name = os.path.basename(str(session_file))
+                if name not in self:
+                    continue
+                try:
+                    snapshot = loaded.get(name)
+                    if snapshot is None:
+                        with open(session_file, 'r') as f:
+                            snapshot = json.load(f)
+                except (OSError, ValueError) as e:
+                    logger.warning("Keeping %s: %s", session_file, e)
+                    continue
+                if same_json(self.read_name(name), snapshot):
+                    os.remove(session_file)
+                else:
+                    inc("archive_mismatches")
+                    logger.warning("Keeping %s: the archived copy does not read back identical", session_file)
+        logger.info("Archived %d session logs (%d in the archive)", added, len(self))
+        return added
+
+    # Reading
+
+    def _frame(self, position):
+        record = self.index[position]
+        with open(self.frames_path, 'rb') as f:
+            f.seek(int(record["offset"]))
+            kind, body = json.loads(self._decompress(f.read(int(record["length"]))))
+        return kind, body
+
+    def read(self, position):
+        """Snapshot at a position (negative counts from the end).
+
+        Consecutive snapshots share unchanged lists, so treat the result as read-only.
+        """
+        if position < 0:
+            position += len(self)
+        if not 0 <= position < len(self):
+            raise IndexError(f"archive position {position} out of range")
+
+        # Replay from the snapshot's keyframe, or from the last one read when that is on the way
+        start = int(self.index["keyframe"][position])
+        snapshot = None
+        if self._last and start <= self._last[0] <= position:
+            start, snapshot = self._last
+            start += 1
+        with span("restore"):
+            for i in range(start, position + 1):
+                kind, body = self._frame(i)
+                snapshot = body if kind == KEYFRAME else apply_delta(snapshot, body)
+        self._last = (position, snapshot)
+        return snapshot
+
+    def read_name(self, name):
+        """Snapshot archived under a session log name"""
+        return self.read(self._names[name])
+
+    def names(self):
+        return list(self._names)
+
+    def __iter__(self):
+        for position in range(len(self)):
+            yield self.read(position)
+
+    def stats(self):
+        frames = int(self.index["length"].sum()) if len(self) else 0
+        return {
+            "snapshots": len(self),
+            "keyframes": int(len(np.unique(self.index["keyframe"]))) if len(self) else 0,
+            "codec": self.meta["codec"],
+            "dictionary": self.meta["dictionary"],
+            "archive_bytes": frames + len(self) * INDEX_RECORD.itemsize + len(self.dictionary or b""),
+        }
+
+
+def archived_snapshots(skip_names=(), directory=None):
+    """(name, snapshot) of everything in the default archive, if one exists, except skip_names"""
+    directory = str(directory or get_config().data_dir / "session_archive")
+    if not os.path.exists(os.path.join(directory, "meta.json")):
+        return
+    archive = SessionArchive(directory)
+    for position, name in enumerate(archive.names()):
+        if name not in skip_names:
+            yield name, archive.read(position)
+
+
+class RunTagger:
+    """Stamps snapshots, given in arrival order, with the cart run they come from.
+
+    The cart's timestamp (time()) and pixel ids restart with every run, so a timestamp
+    lower than the previous snapshot's starts a new run. Snapshots that already carry
+    a "run" keep it, and later untagged ones continue that run.
+    """
+
+    def __init__(self):
+        self.run = None
+        self._clock = None
+        self._names = set()
+
+    def tag(self, snapshot, new_run=None):
+        """The snapshot with its "run" set, as a copy when it had none (so a caller's dict is never changed).
+
+        A new run is named new_run, or the current wall-clock time when not given; a name
+        already used (two restarts within one second) gets a -2, -3, ... suffix.
+        """
+        timestamp = snapshot.get('timestamp') or 0
+        if snapshot.get('run') is not None:
+            self.run = snapshot['run']
+        else:
+            if self.run is None or timestamp < self._clock:
+                base = new_run or datetime.now().strftime("%Y%m%d_%H%M%S")
+                self.run, suffix = base, 1
+                while self.run in self._names:
+                    suffix += 1
+                    self.run = f"{base}-{suffix}"
+                self._names.add(self.run)
+            snapshot = dict(snapshot, run=self.run)
+        self._clock = timestamp
+        return snapshot
+
+
+def assign_runs(named_snapshots):
+    """Tag (name, snapshot) pairs, given in wall-clock (log name) order, with the cart run they belong to.
+
+    Snapshots logged by the data bridge carry a "run" already. For older ones, a run
+    starts whenever the cart timestamp goes backwards (see RunTagger); it is named after
+    the wall-clock part of its first log's name.
+    """
+    tagger = RunTagger()
+    for name, snapshot in named_snapshots:
+        yield name, tagger.tag(snapshot, os.path.splitext(name)[0].replace("session_", "", 1))
+
+
+def session_snapshots(session_files=None, include_archive=True):
+    """(name, snapshot) of the session logs (all of them under log_dir unless a list is given) and,
+    by default, the archived snapshots not among them, merged in name order and tagged with their run"""
+    if session_files is None:
+        session_files = get_config().log_dir.glob("session_*.json")
+    session_files = sorted(session_files, key=lambda path: os.path.basename(str(path)))
+
+    def logs():
+        for session_file in session_files:
+            try:
+                with open(session_file, 'r') as f:
+                    yield os.path.basename(str(session_file)), json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning("Error loading %s: %s", session_file, e)
+
+    streams = [logs()]
+    if include_archive:
+        streams.append(archived_snapshots({os.path.basename(str(path)) for path in session_files}))
+    return assign_runs(heapq.merge(*streams, key=lambda item: item[0]))
+
+
+if __name__ == "__main__":
+    # python session_archive.py import [--delete] | stats | show NAME_OR_POSITION
+    archive = SessionArchive()
+    command = sys.argv[1] if len(sys.argv) > 1 else "stats"
+    if command == "import":
+        archive.import_session_logs(delete="--delete" in sys.argv)
+        print(json.dumps(archive.stats(), indent=2))
+    elif command == "show" and len(sys.argv) > 2:
+        target = sys.argv[2]
+        snapshot = archive.read_name(target) if target in archive else archive.read(int(target))
+        print(json.dumps(snapshot, indent=2))
+    else:
+        print(json.dumps(archive.stats(), indent=2))
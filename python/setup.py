@@ -123,6 +123,7 @@ def show_usage():
     print("  python run_analysis.py monitor  - Live monitoring")
     print("  python demo_conscious_ai.py - AI consciousness prediction demo")
     print("  python conscious_predictor.py - Train AI prediction model")
+    print("  python hf_conscious_predictor.py prefetch - Download NLP models for offline use")
 
 if __name__ == "__main__":
     if len(sys.argv) < 2:
@@ -6,7 +6,9 @@ Lightweight consciousness analysis without heavy ML dependencies
 import json
 import time
 from datetime import datetime
+import numpy as np
 from data_bridge import DataBridge
+from population import Population
 
 class SimpleConsciousnessAnalyzer:
     def __init__(self):
@@ -22,29 +24,26 @@ class SimpleConsciousnessAnalyzer:
             print("No consciousness data available")
             return None
         
-        pixels = data.get('pixels', [])
+        population = Population.from_export(data)
         cursor_data = data.get('cursor_interaction', {})
         generation = data.get('generation', 1)
         
-        print(f"Analyzing {len(pixels)} pixels from generation {generation}")
+        print(f"Analyzing {len(population)} pixels from generation {generation}")
         
         # Simple consciousness scoring
-        consciousness_scores = []
-        for pixel in pixels:
-            memory_depth = len(pixel.get('memory', []))
-            curiosity = pixel.get('curiosity', 0.5)
-            timidity = pixel.get('timidity', 0.5)
-            energy = pixel.get('energy', 0)
-            
-            # Simple consciousness formula
-            personality_complexity = abs(curiosity - timidity)
-            consciousness_score = (memory_depth * 0.3 + personality_complexity * 0.4 + energy/30 * 0.3)
-            
-            consciousness_scores.append({
-                'pixel_id': pixel.get('id'),
-                'consciousness_score': consciousness_score,
-                'personality': 'curious' if curiosity > timidity else 'timid' if timidity > curiosity else 'balanced'
-            })
+        curiosity, timidity = population.curiosity, population.timidity
+        personality_complexity = np.abs(curiosity - timidity)
+        scores = population.memory_depth * 0.3 + personality_complexity * 0.4 + population.energy / 30 * 0.3
+        personalities = np.where(curiosity > timidity, 'curious', np.where(timidity > curiosity, 'timid', 'balanced'))
+        
+        consciousness_scores = [
+            {
+                'pixel_id': pixel_id,
+                'consciousness_score': score,
+                'personality': personality
+            }
+            for pixel_id, score, personality in zip(population.ids, scores.tolist(), personalities.tolist())
+        ]
         
         # Calculate averages
         avg_consciousness = sum(s['consciousness_score'] for s in consciousness_scores) / len(consciousness_scores) if consciousness_scores else 0
@@ -61,7 +60,7 @@ class SimpleConsciousnessAnalyzer:
         insights = {
             "analysis_timestamp": datetime.now().isoformat(),
             "generation": generation,
-            "pixel_count": len(pixels),
+            "pixel_count": len(population),
             "consciousness_scores": consciousness_scores,
             "overall_consciousness_level": float(avg_consciousness),
             "dominant_personality": dominant_personality,
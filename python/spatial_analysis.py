@@ -0,0 +1,165 @@
+"""
+Sentium Pico Spatial Analysis v2.0.0
+Uniform grid hash over the 128x128 world for neighbour, density, nearest-neighbour and crowding metrics
+"""
+
+import numpy as np
+from population import Population
+
+WORLD_SIZE = 128 # PICO-8 screen, the extent of every pixel position
+INTERACTION_RADIUS = 12.0 # Pixels closer than this count as neighbours
+CELL_SIZE = 12.0 # Grid cell edge; equal to the radius so a query only visits the 3x3 surrounding cells
+
+
+def ragged_arange(counts):
+    """Concatenation of arange(c) for every c in counts"""
+    total = int(counts.sum())
+    if total == 0:
+        return np.zeros(0, dtype=np.int64)
+    ends = np.cumsum(counts)
+    return np.arange(total) - np.repeat(ends - counts, counts)
+
+
+class SpatialGrid:
+    """Points bucketed into square cells, sorted by cell, with the start of every cell.
+
+    Building is a bincount plus a stable sort of small integer keys; a radius query
+    only compares a point with the occupants of the cells its radius overlaps, so
+    the work is proportional to the number of points times the local occupancy
+    instead of all pairs.
+    """
+
+    def __init__(self, xs, ys, cell_size=CELL_SIZE, world_size=WORLD_SIZE):
+        self.xs = np.asarray(xs, dtype=np.float64)
+        self.ys = np.asarray(ys, dtype=np.float64)
+        self.cell_size = cell_size
+        self.cells_per_side = int(np.ceil(world_size / cell_size))
+        self.cx = np.clip((self.xs // cell_size).astype(np.int64), 0, self.cells_per_side - 1)
+        self.cy = np.clip((self.ys // cell_size).astype(np.int64), 0, self.cells_per_side - 1)
+        cell = self.cy * self.cells_per_side + self.cx
+        self.order = np.argsort(cell, kind='stable')
+        self.cell_count = np.bincount(cell, minlength=self.cells_per_side ** 2)
+        self.cell_start = np.cumsum(self.cell_count) - self.cell_count
+
+    def __len__(self):
+        return len(self.xs)
+
+    def pairs_within(self, radius, points=None):
+        """Neighbour pairs (i, j, distance) with i != j and distance < radius.
+
+        With `points`, only pairs whose first member is one of those indices.
+        """
+        points = np.arange(len(self)) if points is None else np.asarray(points, dtype=np.int64)
+        reach = int(np.ceil(radius / self.cell_size))
+        first, second = [], []
+        for dy in range(-reach, reach + 1):
+            for dx in range(-reach, reach + 1):
+                ncx, ncy = self.cx[points] + dx, self.cy[points] + dy
+                inside = (ncx >= 0) & (ncx < self.cells_per_side) & (ncy >= 0) & (ncy < self.cells_per_side)
+                source = points[inside]
+                cell = ncy[inside] * self.cells_per_side + ncx[inside]
+                counts = self.cell_count[cell]
+                first.append(np.repeat(source, counts))
+                second.append(self.order[np.repeat(self.cell_start[cell], counts) + ragged_arange(counts)])
+
+        i, j = np.concatenate(first), np.concatenate(second)
+        distance = np.hypot(self.xs[i] - self.xs[j], self.ys[i] - self.ys[j])
+        keep = (i != j) & (distance < radius)
+        return i[keep], j[keep], distance[keep]
+
+    def neighbors(self, index, radius=INTERACTION_RADIUS):
+        """Indices of the points within radius of point `index`"""
+        _, j, _ = self.pairs_within(radius, [index])
+        return j
+
+    def neighbor_counts(self, radius=INTERACTION_RADIUS):
+        """Number of other points within radius of every point"""
+        i, _, _ = self.pairs_within(radius)
+        return np.bincount(i, minlength=len(self))
+
+    def nearest_neighbors(self):
+        """(index, distance) of every point's nearest other point; -1 / inf when it is alone.
+
+        Points are resolved with growing radii, so each round only revisits the points
+        whose nearest neighbour lies further out than the last radius.
+        """
+        n = len(self)
+        nearest = np.full(n, -1, dtype=np.int64)
+        nearest_distance = np.full(n, np.inf)
+        pending = np.arange(n)
+        radius = self.cell_size
+        max_radius = self.cells_per_side * self.cell_size * np.sqrt(2) + self.cell_size
+        while len(pending) and radius <= max_radius * 2 and n > 1:
+            i, j, distance = self.pairs_within(radius, pending)
+            # Closest pair per point: sort by (point, distance) and keep the first of each point
+            order = np.lexsort((distance, i))
+            i, j, distance = i[order], j[order], distance[order]
+            first = np.ones(len(i), dtype=bool)
+            first[1:] = i[1:] != i[:-1]
+            nearest[i[first]] = j[first]
+            nearest_distance[i[first]] = distance[first]
+            pending = pending[nearest[pending] < 0]
+            radius *= 2
+        return nearest, nearest_distance
+
+    def components(self, radius=INTERACTION_RADIUS):
+        """Group label of every point, joining points closer than radius (connected components)"""
+        labels = np.arange(len(self))
+        i, j, _ = self.pairs_within(radius)
+        # Label propagation: every point takes the smallest label among its neighbours until stable
+        while len(i):
+            smaller = np.minimum(labels[i], labels[j])
+            updated = labels.copy()
+            np.minimum.at(updated, i, smaller)
+            updated = updated[updated] # Pointer jumping shortens long chains
+            if np.array_equal(updated, labels):
+                break
+            labels = updated
+        return labels
+
+
+def analyze_spatial(pixels, radius=INTERACTION_RADIUS):
+    """Proximity metrics for a Population (or a list of exported pixel dicts)"""
+    population = Population.coerce(pixels)
+    if not len(population):
+        return {"error": "No pixels to analyze"}
+
+    ids = population.ids
+    grid = SpatialGrid(population.x, population.y)
+    n = len(population)
+
+    counts = grid.neighbor_counts(radius)
+    nearest, nearest_distance = grid.nearest_neighbors()
+    labels = grid.components(radius)
+    group_sizes = np.bincount(np.unique(labels, return_inverse=True)[1])
+
+    has_neighbor = nearest >= 0
+    mean_nn_distance = float(nearest_distance[has_neighbor].mean()) if has_neighbor.any() else None
+    mutual = has_neighbor & (nearest[np.maximum(nearest, 0)] == np.arange(n))
+
+    # Clark-Evans ratio: observed mean nearest-neighbour distance over its expectation for
+    # uniformly random positions, 0.5 / sqrt(density). Below 1 is clustered, above 1 dispersed.
+    clark_evans = None
+    if mean_nn_distance is not None:
+        clark_evans = mean_nn_distance / (0.5 / np.sqrt(n / WORLD_SIZE ** 2))
+
+    return {
+        "interaction_radius": radius,
+        "local_density": [
+            {"pixel_id": ids[i], "neighbors": int(counts[i]),
+             "density": float(counts[i] / (np.pi * radius ** 2))}
+            for i in range(n)
+        ],
+        "nearest_neighbors": [
+            {"pixel_id": ids[i], "neighbor_id": ids[nearest[i]], "distance": float(nearest_distance[i])}
+            for i in range(n) if has_neighbor[i]
+        ],
+        "mean_neighbors": float(counts.mean()),
+        "max_neighbors": int(counts.max()),
+        "mean_nearest_distance": mean_nn_distance,
+        "mutual_nearest_pairs": int(mutual.sum() // 2),
+        "isolated_pixels": int((counts == 0).sum()),
+        "groups": int(len(group_sizes)),
+        "largest_group": int(group_sizes.max()),
+        "crowding_index": float(clark_evans) if clark_evans is not None else None
+    }
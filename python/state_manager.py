@@ -1,9 +1,39 @@
-import redis
 import json
+from config import get_config
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+class MemoryState:
+    # Process-local stand-in for the few Redis calls StateManager makes
+    def __init__(self):
+        self.hashes = {}
+        self.values = {}
+
+    def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+    def hmset(self, key, mapping):
+        self.hashes.setdefault(key, {}).update({k: str(v) for k, v in mapping.items()})
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def set(self, key, value):
+        self.values[key] = str(value)
 
 class StateManager:
-    def __init__(self, redis_host='localhost', redis_port=6379):
-        self.redis = redis.Redis(host=redis_host, port=redis_port, db=0, decode_responses=True)
+    def __init__(self, redis_host=None, redis_port=None, backend=None):
+        config = get_config()
+        backend = backend or config.state_backend
+        if backend == "memory":
+            self.redis = MemoryState()
+        else:
+            if redis is None:
+                raise ImportError("The redis state backend needs the redis package (pip install redis) or SENTIUM_STATE_BACKEND=memory")
+            self.redis = redis.Redis(host=redis_host or config.redis_host, port=redis_port or config.redis_port, db=0, decode_responses=True)
 
     def get_state(self, key):
         return self.redis.hgetall(key)
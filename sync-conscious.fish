@@ -1,6 +1,7 @@
 #!/usr/bin/env fish
 
 # Script to sync consciousness data from PICO-8 to the data bridge
+# (`python python/run_analysis.py follow` reads consciousness_live.json directly and does not need this copy)
 
 set REPO_DIR (dirname (status --current-filename))
 set PICO_CARTS_DIR "$HOME/Library/Application Support/pico-8/carts"
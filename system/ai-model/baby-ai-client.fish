@@ -0,0 +1,119 @@
+#!/usr/bin/env fish
+#
+# Copyright (c) 2025 Napol Thanarangkaun (lopanapol@gmail.com)
+# Licensed under Sentium License - See LICENSE file for details
+#
+
+# baby-ai-client.fish - Talk to the long-running baby AI daemon over its Unix socket
+# Start the daemon once with: baby_ai_daemon_start
+# Requests fall back to a one-shot `python3 baby_ai.py ...` call when the daemon is not running
+
+set -g BABY_AI_DIR (dirname (status -f))
+if not set -q BABY_AI_SOCKET
+    # Same place as the daemon's default: ai_model_dir from python/config.py. Only ask Python when
+    # an environment variable or sentium.json can move it away from this directory.
+    set -l model_dir $BABY_AI_DIR
+    if set -q SENTIUM_AI_MODEL_DIR; or set -q SENTIUM_WORKSPACE; or set -q SENTIUM_CONFIG; or test -e $BABY_AI_DIR/../../sentium.json
+        set -l configured (python3 -c "import sys; sys.path.insert(0, sys.argv[1]); from config import get_config; print(get_config().ai_model_dir)" $BABY_AI_DIR/../../python 2>/dev/null)
+        test -n "$configured"; and set model_dir $configured
+    end
+    set -g BABY_AI_SOCKET $model_dir/baby_ai.sock
+end
+
+# Escape a string for use inside a JSON string literal
+function baby_ai_json_escape
+    set -l escaped (string replace -a '\\' '\\\\' -- $argv[1] | string replace -a '"' '\\"' | string replace -a \t '\\t' | string replace -a \r '\\r' | string join '\\n')
+    # Any other control character becomes a \u escape (tab, newline and return are done above)
+    if string match -rq '[\x01-\x1f]' -- "$escaped"
+        for code in (seq 8) 11 12 (seq 14 31)
+            set -l char (printf (printf '\\\\x%02x' $code))
+            set escaped (string replace -a -- "$char" (printf '\\\\u%04x' $code) "$escaped")
+        end
+    end
+    echo "$escaped"
+end
+
+# True when a daemon answers on the socket (a socket file left by a killed daemon does not)
+function baby_ai_daemon_alive
+    test -S $BABY_AI_SOCKET; or return 1
+    set -l response (baby_ai_request '{"command": "ping"}')
+    test -n "$response"
+end
+
+# Start the daemon in the background (no-op if it is already listening)
+function baby_ai_daemon_start
+    if baby_ai_daemon_alive
+        return 0
+    end
+    python3 $BABY_AI_DIR/baby_ai.py serve $BABY_AI_SOCKET >/dev/null 2>&1 &
+    disown
+    # Wait briefly for the daemon to answer (it replaces a stale socket file on startup)
+    for i in (seq 20)
+        if baby_ai_daemon_alive
+            return 0
+        end
+        sleep 0.1
+    end
+    echo "Error: baby AI daemon did not start" >&2
+    return 1
+end
+
+# Stop the daemon; it flushes knowledge to disk on shutdown
+function baby_ai_daemon_stop
+    set -l pids (pgrep -f "baby_ai.py serve")
+    if test (count $pids) -gt 0
+        kill -TERM $pids
+    end
+end
+
+# Send one JSON request line and print the JSON response line; prints nothing if no daemon answers.
+# Both clients shut down their write side after the request, which ends the daemon's read loop.
+function baby_ai_request
+    set -l request $argv[1]
+    if command -sq socat
+        echo $request | socat -t 5 - UNIX-CONNECT:$BABY_AI_SOCKET 2>/dev/null
+    else if nc -h 2>&1 | string match -q -- '*-N*'
+        echo $request | nc -N -U $BABY_AI_SOCKET 2>/dev/null | head -n 1
+    else
+        echo $request | nc -q 0 -U $BABY_AI_SOCKET 2>/dev/null | head -n 1
+    end
+end
+
+# Send a request to the daemon, or run baby_ai.py with the remaining arguments when no daemon answers
+function baby_ai_call
+    if test -S $BABY_AI_SOCKET
+        set -l response (baby_ai_request $argv[1])
+        if test -n "$response"
+            printf '%s\n' $response
+            return 0
+        end
+    end
+    python3 $BABY_AI_DIR/baby_ai.py $argv[2..-1] | tail -n 1
+end
+
+function baby_ai_predict
+    set -l word (baby_ai_json_escape $argv[1])
+    baby_ai_call "{\"command\": \"predict\", \"word\": \"$word\"}" predict $argv[1]
+end
+
+function baby_ai_learn
+    set -l word (baby_ai_json_escape $argv[1])
+    set -l predicted (baby_ai_json_escape $argv[2])
+    set -l actual (baby_ai_json_escape $argv[3])
+    baby_ai_call "{\"command\": \"learn\", \"word\": \"$word\", \"predicted\": \"$predicted\", \"actual\": \"$actual\"}" learn $argv[1] $argv[2] $argv[3]
+end
+
+function baby_ai_auto_learn
+    set -l content (baby_ai_json_escape "$argv[1]")
+    set -l sentiment (baby_ai_json_escape $argv[2])
+    baby_ai_call "{\"command\": \"auto-learn-content\", \"content\": \"$content\", \"sentiment\": \"$sentiment\"}" auto-learn-content "$argv[1]" $argv[2]
+end
+
+# Score one or more texts in a single request; prints {"results": [...]} with one entry per text
+function baby_ai_predict_texts
+    set -l texts
+    for text in $argv
+        set -a texts "\""(baby_ai_json_escape "$text")"\""
+    end
+    baby_ai_call "{\"command\": \"predict-text\", \"texts\": ["(string join ', ' $texts)"]}" predict-text $argv
+end
@@ -1,41 +1,131 @@
+import errno
 import json
 import os
 import sys
 import re
 import random
+import signal
+import socket
+import socketserver
+import threading
+from collections import Counter
+import numpy as np
 from baby_brain import BabyBrain
+from lexicon_store import LexiconStore
+
+# Workspace configuration (data locations) is shared with the analysis modules in python/
+PYTHON_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, os.pardir, 'python'))
+if PYTHON_DIR not in sys.path:
+    sys.path.append(PYTHON_DIR)
+from config import get_config
+
+# Unix socket used by the long-running daemon (python baby_ai.py serve)
+DEFAULT_SOCKET_PATH = os.environ.get("BABY_AI_SOCKET", os.path.join(str(get_config().ai_model_dir), "baby_ai.sock"))
+FLUSH_INTERVAL = 5.0 # Seconds between write-backs of dirty knowledge in daemon mode
+TOKEN_PATTERN = re.compile(r'\b\w+\b')
+SENTIMENT_THRESHOLD = 0.2 # Scores above / below +-0.2 count as positive / negative
 
 class BabyAILearner:
-    def __init__(self, knowledge_file="baby_ai_knowledge.json", learning_rate=0.1):
-        self.script_dir = os.path.dirname(__file__)
-        self.knowledge_file = os.path.join(self.script_dir, knowledge_file)
+    def __init__(self, knowledge_file="baby_ai_knowledge.lex", learning_rate=0.1, autosave=True):
+        self.data_dir = str(get_config().ai_model_dir)
+        self.knowledge_file = os.path.join(self.data_dir, knowledge_file)
+        self.legacy_knowledge_file = os.path.join(self.data_dir, "baby_ai_knowledge.json")
         self.learning_rate = learning_rate
         self.knowledge = self._load_knowledge()
         self.baby_brain = BabyBrain() # Initialize BabyBrain
+        # With autosave off (daemon mode) updates stay in memory until flush()
+        self.autosave = autosave
+        self.baby_brain.autosave = autosave
+        self.dirty = False
 
     def _load_knowledge(self):
-        if os.path.exists(self.knowledge_file):
-            with open(self.knowledge_file, 'r') as f:
-                return json.load(f)
-        return {}
+        # Memory-mapped lexicon: opening it is O(1) regardless of vocabulary size
+        if not os.path.exists(self.knowledge_file) and os.path.exists(self.legacy_knowledge_file):
+            # One-time migration from the old JSON knowledge file
+            with open(self.legacy_knowledge_file, 'r') as f:
+                return LexiconStore.from_dict(self.knowledge_file, json.load(f))
+        return LexiconStore(self.knowledge_file)
 
     def _save_knowledge(self):
-        with open(self.knowledge_file, 'w') as f:
-            json.dump(self.knowledge, f, indent=4)
+        # Scores are updated in place in the mapped file, which other processes see at once;
+        # flushing is what makes them durable (see LexiconStore for the crash trade-off)
+        self.knowledge.flush()
+        self.dirty = False
+
+    def _persist(self):
+        if self.autosave:
+            self._save_knowledge()
+        else:
+            self.dirty = True
+
+    def flush(self):
+        if self.dirty:
+            self._save_knowledge()
+        self.baby_brain.flush()
 
     def predict_sentiment(self, word):
         word_lower = word.lower()
         score = self.knowledge.get(word_lower, 0.0)
 
-        if score > 0.2:
+        return self._sentiment_label(score)
+
+    def _sentiment_label(self, score):
+        if score > SENTIMENT_THRESHOLD:
             return "positive"
-        elif score < -0.2:
+        elif score < -SENTIMENT_THRESHOLD:
             return "negative"
         else:
             return "neutral"
 
-    def learn_from_feedback(self, word, predicted_sentiment, actual_sentiment):
-        word_lower = word.lower()
+    def predict_sentiments(self, texts):
+        # Score whole texts at once: one tokenization pass, one vectorized lookup of
+        # the distinct words, then per-text aggregates with bincount / reduceat
+        if isinstance(texts, str):
+            texts = [texts]
+
+        vocabulary = {}
+        token_ids = []
+        lengths = []
+        for text in texts:
+            tokens = TOKEN_PATTERN.findall(text.lower())
+            token_ids.extend(vocabulary.setdefault(word, len(vocabulary)) for word in tokens)
+            lengths.append(len(tokens))
+
+        text_count = len(texts)
+        lengths = np.array(lengths, dtype=np.int64)
+        token_scores = self.knowledge.scores_for(list(vocabulary))[np.array(token_ids, dtype=np.int64)].astype(np.float64)
+        text_index = np.repeat(np.arange(text_count), lengths)
+
+        totals = np.bincount(text_index, weights=token_scores, minlength=text_count)
+        means = totals / np.maximum(lengths, 1)
+        positives = np.bincount(text_index, weights=token_scores > SENTIMENT_THRESHOLD, minlength=text_count)
+        negatives = np.bincount(text_index, weights=token_scores < -SENTIMENT_THRESHOLD, minlength=text_count)
+
+        # reduceat over the start offsets of non-empty texts (tokens are grouped by text)
+        mins = np.zeros(text_count)
+        maxs = np.zeros(text_count)
+        non_empty = lengths > 0
+        if token_scores.size:
+            starts = (np.cumsum(lengths) - lengths)[non_empty]
+            mins[non_empty] = np.minimum.reduceat(token_scores, starts)
+            maxs[non_empty] = np.maximum.reduceat(token_scores, starts)
+
+        return [
+            {
+                "sentiment": self._sentiment_label(mean),
+                "mean": mean,
+                "min": low,
+                "max": high,
+                "positive_words": int(pos),
+                "negative_words": int(neg),
+                "word_count": int(length)
+            }
+            for mean, low, high, pos, neg, length in zip(
+                means.tolist(), mins.tolist(), maxs.tolist(), positives.tolist(), negatives.tolist(), lengths.tolist()
+            )
+        ]
+
+    def _apply_feedback(self, word_lower, predicted_sentiment, actual_sentiment):
         current_score = self.knowledge.get(word_lower, 0.0)
 
         if predicted_sentiment == actual_sentiment:
@@ -54,20 +144,154 @@ class BabyAILearner:
                 elif predicted_sentiment == "negative":
                     self.knowledge[word_lower] = min(1.0, current_score + self.learning_rate)
 
-        self._save_knowledge()
+    def learn_from_feedback(self, word, predicted_sentiment, actual_sentiment):
+        word_lower = word.lower()
+        self._apply_feedback(word_lower, predicted_sentiment, actual_sentiment)
+
+        self._persist()
         self.baby_brain.learn_from_word(word_lower) # Teach the baby brain
 
+    def learn_batch(self, words, assumed_sentiment):
+        # Transactional batch learning: every update is applied in memory, repeated
+        # words are tallied once, and each knowledge file is written once at the end
+        word_counts = Counter(word.lower() for word in words)
+        for word, count in word_counts.items():
+            for _ in range(count):
+                previous_score = self.knowledge.get(word)
+                self._apply_feedback(word, self.predict_sentiment(word), assumed_sentiment)
+                if self.knowledge.get(word) == previous_score:
+                    break # Score is clamped or unaffected, further repeats change nothing
+
+        self._persist()
+        self.baby_brain.learn_from_words(word_counts)
+        return {word: self.knowledge.get(word, 0.0) for word in word_counts}
+
     def auto_learn_from_text(self, text_content, assumed_sentiment):
-        words = re.findall(r'\b\w+\b', text_content.lower())
-        learned_words = {}
-        for word in words:
-            predicted = self.predict_sentiment(word)
-            self.learn_from_feedback(word, predicted, assumed_sentiment)
-            learned_words[word] = self.knowledge.get(word, 0.0) # Store the updated score
-        return learned_words
+        words = TOKEN_PATTERN.findall(text_content.lower())
+        return self.learn_batch(words, assumed_sentiment)
+
+
+def handle_request(baby_ai, request):
+    # One daemon request (a decoded JSON line) -> response dict, same commands as the CLI
+    command = request.get("command")
+
+    if command == "predict":
+        word = request.get("word")
+        if not word:
+            return {"error": "Missing word for prediction"}
+        sentiment = baby_ai.predict_sentiment(word)
+        baby_response = baby_ai.baby_brain.generate_vocalization(sentiment)
+        return {"word": word, "sentiment": sentiment, "babyResponse": baby_response}
+    elif command == "learn":
+        word = request.get("word")
+        predicted_sentiment = request.get("predicted")
+        actual_sentiment = request.get("actual")
+        if not (word and predicted_sentiment and actual_sentiment):
+            return {"error": "Missing arguments for learning"}
+        baby_ai.learn_from_feedback(word, predicted_sentiment, actual_sentiment)
+        return {"success": True, "word": word}
+    elif command == "auto-learn-content":
+        content = request.get("content")
+        assumed_sentiment = request.get("sentiment")
+        if content is None or not assumed_sentiment:
+            return {"error": "Missing content or assumed sentiment for auto-learn-content"}
+        learned_words = baby_ai.auto_learn_from_text(content, assumed_sentiment)
+        return {"success": True, "message": "Auto-learning from content complete", "learned_words": learned_words}
+    elif command == "predict-text":
+        texts = request.get("texts")
+        if texts is None:
+            return {"error": "Missing texts for prediction"}
+        return {"results": baby_ai.predict_sentiments(texts)}
+    elif command == "flush":
+        baby_ai.flush()
+        return {"success": True}
+    elif command == "ping":
+        return {"success": True, "pid": os.getpid()}
+    else:
+        return {"error": "Unknown command"}
+
+
+class BabyAIRequestHandler(socketserver.StreamRequestHandler):
+    # Line-delimited JSON: one request object per line, one response object per line
+    def handle(self):
+        for line in self.rfile:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                request = json.loads(line)
+                with self.server.lock:
+                    response = handle_request(self.server.baby_ai, request)
+            except json.JSONDecodeError:
+                response = {"error": "Invalid JSON request"}
+            except Exception as e:
+                response = {"error": str(e)}
+            self.wfile.write((json.dumps(response) + "\n").encode("utf-8"))
+            self.wfile.flush()
+
+
+class BabyAIServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path=DEFAULT_SOCKET_PATH, flush_interval=FLUSH_INTERVAL):
+        if os.path.exists(socket_path):
+            # Only replace a stale socket from a previous run, never one a live daemon is serving
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(socket_path)
+            except ConnectionRefusedError:
+                os.unlink(socket_path)
+            else:
+                raise OSError(errno.EADDRINUSE, "A baby AI daemon is already listening", socket_path)
+            finally:
+                probe.close()
+        super().__init__(socket_path, BabyAIRequestHandler)
+        self.socket_path = socket_path
+        self.flush_interval = flush_interval
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        # Knowledge stays loaded for the lifetime of the daemon
+        self.baby_ai = BabyAILearner(autosave=False)
+
+    def _flush_loop(self):
+        while not self.stopped.wait(self.flush_interval):
+            with self.lock:
+                self.baby_ai.flush()
+
+    def run(self):
+        flusher = threading.Thread(target=self._flush_loop, daemon=True)
+        flusher.start()
+
+        def request_shutdown(signum, frame):
+            # shutdown() blocks until serve_forever returns, so call it off the main thread
+            threading.Thread(target=self.shutdown, daemon=True).start()
+
+        signal.signal(signal.SIGTERM, request_shutdown)
+        signal.signal(signal.SIGINT, request_shutdown)
+
+        try:
+            self.serve_forever()
+        finally:
+            self.stopped.set()
+            with self.lock:
+                self.baby_ai.flush()
+            self.server_close()
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
 
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "serve":
+        socket_path = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_SOCKET_PATH
+        try:
+            server = BabyAIServer(socket_path)
+        except OSError as e:
+            print(json.dumps({"error": f"Cannot listen on {socket_path}: {e.strerror}"}), flush=True)
+            sys.exit(1)
+        print(json.dumps({"success": True, "message": "Baby AI daemon listening", "socket": socket_path}), flush=True)
+        server.run()
+        sys.exit(0)
+
     baby_ai = BabyAILearner()
 
     if len(sys.argv) > 1:
@@ -81,6 +305,11 @@ if __name__ == "__main__":
                 print(json.dumps({"word": word, "sentiment": sentiment, "babyResponse": baby_response}))
             else:
                 print(json.dumps({"error": "Missing word for prediction"}))
+        elif command == "predict-text":
+            if len(sys.argv) > 2:
+                print(json.dumps({"results": baby_ai.predict_sentiments(sys.argv[2:])}))
+            else:
+                print(json.dumps({"error": "Missing text for prediction"}))
         elif command == "learn":
             if len(sys.argv) > 4:
                 word = sys.argv[2]
@@ -2,15 +2,69 @@ import json
 import os
 import random
 import re
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+# Workspace configuration (data locations) is shared with the analysis modules in python/
+PYTHON_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, os.pardir, 'python'))
+if PYTHON_DIR not in sys.path:
+    sys.path.append(PYTHON_DIR)
+from config import get_config
+
+TOKEN_PATTERN = re.compile(r'\b\w+\b')
+TRAILING_TOKEN = re.compile(r'\w+$')
+VOWELS = 'aeiou'
+CHUNK_SIZE = 1 << 20 # Characters read per chunk when ingesting a corpus
+
+
+def count_corpus_file(path, chunk_size=CHUNK_SIZE):
+    # Stream a text file in chunks and count its lowercased tokens. A token cut
+    # off at the end of a chunk is carried over and counted with the next one.
+    word_counts = Counter()
+    carry = ''
+    with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            text = carry + chunk.lower()
+            match = TRAILING_TOKEN.search(text)
+            cut = match.start() if match else len(text)
+            carry = text[cut:]
+            word_counts.update(TOKEN_PATTERN.findall(text, 0, cut))
+    if carry:
+        word_counts.update(TOKEN_PATTERN.findall(carry))
+    return word_counts
+
+
+def word_feature_counts(word_counts):
+    # Phoneme and C/V bigram-pattern counts implied by word counts, computed once
+    # per distinct word and weighted by its number of occurrences
+    phoneme_counts = Counter()
+    pattern_counts = Counter()
+    for word, count in word_counts.items():
+        for char in word:
+            if char.isalpha():
+                phoneme_counts[char] += count
+        for p1, p2 in zip(word, word[1:]):
+            if p1.isalpha() and p2.isalpha(): # Only consider CV, VC, VV, CC patterns
+                pattern = ('V' if p1 in VOWELS else 'C') + ('V' if p2 in VOWELS else 'C')
+                pattern_counts[pattern] += count
+    return phoneme_counts, pattern_counts
+
 
 class BabyBrain:
     def __init__(self, brain_file="baby_brain_knowledge.json"):
-        self.script_dir = os.path.dirname(__file__)
-        self.brain_file = os.path.join(self.script_dir, brain_file)
+        self.data_dir = str(get_config().ai_model_dir)
+        self.brain_file = os.path.join(self.data_dir, brain_file)
         self.phoneme_activations = {}
         self.syllable_patterns = {}
         self.word_activations = {}
         self.developmental_stage = 0 # 0: cooing, 1: babbling, 2: single words
+        self.autosave = True # When False, changes stay in memory until flush()
+        self.dirty = False
+        self._sampling_tables = {} # Cached (items, cumulative weights) per table, cleared on learning
         self._load_brain()
 
     def _load_brain(self):
@@ -29,28 +83,65 @@ class BabyBrain:
             'word_activations': self.word_activations,
             'developmental_stage': self.developmental_stage
         }
-        with open(self.brain_file, 'w') as f:
+        # Write to a temp file and swap it in, so readers never see a half-written brain
+        tmp_file = self.brain_file + '.tmp'
+        with open(tmp_file, 'w') as f:
             json.dump(data, f, indent=4)
+        os.replace(tmp_file, self.brain_file)
+        self.dirty = False
 
-    def _get_activated_phonemes(self, phoneme_type='all'):
-        # Select phonemes based on activation levels (higher activation = more likely)
-        activated_phonemes = []
-        for phoneme, activation in self.phoneme_activations.items():
-            if phoneme_type == 'vowel' and phoneme not in 'aeiou':
-                continue
-            if phoneme_type == 'consonant' and phoneme in 'aeiou':
-                continue
-            # Add phoneme multiple times based on activation to increase selection probability
-            activated_phonemes.extend([phoneme] * int(activation * 10 + 1))
-        
-        if not activated_phonemes:
-            return []
-        return activated_phonemes
+    def _persist(self):
+        if self.autosave:
+            self._save_brain()
+        else:
+            self.dirty = True
+
+    def flush(self):
+        if self.dirty:
+            self._save_brain()
+
+    def _sampling_table(self, table_type):
+        # Cumulative-weight table for 'vowel', 'consonant', 'all', 'word' or 'syllable'.
+        # Built once and reused until learning changes activations, so sampling is a
+        # bisect over the cumulative weights instead of a scan of a repeated list.
+        table = self._sampling_tables.get(table_type)
+        if table is not None:
+            return table
+
+        if table_type == 'syllable':
+            weighted = self.syllable_patterns.items()
+        elif table_type == 'word':
+            weighted = ((word, int(activation * 10 + 1)) for word, activation in self.word_activations.items())
+        else:
+            weighted = []
+            for phoneme, activation in self.phoneme_activations.items():
+                if table_type == 'vowel' and phoneme not in 'aeiou':
+                    continue
+                if table_type == 'consonant' and phoneme in 'aeiou':
+                    continue
+                # Higher activation = more likely, same weights as repeating each phoneme
+                weighted.append((phoneme, int(activation * 10 + 1)))
+
+        items = []
+        cum_weights = []
+        total = 0
+        for item, weight in weighted:
+            total += weight
+            items.append(item)
+            cum_weights.append(total)
+
+        table = (items, cum_weights)
+        self._sampling_tables[table_type] = table
+        return table
+
+    def _sample(self, table_type):
+        items, cum_weights = self._sampling_table(table_type)
+        return random.choices(items, cum_weights=cum_weights, k=1)[0]
 
     def _generate_syllable(self):
         # Prioritize learned syllable patterns
         if self.syllable_patterns:
-            structure = random.choices(list(self.syllable_patterns.keys()), weights=list(self.syllable_patterns.values()), k=1)[0]
+            structure = self._sample('syllable')
         else:
             # Fallback to basic structures if no patterns learned yet
             structure = random.choice(['V', 'CV'])
@@ -58,9 +149,9 @@ class BabyBrain:
         syllable = ""
         for char_type in structure:
             if char_type == 'V': # Vowel
-                syllable += random.choice(self._get_activated_phonemes('vowel'))
+                syllable += self._sample('vowel')
             elif char_type == 'C': # Consonant
-                syllable += random.choice(self._get_activated_phonemes('consonant'))
+                syllable += self._sample('consonant')
         return syllable
 
     def generate_vocalization(self, sentiment):
@@ -70,8 +161,8 @@ class BabyBrain:
         print(f"DEBUG: Current word activations: {self.word_activations}")
 
         if self.developmental_stage == 0: # Cooing phase
-            available_vowels = self._get_activated_phonemes('vowel')
-            available_consonants = self._get_activated_phonemes('consonant')
+            available_vowels = self._sampling_table('vowel')[0]
+            available_consonants = self._sampling_table('consonant')[0]
             print(f"DEBUG: Available vowels: {available_vowels}")
             print(f"DEBUG: Available consonants: {available_consonants}")
 
@@ -80,23 +171,23 @@ class BabyBrain:
 
             if sentiment == "positive":
                 if random.random() < 0.7 and available_consonants and available_vowels: # Chance for CV sound
-                    return random.choice(available_consonants).capitalize() + random.choice(available_vowels)
+                    return self._sample('consonant').capitalize() + self._sample('vowel')
                 elif available_vowels: # Vowel repetition
-                    return random.choice(available_vowels).capitalize() * random.randint(2, 4)
+                    return self._sample('vowel').capitalize() * random.randint(2, 4)
                 else:
                     return "" # Fallback if no suitable phonemes
             elif sentiment == "negative":
                 if random.random() < 0.5 and available_consonants and available_vowels: # Chance for short, sharp sound
-                    return random.choice(available_consonants).capitalize() + random.choice(available_vowels)
+                    return self._sample('consonant').capitalize() + self._sample('vowel')
                 elif available_vowels:
-                    return random.choice(available_vowels).capitalize() * random.randint(1, 3)
+                    return self._sample('vowel').capitalize() * random.randint(1, 3)
                 else:
                     return "" # Fallback if no suitable phonemes
             else: # Neutral
                 if random.random() < 0.6 and available_consonants and available_vowels: # Chance for simple babble
-                    return random.choice(available_consonants).capitalize() + random.choice(available_vowels)
+                    return self._sample('consonant').capitalize() + self._sample('vowel')
                 elif available_vowels:
-                    return random.choice(available_vowels).capitalize()
+                    return self._sample('vowel').capitalize()
                 else:
                     return "" # Fallback if no suitable phonemes
         
@@ -111,12 +202,10 @@ class BabyBrain:
 
         elif self.developmental_stage >= 2: # Early words phase
             # Prioritize words with higher activation
-            activated_words = []
-            for word, activation in self.word_activations.items():
-                activated_words.extend([word] * int(activation * 10 + 1))
+            activated_words = self._sampling_table('word')[0]
 
             if activated_words and random.random() < 0.7: # Try to use a learned word
-                word = random.choice(activated_words)
+                word = self._sample('word')
                 if sentiment == "positive":
                     return word.capitalize()
                 elif sentiment == "negative":
@@ -126,18 +215,16 @@ class BabyBrain:
             else: # Fallback to babbling or simple sounds
                 return self.generate_vocalization(sentiment) # Recursively call for babbling/cooing
 
-    def learn_from_word(self, word):
-        word_lower = word.lower()
-
+    def _learn_word(self, word_lower, count=1):
+        self._sampling_tables.clear() # Activations change, cached sampling tables are stale
         # Activate word neuron
-        self.word_activations[word_lower] = self.word_activations.get(word_lower, 0) + 1
+        self.word_activations[word_lower] = self.word_activations.get(word_lower, 0) + count
 
         # Activate phoneme neurons
         for char in word_lower:
             if char.isalpha():
-                self.phoneme_activations[char] = self.phoneme_activations.get(char, 0) + 1
-        print(f"DEBUG: Phoneme activations after learning '{word_lower}': {self.phoneme_activations}")
-        
+                self.phoneme_activations[char] = self.phoneme_activations.get(char, 0) + count
+
         # Learn syllable patterns (simple C/V patterns for now)
         vowels = 'aeiou'
         for i in range(len(word_lower) - 1):
@@ -150,13 +237,73 @@ class BabyBrain:
                 pattern += 'V' if p2 in vowels else 'C'
             
             if pattern and len(pattern) == 2: # Only consider CV, VC, VV, CC patterns
-                self.syllable_patterns[pattern] = self.syllable_patterns.get(pattern, 0) + 1
+                self.syllable_patterns[pattern] = self.syllable_patterns.get(pattern, 0) + count
 
-        # Update developmental stage
+    def _update_developmental_stage(self):
         if len(self.phoneme_activations) > 10 and self.developmental_stage < 1:
             self.developmental_stage = 1 # Move to babbling
         
         if len(self.word_activations) > 5 and self.developmental_stage < 2:
             self.developmental_stage = 2 # Move to early words
 
-        self._save_brain()
+    def learn_from_word(self, word):
+        word_lower = word.lower()
+        self._learn_word(word_lower)
+        print(f"DEBUG: Phoneme activations after learning '{word_lower}': {self.phoneme_activations}")
+
+        # Update developmental stage
+        self._update_developmental_stage()
+
+        self._persist()
+
+    def _merge_counts(self, word_counts, phoneme_counts, pattern_counts):
+        self._sampling_tables.clear()
+        for activations, counts in ((self.word_activations, word_counts),
+                                    (self.phoneme_activations, phoneme_counts),
+                                    (self.syllable_patterns, pattern_counts)):
+            for key, count in counts.items():
+                activations[key] = activations.get(key, 0) + count
+
+    def learn_from_words(self, word_counts):
+        # Batch version of learn_from_word: word_counts maps word -> occurrences,
+        # all activations are merged in one step and the brain is saved once
+        lowered = Counter()
+        for word, count in word_counts.items():
+            lowered[word.lower()] += count
+
+        self._merge_counts(lowered, *word_feature_counts(lowered))
+        self._update_developmental_stage()
+        self._persist()
+
+    def ingest_corpus(self, paths, processes=1, chunk_size=CHUNK_SIZE):
+        # Learn from whole text files: each file is streamed and counted (in a
+        # process pool when processes > 1), then all counts are merged at once
+        if isinstance(paths, (str, os.PathLike)):
+            paths = [paths]
+        paths = list(paths)
+
+        word_counts = Counter()
+        if processes > 1 and len(paths) > 1:
+            with ProcessPoolExecutor(max_workers=processes) as pool:
+                for file_counts in pool.map(count_corpus_file, paths, [chunk_size] * len(paths)):
+                    word_counts.update(file_counts)
+        else:
+            for path in paths:
+                word_counts.update(count_corpus_file(path, chunk_size))
+
+        self.learn_from_words(word_counts)
+        return word_counts
+
+
+if __name__ == "__main__":
+    # python baby_brain.py ingest [--processes N] file1.txt [file2.txt ...]
+    if len(sys.argv) > 2 and sys.argv[1] == "ingest":
+        args = sys.argv[2:]
+        processes = 1
+        if args[0] == "--processes" and len(args) > 2:
+            processes = int(args[1])
+            args = args[2:]
+        word_counts = BabyBrain().ingest_corpus(args, processes=processes)
+        print(json.dumps({"success": True, "files": len(args), "tokens": sum(word_counts.values()), "distinct_words": len(word_counts)}))
+    else:
+        print(json.dumps({"error": "Usage: baby_brain.py ingest [--processes N] FILE..."}))
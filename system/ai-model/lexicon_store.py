@@ -0,0 +1,281 @@
+import fcntl
+import hashlib
+import os
+from collections.abc import MutableMapping
+from contextlib import contextmanager
+
+import numpy as np
+
+# File layout:
+#   header (64 bytes)   magic, version, capacity, count, strings_size
+#   slot table          `capacity` fixed-size slots, open addressing with linear probing
+#   string region       utf-8 words, referenced by (offset, length) from the slots
+MAGIC = b"SLEX"
+VERSION = 1
+HEADER_DTYPE = np.dtype([('magic', 'S4'), ('version', '<u4'), ('capacity', '<u8'), ('count', '<u8'), ('strings_size', '<u8')])
+HEADER_SIZE = 64
+SLOT_DTYPE = np.dtype([('hash', '<u8'), ('offset', '<u8'), ('length', '<u4'), ('score', '<f4')])
+MIN_CAPACITY = 1024
+MAX_LOAD = 0.7
+
+
+def _to_float(score):
+    # Shortest decimal that round-trips the float32, so 0.6 reads back as 0.6, not 0.6000000238
+    return float(str(score))
+
+
+def word_hash(word):
+    # Stable 64-bit hash; 0 marks an empty slot so it is never returned
+    value = int.from_bytes(hashlib.blake2b(word.encode('utf-8'), digest_size=8).digest(), 'little')
+    return value or 1
+
+
+class LexiconStore(MutableMapping):
+    # Memory-mapped word -> float32 score table. Lookups and in-place score updates
+    # touch a single slot, and opening a store maps the file instead of parsing it,
+    # so load time does not grow with the vocabulary. Words are identified by their
+    # 64-bit hash; the stored strings are only needed to iterate over keys.
+    #
+    # Several processes (the daemon and one-shot CLI calls) may map the same file.
+    # Every access takes an flock on a `<path>.lock` sidecar, shared for reads and
+    # exclusive for writes, and first remaps the file if another process grew it
+    # (growing replaces the file, so a stale mapping would point at the old inode).
+    #
+    # Durability: updates land in the shared mapping and are seen by other processes
+    # at once, but only reach the disk on flush(). Unlike a rewrite-and-rename save,
+    # a power loss between flushes can lose recent updates or leave the slot table
+    # and string region out of step; growing the table is still an atomic replace.
+
+    def __init__(self, path, capacity=MIN_CAPACITY):
+        self.path = path
+        self._lock_file = open(path + '.lock', 'a+b')
+        self._file = None
+        with self._locked():
+            if not os.path.exists(path):
+                self._create(path, capacity)
+            self._open()
+
+    @staticmethod
+    def _create(path, capacity):
+        size = MIN_CAPACITY
+        while size < capacity:
+            size *= 2
+        header = np.array([(MAGIC, VERSION, size, 0, 0)], dtype=HEADER_DTYPE)
+        with open(path, 'wb') as f:
+            f.write(header.tobytes().ljust(HEADER_SIZE, b"\0"))
+            f.truncate(HEADER_SIZE + size * SLOT_DTYPE.itemsize)
+
+    def _open(self):
+        self.header = np.memmap(self.path, dtype=HEADER_DTYPE, mode='r+', shape=(1,))
+        if self.header['magic'][0] != MAGIC or self.header['version'][0] != VERSION:
+            raise ValueError(f"{self.path} is not a version {VERSION} lexicon store")
+
+        self.capacity = int(self.header['capacity'][0])
+        self.mask = self.capacity - 1
+        self.strings_start = HEADER_SIZE + self.capacity * SLOT_DTYPE.itemsize
+        self.slots = np.memmap(self.path, dtype=SLOT_DTYPE, mode='r+', offset=HEADER_SIZE, shape=(self.capacity,))
+        self.hashes = self.slots['hash']
+        self.scores = self.slots['score']
+        # Kept open for appending new words to the string region
+        self._file = open(self.path, 'r+b')
+
+    def _unmap(self):
+        self._file.close()
+        self._file = None
+        del self.header, self.slots, self.hashes, self.scores
+
+    @contextmanager
+    def _locked(self, exclusive=True):
+        fcntl.flock(self._lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            if self._file is not None and os.stat(self.path).st_ino != os.fstat(self._file.fileno()).st_ino:
+                # Another process grew the table into a new file
+                self._unmap()
+                self._open()
+            yield
+        finally:
+            if exclusive and self._file is not None:
+                self._file.flush() # Appended words must reach the file before the lock is released
+            fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+
+    def close(self):
+        self.flush()
+        self._unmap()
+        self._lock_file.close()
+
+    @property
+    def count(self):
+        return int(self.header['count'][0])
+
+    @count.setter
+    def count(self, value):
+        self.header['count'][0] = value
+
+    @property
+    def strings_size(self):
+        return int(self.header['strings_size'][0])
+
+    @strings_size.setter
+    def strings_size(self, value):
+        self.header['strings_size'][0] = value
+
+    def _find_slot(self, hash_value):
+        # Index of the slot holding hash_value, or of the empty slot where it would go
+        index = hash_value & self.mask
+        hashes = self.hashes
+        while True:
+            slot_hash = int(hashes[index])
+            if slot_hash == hash_value or slot_hash == 0:
+                return index
+            index = (index + 1) & self.mask
+
+    def _append_string(self, word):
+        data = word.encode('utf-8')
+        offset = self.strings_size
+        self._file.seek(self.strings_start + offset)
+        self._file.write(data)
+        self.strings_size = offset + len(data)
+        return offset, len(data)
+
+    def _grow(self):
+        # Rebuild into a table twice the size; strings of live words are compacted on the way.
+        # Called with the exclusive lock held, so no other process writes meanwhile.
+        words = self._words()
+        scores = [_to_float(self.scores[self._find_slot(word_hash(word))]) for word in words]
+        tmp_path = self.path + '.tmp'
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+
+        self.flush()
+        self._unmap()
+        grown = LexiconStore.__new__(LexiconStore)
+        grown.path = tmp_path
+        LexiconStore._create(tmp_path, self.capacity * 2)
+        grown._open()
+        for word, score in zip(words, scores):
+            grown._insert(word, word_hash(word), score)
+        grown.flush()
+        grown._unmap()
+
+        os.replace(tmp_path, self.path)
+        self._open()
+
+    def _insert(self, word, hash_value, score):
+        index = self._find_slot(hash_value)
+        if self.hashes[index] == 0:
+            offset, length = self._append_string(word)
+            self.slots[index] = (hash_value, offset, length, score)
+            self.count += 1
+        else:
+            self.scores[index] = score
+
+    def __getitem__(self, word):
+        with self._locked(exclusive=False):
+            index = self._find_slot(word_hash(word))
+            if self.hashes[index] == 0:
+                raise KeyError(word)
+            return _to_float(self.scores[index])
+
+    def get(self, word, default=None):
+        with self._locked(exclusive=False):
+            index = self._find_slot(word_hash(word))
+            if self.hashes[index] == 0:
+                return default
+            return _to_float(self.scores[index])
+
+    def scores_for(self, words, default=0.0):
+        # Vectorized lookup of many words: every word is probed at once, one numpy
+        # step per probe distance, and missing words get `default`
+        hashes = np.fromiter((word_hash(word) for word in words), dtype=np.uint64, count=len(words))
+        result = np.full(len(hashes), default, dtype=np.float32)
+        pending = np.arange(len(hashes))
+        with self._locked(exclusive=False):
+            index = (hashes & np.uint64(self.mask)).astype(np.int64)
+            while pending.size:
+                slot_hashes = self.hashes[index]
+                found = slot_hashes == hashes[pending]
+                result[pending[found]] = self.scores[index[found]]
+                probing = ~found & (slot_hashes != 0)
+                pending = pending[probing]
+                index = (index[probing] + 1) & self.mask
+        return result
+
+    def __contains__(self, word):
+        with self._locked(exclusive=False):
+            return self.hashes[self._find_slot(word_hash(word))] != 0
+
+    def __setitem__(self, word, score):
+        hash_value = word_hash(word)
+        with self._locked():
+            index = self._find_slot(hash_value)
+            if self.hashes[index] != 0:
+                self.scores[index] = score # In-place update, no rewrite
+                return
+            if (self.count + 1) > self.capacity * MAX_LOAD:
+                self._grow()
+            self._insert(word, hash_value, score)
+
+    def __delitem__(self, word):
+        with self._locked():
+            self._delete(word)
+
+    def _delete(self, word):
+        index = self._find_slot(word_hash(word))
+        if self.hashes[index] == 0:
+            raise KeyError(word)
+
+        # Backward-shift deletion keeps linear probe chains intact without tombstones
+        hashes = self.hashes
+        hole = index
+        probe = index
+        while True:
+            probe = (probe + 1) & self.mask
+            probe_hash = int(hashes[probe])
+            if probe_hash == 0:
+                break
+            home = probe_hash & self.mask
+            # Move the entry back unless its home lies cyclically in (hole, probe]
+            if hole <= probe:
+                stays = hole < home <= probe
+            else:
+                stays = home > hole or home <= probe
+            if not stays:
+                self.slots[hole] = self.slots[probe]
+                hole = probe
+        self.slots[hole] = (0, 0, 0, 0.0)
+        self.count -= 1
+
+    def __len__(self):
+        with self._locked(exclusive=False):
+            return self.count
+
+    def __iter__(self):
+        # Snapshot of the keys, so no lock is held while the caller iterates
+        with self._locked(exclusive=False):
+            return iter(self._words())
+
+    def _words(self):
+        occupied = np.flatnonzero(self.hashes)
+        self._file.flush()
+        self._file.seek(self.strings_start)
+        strings = self._file.read(self.strings_size)
+        words = []
+        for index in occupied:
+            slot = self.slots[index]
+            start = int(slot['offset'])
+            words.append(strings[start:start + int(slot['length'])].decode('utf-8'))
+        return words
+
+    def flush(self):
+        # Push appended words and in-place score updates from the memory map to disk
+        self._file.flush()
+        self.header.flush()
+        self.slots.flush()
+
+    @classmethod
+    def from_dict(cls, path, knowledge):
+        store = cls(path, capacity=int(len(knowledge) / MAX_LOAD) + 1)
+        for word, score in knowledge.items():
+            store[word] = score
+        store.flush()
+        return store
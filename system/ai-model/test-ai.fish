@@ -99,6 +99,22 @@ function test_emotion_integration
     return 0
 end
 
+# Test baby AI sentiment scoring (through the daemon when it is running)
+function test_baby_ai
+    print_header "Testing Baby AI Sentiment"
+    
+    for word in happy sad curious
+        echo "Predicting sentiment of '$word'..."
+        baby_ai_predict $word
+    end
+    
+    echo "Scoring several texts in one request..."
+    baby_ai_predict_texts "This is a happy test input" "This is a sad test input"
+    echo
+    
+    return 0
+end
+
 # Main test function
 function run_ai_tests
     print_header "AI and Consciousness Integration Tests"
@@ -112,6 +128,7 @@ function run_ai_tests
     test_consciousness_levels
     test_reflection
     test_emotion_integration
+    test_baby_ai
     
     print_header "Tests Completed"
     echo "All tests finished at "(date)
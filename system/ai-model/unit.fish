@@ -7,6 +7,7 @@
 # unit.fish - AI integration with Hugging Face models for Sentium
 
 source (dirname (status -f))/consciousness.fish
+source (dirname (status -f))/baby-ai-client.fish
 
 
 